@@ -44,11 +44,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'blog.staticfiles.StaticAssetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.routers.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -59,8 +62,18 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Cada plantilla se compila una vez por proceso; con runserver el
+            # autoreloader vacía esta caché al editar una plantilla.
+            'loaders': [
+                (
+                    'django.template.loaders.cached.Loader',
+                    [
+                        'django.template.loaders.filesystem.Loader',
+                        'django.template.loaders.app_directories.Loader',
+                    ],
+                ),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
@@ -76,13 +89,100 @@ WSGI_APPLICATION = 'ConnectMetric.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Cada conexión nueva aplica estos PRAGMA. WAL permite leer mientras otro
+# proceso escribe; con synchronous=NORMAL un corte de energía puede perder la
+# última transacción confirmada, pero nunca corrompe la base. Las
+# transacciones IMMEDIATE toman el bloqueo de escritura al empezar, así la
+# espera de SQLITE_BUSY_TIMEOUT cubre también las escrituras dentro de
+# atomic() en lugar de fallar con "database is locked".
+
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+    # Negativo: tamaño en KiB en vez de páginas.
+    'cache_size': int(os.environ.get('SQLITE_CACHE_SIZE', '-64000')),
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DJANGO_DB_PATH', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': float(os.environ.get('SQLITE_BUSY_TIMEOUT', '20')),
+            'transaction_mode': os.environ.get('SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+        },
     }
 }
 
+# Réplica de lectura opcional para las vistas de métricas, listados y feeds
+# (ver blog.routers). En local puede ser otra copia de SQLite que se refresca
+# con "python manage.py sync_replica". Tras escribir, el cliente lee de la
+# primaria durante REPLICA_PIN_SECONDS.
+
+if os.environ.get('DJANGO_REPLICA_DB_PATH'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DJANGO_REPLICA_DB_PATH'],
+        'OPTIONS': {
+            **DATABASES['default']['OPTIONS'],
+            'transaction_mode': None,
+            'init_command': DATABASES['default']['OPTIONS']['init_command'] + ';PRAGMA query_only=ON',
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+# Hilos con los que las vistas asíncronas (dashboard, métricas) lanzan sus
+# consultas independientes en paralelo; con 1 se ejecutan en secuencia.
+
+ASYNC_QUERY_WORKERS = int(os.environ.get('ASYNC_QUERY_WORKERS', str(min(8, os.cpu_count() or 1))))
+
+READ_REPLICA = {
+    'ALIAS': 'replica' if 'replica' in DATABASES else None,
+    'PIN_SECONDS': int(os.environ.get('REPLICA_PIN_SECONDS', '15')),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is enough for a single process. When running several workers,
+# point every worker at the same directory with the file-based backend, e.g.
+# DJANGO_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# DJANGO_CACHE_LOCATION=/var/tmp/connectmetric_cache
+# Both backends cull entries beyond MAX_ENTRIES (300 by default), including the
+# version tokens in blog.cache_versions. Losing a token only costs a cache
+# miss, but the default limit is far below one token plus a few fragments per
+# process, so it is raised to fit the workload.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'connectmetric'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('DJANGO_CACHE_MAX_ENTRIES', '50000')),
+        },
+    }
+}
+
+
+# Instrumentación de peticiones
+# Los usuarios staff reciben las métricas SQL de cada petición en la cabecera
+# Server-Timing; las peticiones que superan los umbrales se registran en el
+# logger "blog.instrumentation".
+
+REQUEST_INSTRUMENTATION = {
+    'ENABLED': os.environ.get('REQUEST_INSTRUMENTATION_ENABLED', 'true').lower() == 'true',
+    'SLOW_REQUEST_MS': int(os.environ.get('SLOW_REQUEST_MS', '500')),
+    'MAX_QUERIES': int(os.environ.get('SLOW_REQUEST_MAX_QUERIES', '50')),
+    'SLOWEST_QUERIES': 5,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -119,6 +219,14 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATICFILES_DIRS = [BASE_DIR / 'static']
+# Destino de build_static_assets: nombres con hash, manifiesto y variantes .gz/.br.
+STATIC_ROOT = os.environ.get('DJANGO_STATIC_ROOT', BASE_DIR / 'staticfiles')
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'blog.staticfiles.PrecompressedManifestStaticFilesStorage'},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -5,6 +5,7 @@ from blog import views as blogViews
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls', namespace='blog')),
+    path('api/v1/', include('blog.api_urls', namespace='api_v1')),
     path('user/', include('user.urls', namespace='user')),
      path('auth/', include('authentication.urls', namespace='authentication')),
 ]
\ No newline at end of file
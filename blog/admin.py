@@ -1,6 +1,80 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
 
-from .models import CandidateAssignment, Post, ProcessStage, RecruitmentProcess, StageFeedback
+from . import search
+from .forms import prefix_match
+from .models import CandidateAssignment, Post, ProcessStage, RecruitmentProcess, StageFeedback, StageTransition
+
+
+class EstimatedCountPaginator(Paginator):
+	"""Paginator that avoids ``COUNT(*)`` on large unfiltered tables.
+
+	Without filters the highest primary key stands in for the row count: it is
+	read from the index and only overestimates when rows have been deleted.
+	Filtered changelists and tables under ``exact_count_limit`` rows are
+	counted exactly. A page with fewer rows than ``per_page`` is the last one,
+	so requesting it replaces the estimate with the real total; an empty page
+	past the real end counts exactly and falls back to the last page.
+	"""
+
+	exact_count_limit = 10_000
+	count_is_estimated = False
+
+	@cached_property
+	def count(self) -> int:
+		if not self.object_list.query.where:
+			estimate = self.object_list.order_by().aggregate(highest=Max("pk"))["highest"] or 0
+			if estimate > self.exact_count_limit:
+				self.count_is_estimated = True
+				return estimate
+		return super().count
+
+	def page(self, number):
+		page = super().page(number)
+		if not self.count_is_estimated or len(page) == self.per_page:
+			return page
+		# Las filas borradas dejan huecos en la clave primaria: se corrige el total con la página leída.
+		self.count_is_estimated = False
+		self.__dict__["count"] = page.start_index() - 1 + len(page) if len(page) else super().count
+		self.__dict__.pop("num_pages", None)
+		return page if len(page) else super().page(self.num_pages)
+
+
+class EstimatedCountChangeList(ChangeList):
+	"""Changelist that shows the total and page as corrected by ``EstimatedCountPaginator.page``."""
+
+	def get_results(self, request):
+		super().get_results(request)
+		if self.multi_page and not self.show_all:
+			self.result_count = self.paginator.count
+			self.page_num = min(self.page_num, self.paginator.num_pages)
+			self.multi_page = self.result_count > self.list_per_page
+			self.can_show_all = self.result_count <= self.list_max_show_all
+
+
+class EstimatedCountAdmin(admin.ModelAdmin):
+	"""Changelist paginated with ``EstimatedCountPaginator`` and without the full count."""
+
+	paginator = EstimatedCountPaginator
+	show_full_result_count = False
+
+	def get_changelist(self, request, **kwargs):
+		return EstimatedCountChangeList
+
+
+class SelectRelatedAdmin(admin.ModelAdmin):
+	"""Apply ``list_select_related`` to every queryset of the admin.
+
+	Autocomplete widgets of other admins render ``__str__`` of these rows
+	through ``get_queryset``, which the changelist option does not cover.
+	"""
+
+	def get_queryset(self, request):
+		return super().get_queryset(request).select_related(*self.list_select_related)
 
 
 class ProcessStageInline(admin.TabularInline):
@@ -12,55 +86,80 @@ class ProcessStageInline(admin.TabularInline):
 class CandidateAssignmentInline(admin.TabularInline):
 	model = CandidateAssignment
 	extra = 0
-	autocomplete_fields = ("candidate",)
+	# Un select con todas las etapas por fila hace una consulta por asignación.
+	autocomplete_fields = ("candidate", "current_stage")
 
 
 @admin.register(RecruitmentProcess)
 class RecruitmentProcessAdmin(admin.ModelAdmin):
 	list_display = ("title", "owner", "status", "start_date", "end_date", "stage_count", "candidate_count")
 	list_filter = ("status", "start_date", "end_date")
+	list_select_related = ("owner",)
 	search_fields = ("title", "owner__username", "owner__email")
+	show_full_result_count = False
 	ordering = ("-created_at",)
 	inlines = [ProcessStageInline, CandidateAssignmentInline]
 
-	@admin.display(description="Etapas")
-	def stage_count(self, obj: RecruitmentProcess) -> int:
-		return obj.stages.count()
-
-	@admin.display(description="Candidatos")
-	def candidate_count(self, obj: RecruitmentProcess) -> int:
-		return obj.assignments.count()
-
 
 @admin.register(ProcessStage)
-class ProcessStageAdmin(admin.ModelAdmin):
+class ProcessStageAdmin(SelectRelatedAdmin):
 	list_display = ("name", "process", "order", "due_date", "is_blocker")
+	list_select_related = ("process",)
 	list_filter = ("is_blocker", "due_date")
 	search_fields = ("name", "process__title")
 	ordering = ("process", "order")
 
 
 @admin.register(CandidateAssignment)
-class CandidateAssignmentAdmin(admin.ModelAdmin):
+class CandidateAssignmentAdmin(EstimatedCountAdmin, SelectRelatedAdmin):
 	list_display = ("candidate", "process", "current_stage", "joined_at")
+	list_select_related = ("candidate", "process", "current_stage__process")
 	search_fields = ("candidate__username", "candidate__email", "process__title")
 	autocomplete_fields = ("candidate", "process", "current_stage")
 	ordering = ("-joined_at",)
 
 
+@admin.register(StageTransition)
+class StageTransitionAdmin(EstimatedCountAdmin, SelectRelatedAdmin):
+	"""Read-only view of the stage history; rows are written by ``blog.funnel``."""
+
+	list_display = ("assignment", "kind", "from_stage", "to_stage", "created_at")
+	list_select_related = ("assignment__candidate", "assignment__process", "from_stage__process", "to_stage__process")
+	list_filter = ("kind", "created_at")
+	search_fields = ("assignment__candidate__username", "process__title")
+	# El registro sólo crece: el orden de la clave primaria es el de escritura y no requiere ordenar.
+	ordering = ("-pk",)
+
+	def has_add_permission(self, request):
+		return False
+
+	def has_change_permission(self, request, obj=None):
+		return False
+
+	def has_delete_permission(self, request, obj=None):
+		return False
+
+
 @admin.register(StageFeedback)
-class StageFeedbackAdmin(admin.ModelAdmin):
+class StageFeedbackAdmin(EstimatedCountAdmin):
 	list_display = ("assignment", "stage", "author", "rating", "visibility", "created_at")
+	list_select_related = ("assignment__candidate", "assignment__process", "stage__process", "author")
 	list_filter = ("visibility", "rating", "created_at")
-	search_fields = (
-		"assignment__candidate__username",
-		"assignment__process__title",
-		"author__username",
-		"comment",
-	)
+	search_fields = (*search.TEXT_FIELDS, "author__username", "assignment__process__title")
+	search_help_text = "Busca palabras en el texto del feedback, el usuario del autor o el título del proceso."
 	autocomplete_fields = ("assignment", "stage", "author")
 	ordering = ("-created_at",)
 
+	def get_search_results(self, request, queryset, search_term):
+		"""Search through indexes only: the FTS index for text, user and stage ids for the rest."""
+		term = search_term.strip()
+		if not term:
+			return queryset, False
+		authors = get_user_model().objects.filter(prefix_match(term, "username"))
+		stages = ProcessStage.objects.filter(process__title__icontains=term)
+		matches = search.feedback_matches(term, queryset.db) | Q(author__in=authors) | Q(stage__in=stages)
+		return queryset.filter(matches), False
+
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
@@ -0,0 +1,313 @@
+"""Read-only JSON API (v1) for BI tools and bots.
+
+Every endpoint answers ``GET`` for a logged-in session with the same
+permissions as the HTML pages. Lists are paginated with ``KeysetPaginator``
+(``after``/``before`` cursors, ``limit`` up to ``MAX_PAGE_SIZE``) and
+``fields=a,b`` limits the keys of each object.
+
+Responses carry a strong ETag and ``Last-Modified`` built by
+``blog.conditional`` from the ``blog.cache_versions`` tokens, which move on
+every write. They are checked before the response is built, so a poller
+sending ``If-None-Match`` gets a ``304`` without the lists or aggregates
+being computed again. Most endpoints reach that point without a query. The
+owner-only ones (``process_assignments``, ``process_metrics``) first read the
+process to check permissions (one indexed lookup), so a ``304`` is never
+given to someone who could not read the body. Reads go to the default
+database: a replica that lags behind the tokens could pair an old body with
+a new ETag.
+"""
+
+from collections.abc import Callable
+from functools import wraps
+from operator import attrgetter
+
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from . import cache_versions, rating_stats
+from .conditional import Validators
+from .models import CandidateAssignment, Post, ProcessStage, RecruitmentProcess
+from .pagination import KeysetPaginator
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def _username(user) -> str:
+    return user.username
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 2)
+
+
+def _rounded(getter: Callable) -> Callable:
+    return lambda obj: _round(getter(obj))
+
+
+def _distribution(distribution: rating_stats.RatingDistribution) -> dict:
+    return {
+        "counts": list(distribution.counts),
+        "total": distribution.total,
+        "mean": _round(distribution.mean),
+        "median": distribution.median,
+        "p10": distribution.p10,
+        "p90": distribution.p90,
+        "stddev": _round(distribution.stddev),
+        "polarized": distribution.is_polarized,
+    }
+
+
+PROCESS_FIELDS = {
+    "id": attrgetter("pk"),
+    "url": lambda process: reverse("api_v1:process_detail", args=[process.pk]),
+    "title": attrgetter("title"),
+    "description": attrgetter("description"),
+    "status": attrgetter("status"),
+    "owner": lambda process: _username(process.owner),
+    "start_date": attrgetter("start_date"),
+    "end_date": attrgetter("end_date"),
+    "created_at": attrgetter("created_at"),
+    "stage_count": attrgetter("stage_count"),
+    "candidate_count": attrgetter("candidate_count"),
+    "completed_count": attrgetter("completed_count"),
+    "feedback_count": attrgetter("feedback_count"),
+    "average_rating": _rounded(attrgetter("average_rating")),
+}
+STAGE_FIELDS = {
+    "id": attrgetter("pk"),
+    "name": attrgetter("name"),
+    "order": attrgetter("order"),
+    "description": attrgetter("description"),
+    "due_date": attrgetter("due_date"),
+    "is_blocker": attrgetter("is_blocker"),
+    "feedback_count": attrgetter("feedback_count"),
+    "average_rating": _rounded(attrgetter("average_rating")),
+}
+STAGE_METRIC_FIELDS = {
+    "id": attrgetter("pk"),
+    "name": attrgetter("name"),
+    "order": attrgetter("order"),
+    "is_blocker": attrgetter("is_blocker"),
+    "feedback_count": attrgetter("feedback_count"),
+    "average_rating": _rounded(attrgetter("average_rating")),
+    "rating": lambda stage: _distribution(stage.rating_distribution),
+}
+ASSIGNMENT_FIELDS = {
+    "id": attrgetter("pk"),
+    "candidate": lambda assignment: _username(assignment.candidate),
+    "candidate_name": lambda assignment: assignment.candidate.get_full_name(),
+    "current_stage": attrgetter("current_stage_id"),
+    "current_stage_name": lambda assignment: assignment.current_stage.name if assignment.current_stage else None,
+    "completed": lambda assignment: assignment.current_stage_id is None,
+    "joined_at": attrgetter("joined_at"),
+}
+PROCESS_METRIC_FIELDS = {
+    "id": attrgetter("pk"),
+    "url": lambda process: reverse("api_v1:process_metrics", args=[process.pk]),
+    "title": attrgetter("title"),
+    "status": attrgetter("status"),
+    "stage_count": attrgetter("stage_count"),
+    "candidate_count": attrgetter("candidate_count"),
+    "completed_count": attrgetter("completed_count"),
+    "feedback_count": attrgetter("feedback_count"),
+    "average_rating": _rounded(attrgetter("average_rating")),
+    "rating": lambda process: _distribution(process.rating_distribution),
+}
+POST_FIELDS = {
+    "id": attrgetter("pk"),
+    "title": attrgetter("title"),
+    "content": attrgetter("content"),
+    "author": lambda post: _username(post.author),
+    "published_date": attrgetter("published_date"),
+}
+
+
+def _selected_fields(request, available: dict[str, Callable]) -> dict[str, Callable]:
+    requested = [name.strip() for name in request.GET.get("fields", "").split(",") if name.strip()]
+    if not requested:
+        return available
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise ApiError(f"Campos desconocidos: {', '.join(unknown)}. Disponibles: {', '.join(available)}.")
+    return {name: available[name] for name in requested}
+
+
+def _serialize(objects, fields: dict[str, Callable]) -> list[dict]:
+    return [{name: read(obj) for name, read in fields.items()} for obj in objects]
+
+
+def _page_size(request) -> int:
+    limit = request.GET.get("limit", "")
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+        raise ApiError(f"limit debe ser un entero entre 1 y {MAX_PAGE_SIZE}.")
+    return int(limit)
+
+
+def _paginated(request, paginator: KeysetPaginator, fields: dict[str, Callable], prepare=None) -> dict:
+    page = paginator.page_from_request(request)
+    if prepare:
+        prepare(page.object_list)
+    return {
+        "results": _serialize(page, fields),
+        "next": request.build_absolute_uri(f"{request.path}?{page.next_query}") if page.has_next else None,
+        "previous": (
+            request.build_absolute_uri(f"{request.path}?{page.previous_query}") if page.has_previous else None
+        ),
+    }
+
+
+def _conditional(request, tokens: tuple, build: Callable[[], dict]) -> HttpResponse:
+    """Answer ``304`` when the client's validators match; otherwise ``build`` the JSON body."""
+    validators = Validators.for_request(request, tokens)
+    response = validators.not_modified(request)
+    if response is None:
+        response = validators.apply(JsonResponse(build()))
+    return response
+
+
+def api_view(view):
+    """GET-only, session-authenticated endpoint whose errors are JSON bodies."""
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            response = JsonResponse({"error": "Método no permitido."}, status=405)
+            response["Allow"] = "GET, HEAD"
+            return response
+        if not request.user.is_authenticated:
+            return JsonResponse({"error": "Autenticación requerida."}, status=401)
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({"error": str(error)}, status=error.status)
+        except PermissionDenied:
+            return JsonResponse({"error": "No tienes permiso para ver este recurso."}, status=403)
+        except Http404:
+            return JsonResponse({"error": "No encontrado."}, status=404)
+
+    return wrapper
+
+
+def _process(request, pk: int, manage: bool = False) -> RecruitmentProcess:
+    process = get_object_or_404(RecruitmentProcess.objects.select_related("owner"), pk=pk)
+    if manage and not (request.user.is_staff or request.user == process.owner):
+        raise PermissionDenied()
+    return process
+
+
+def _existing_version(pk: int) -> int:
+    """Version token of process ``pk``; unknown ids are a 404 and never get a token."""
+    version = cache_versions.get_existing_version(pk)
+    if version is None:
+        raise Http404()
+    return version
+
+
+@api_view
+def process_list(request):
+    fields = _selected_fields(request, PROCESS_FIELDS)
+    paginator = KeysetPaginator(
+        RecruitmentProcess.objects.select_related("owner"), "created_at", per_page=_page_size(request)
+    )
+    tokens = (cache_versions.get_scope_version(cache_versions.PROCESSES_SCOPE),)
+    return _conditional(request, tokens, lambda: _paginated(request, paginator, fields))
+
+
+@api_view
+def process_detail(request, pk: int):
+    fields = _selected_fields(request, PROCESS_FIELDS)
+    tokens = (_existing_version(pk),)
+    return _conditional(request, tokens, lambda: _serialize([_process(request, pk)], fields)[0])
+
+
+@api_view
+def process_stages(request, pk: int):
+    fields = _selected_fields(request, STAGE_FIELDS)
+    tokens = (_existing_version(pk),)
+    return _conditional(
+        request,
+        tokens,
+        lambda: {"results": _serialize(ProcessStage.objects.filter(process=_process(request, pk)), fields)},
+    )
+
+
+@api_view
+def process_assignments(request, pk: int):
+    process = _process(request, pk, manage=True)
+    fields = _selected_fields(request, ASSIGNMENT_FIELDS)
+    paginator = KeysetPaginator(
+        CandidateAssignment.objects.filter(process=process).select_related("candidate", "current_stage"),
+        "joined_at",
+        per_page=_page_size(request),
+    )
+    tokens = (cache_versions.get_version(process.pk),)
+    return _conditional(request, tokens, lambda: _paginated(request, paginator, fields))
+
+
+@api_view
+def process_metrics(request, pk: int):
+    process = _process(request, pk, manage=True)
+    fields = _selected_fields(request, STAGE_METRIC_FIELDS)
+
+    def build() -> dict:
+        stats = rating_stats.for_process(process.pk)
+        stages = list(process.stages.all())
+        for stage in stages:
+            stage.rating_distribution = stats.for_stage(stage.pk)
+        process.rating_distribution = stats.for_process(process.pk)
+        return {
+            "process": _serialize([process], PROCESS_METRIC_FIELDS)[0],
+            "stages": _serialize(stages, fields),
+        }
+
+    return _conditional(request, (cache_versions.get_version(process.pk),), build)
+
+
+@api_view
+def metrics(request):
+    if not request.user.is_staff:
+        raise PermissionDenied()
+    fields = _selected_fields(request, PROCESS_METRIC_FIELDS)
+    paginator = KeysetPaginator(RecruitmentProcess.objects.all(), "created_at", per_page=_page_size(request))
+
+    def attach_distributions(processes: list[RecruitmentProcess]) -> None:
+        stats = rating_stats.all_stages()
+        for process in processes:
+            process.rating_distribution = stats.for_process(process.pk)
+
+    def build() -> dict:
+        summary = RecruitmentProcess.objects.aggregate(
+            processes=Count("pk"),
+            active_processes=Count("pk", filter=Q(status="active")),
+            closed_processes=Count("pk", filter=Q(status="closed")),
+            assignments=Coalesce(Sum("candidate_count"), 0),
+            completed_assignments=Coalesce(Sum("completed_count"), 0),
+            feedback=Coalesce(Sum("feedback_count"), 0),
+            rating_sum=Coalesce(Sum("rating_sum"), 0),
+        )
+        rating_sum = summary.pop("rating_sum")
+        summary["average_rating"] = _round(rating_sum / summary["feedback"]) if summary["feedback"] else None
+        return {"summary": summary} | _paginated(request, paginator, fields, prepare=attach_distributions)
+
+    return _conditional(request, (cache_versions.get_scope_version(cache_versions.PROCESSES_SCOPE),), build)
+
+
+@api_view
+def post_list(request):
+    fields = _selected_fields(request, POST_FIELDS)
+    paginator = KeysetPaginator(Post.objects.select_related("author"), "published_date", per_page=_page_size(request))
+    tokens = (cache_versions.get_scope_version(cache_versions.POSTS_SCOPE),)
+    return _conditional(request, tokens, lambda: _paginated(request, paginator, fields))
@@ -0,0 +1,15 @@
+from django.urls import path
+
+from . import api
+
+app_name = "api"
+
+urlpatterns = [
+    path("processes/", api.process_list, name="process_list"),
+    path("processes/<int:pk>/", api.process_detail, name="process_detail"),
+    path("processes/<int:pk>/stages/", api.process_stages, name="process_stages"),
+    path("processes/<int:pk>/assignments/", api.process_assignments, name="process_assignments"),
+    path("processes/<int:pk>/metrics/", api.process_metrics, name="process_metrics"),
+    path("metrics/", api.metrics, name="metrics"),
+    path("posts/", api.post_list, name="post_list"),
+]
@@ -0,0 +1,289 @@
+"""View-level benchmarks against a seeded dataset.
+
+``run_benchmarks`` seeds the database at each scale (see ``blog.seeding``)
+and drives every scenario through the Django test client, recording p50/p95
+latency, query count and peak Python memory. ``compare`` checks a result set
+against a stored baseline. The ``benchmark_views`` command wraps both and
+runs on a throwaway test database.
+
+Views that change state on every request (process/assignment creation,
+stage advancement, logout) and the Azure SSO endpoints are not covered.
+
+``measure_feedback_cards`` is a rendering micro-benchmark of the
+``feedback_cards`` tag on in-memory rows; ``benchmark_feedback_cards`` prints it.
+"""
+
+import gc
+import math
+import platform
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import django
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.template.loader import get_template
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import seeding
+from .instrumentation import capture_queries
+from .models import CandidateAssignment, ProcessStage, RecruitmentProcess, StageFeedback
+from .templatetags.blog_tags import feedback_card_rows
+
+User = get_user_model()
+
+DEFAULT_SCALES = (1.0, 10.0)
+DEFAULT_ITERATIONS = 20
+DEFAULT_WARMUP = 2
+DEFAULT_TOLERANCE = 0.25
+
+# Diferencias menores a estos umbrales se consideran ruido de medición.
+MIN_LATENCY_DELTA_MS = 2.0
+MIN_MEMORY_DELTA_KB = 256
+
+
+@dataclass
+class Fixtures:
+    """Objects of the seeded dataset the scenarios point at."""
+
+    staff: User
+    candidate: User
+    process: RecruitmentProcess
+    assignment: CandidateAssignment
+
+    @classmethod
+    def load(cls) -> "Fixtures":
+        staff = (
+            seeding.seeded_users()
+            .filter(is_staff=True)
+            .annotate(process_total=Count("processes"))
+            .order_by("-process_total", "pk")
+            .first()
+        )
+        process = (
+            staff.processes.annotate(assignment_total=Count("assignments"))
+            .order_by("-assignment_total", "pk")
+            .first()
+        )
+        assignment = (
+            process.assignments.filter(current_stage__isnull=False)
+            .select_related("candidate", "current_stage")
+            .order_by("pk")
+            .first()
+        )
+        return cls(staff=staff, candidate=assignment.candidate, process=process, assignment=assignment)
+
+
+@dataclass
+class Scenario:
+    name: str
+    user: str  # "staff", "candidate" o "anonymous"
+    url: Callable[[Fixtures], str]
+    method: str = "get"
+    data: Callable[[Fixtures], dict] = field(default=lambda fixtures: {})
+
+
+def _feedback_url(fixtures: Fixtures) -> str:
+    return reverse("blog:submit_feedback", args=[fixtures.assignment.pk, fixtures.assignment.current_stage_id])
+
+
+SCENARIOS = [
+    Scenario("dashboard", "candidate", lambda f: reverse("blog:dashboard")),
+    Scenario("dashboard_owner", "staff", lambda f: reverse("blog:dashboard")),
+    Scenario("post_list", "candidate", lambda f: reverse("blog:publicaciones")),
+    Scenario("process_list", "staff", lambda f: reverse("blog:process_list")),
+    Scenario("process_detail", "staff", lambda f: reverse("blog:process_detail", args=[f.process.pk])),
+    Scenario("process_detail_candidate", "candidate", lambda f: reverse("blog:process_detail", args=[f.process.pk])),
+    Scenario("process_feedback", "staff", lambda f: reverse("blog:process_feedback", args=[f.process.pk])),
+    Scenario("process_update", "staff", lambda f: reverse("blog:process_update", args=[f.process.pk])),
+    Scenario(
+        "candidate_search",
+        "staff",
+        lambda f: reverse("blog:candidate_search", args=[f.process.pk]),
+        data=lambda f: {"q": "seed_c"},
+    ),
+    Scenario("assignment_import", "staff", lambda f: reverse("blog:assignment_import", args=[f.process.pk])),
+    Scenario("metrics_dashboard", "staff", lambda f: reverse("blog:metrics")),
+    Scenario("metrics_export_csv", "staff", lambda f: reverse("blog:metrics_export")),
+    Scenario("feedback_export_csv", "staff", lambda f: reverse("blog:feedback_export")),
+    Scenario("submit_feedback", "candidate", _feedback_url),
+    Scenario(
+        "submit_feedback_post",
+        "candidate",
+        _feedback_url,
+        method="post",
+        data=lambda f: {"rating": 4, "pros": "Etapa clara.", "visibility": "candidates"},
+    ),
+    Scenario("profile", "candidate", lambda f: reverse("user:profile")),
+    Scenario("login", "anonymous", lambda f: reverse("authentication:login")),
+]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _request(client: Client, scenario: Scenario, url: str, data: dict) -> int:
+    response = getattr(client, scenario.method)(url, data)
+    if response.streaming:
+        for _chunk in response.streaming_content:
+            pass
+    return response.status_code
+
+
+def measure(client: Client, scenario: Scenario, fixtures: Fixtures, iterations: int, warmup: int) -> dict:
+    url, data = scenario.url(fixtures), scenario.data(fixtures)
+    for _ in range(warmup):
+        _request(client, scenario, url, data)
+
+    timings = []
+    for _ in range(iterations):
+        with capture_queries() as stats:
+            start = time.perf_counter()
+            status = _request(client, scenario, url, data)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        _request(client, scenario, url, data)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "status": status,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "queries": stats.count,
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def scale_key(scale: float) -> str:
+    return f"{scale:g}"
+
+
+def run_benchmarks(
+    scales=DEFAULT_SCALES,
+    iterations: int = DEFAULT_ITERATIONS,
+    warmup: int = DEFAULT_WARMUP,
+    seed: int = 0,
+    scenarios: list[Scenario] | None = None,
+    log: Callable[[str], None] = lambda message: None,
+) -> dict:
+    """Seed each scale in turn and measure every scenario; returns the JSON-ready results."""
+    scenarios = SCENARIOS if scenarios is None else scenarios
+    results = {
+        "meta": {
+            "iterations": iterations,
+            "warmup": warmup,
+            "seed": seed,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+        },
+        "scales": {},
+    }
+
+    with override_settings(ALLOWED_HOSTS=["testserver"]):
+        for scale in scales:
+            seeding.clear_seeded()
+            seeding.seed(scale=scale, seed=seed)
+            fixtures = Fixtures.load()
+            clients = {"anonymous": Client()}
+            for role in ("staff", "candidate"):
+                clients[role] = Client()
+                clients[role].force_login(getattr(fixtures, role))
+
+            scale_results = results["scales"][scale_key(scale)] = {}
+            for scenario in scenarios:
+                scale_results[scenario.name] = measure(
+                    clients[scenario.user], scenario, fixtures, iterations, warmup
+                )
+                log(f"{scale_key(scale)}x {scenario.name}: {scale_results[scenario.name]}")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """Describe every view that regressed beyond ``tolerance`` against ``baseline``.
+
+    Latency (p95) and peak memory may grow by ``tolerance`` (a fraction) plus a
+    small noise floor; query counts are deterministic and may not grow at all.
+    Views or scales missing from the baseline are ignored.
+    """
+    regressions = []
+    for scale, views in results["scales"].items():
+        for name, current in views.items():
+            previous = baseline.get("scales", {}).get(scale, {}).get(name)
+            if previous is None:
+                continue
+            label = f"{name} @ {scale}x"
+            if current["status"] != previous["status"]:
+                regressions.append(f"{label}: estado {previous['status']} → {current['status']}")
+            if current["queries"] > previous["queries"]:
+                regressions.append(f"{label}: {previous['queries']} → {current['queries']} consultas")
+            allowed_ms = max(previous["p95_ms"] * (1 + tolerance), previous["p95_ms"] + MIN_LATENCY_DELTA_MS)
+            if current["p95_ms"] > allowed_ms:
+                regressions.append(f"{label}: p95 {previous['p95_ms']:.1f} → {current['p95_ms']:.1f} ms")
+            allowed_kb = max(previous["peak_kb"] * (1 + tolerance), previous["peak_kb"] + MIN_MEMORY_DELTA_KB)
+            if current["peak_kb"] > allowed_kb:
+                regressions.append(f"{label}: memoria {previous['peak_kb']:.0f} → {current['peak_kb']:.0f} KB")
+    return regressions
+
+
+DEFAULT_CARD_COUNTS = (1_000, 10_000)
+
+
+def _sample_feedback(count: int) -> list[StageFeedback]:
+    """Unsaved feedback rows with a realistic mix of anonymous cards and filled sections."""
+    author = User(pk=1, username="candidata", first_name="Ana", last_name="Ruiz")
+    stage = ProcessStage(pk=1, process_id=1, name="Entrevista técnica", order=1)
+    created_at = timezone.now()
+    return [
+        StageFeedback(
+            pk=index,
+            stage=stage,
+            author=author,
+            rating=index % 5 + 1,
+            is_anonymous=index % 4 == 0,
+            pros="Preguntas claras.\nBuen ritmo.",
+            cons="" if index % 3 else "La prueba fue larga.",
+            advice="Repasar SQL & estructuras de datos.",
+            visibility="candidates",
+            created_at=created_at,
+        )
+        for index in range(count)
+    ]
+
+
+def measure_feedback_cards(counts=DEFAULT_CARD_COUNTS, iterations: int = 5) -> dict:
+    """Best-of-``iterations`` cost per card of ``{% feedback_cards %}``, split into row building and rendering.
+
+    Runs on in-memory rows, so it needs no database and measures only the
+    Python and template work of the tag.
+    """
+    template = get_template("blog/_feedback_cards.html")
+    results = {}
+    for count in counts:
+        feedback = _sample_feedback(count)
+        rows_s = render_s = math.inf
+        for _ in range(iterations):
+            start = time.perf_counter()
+            cards = feedback_card_rows(feedback, show_stage=True)
+            built = time.perf_counter()
+            template.render({"cards": cards})
+            rows_s = min(rows_s, built - start)
+            render_s = min(render_s, time.perf_counter() - built)
+        results[str(count)] = {
+            "rows_us_per_card": round(rows_s * 1e6 / count, 2),
+            "render_us_per_card": round(render_s * 1e6 / count, 2),
+            "total_ms": round((rows_s + render_s) * 1000, 2),
+        }
+    return results
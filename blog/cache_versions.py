@@ -0,0 +1,92 @@
+"""Per-process version tokens for template fragment caching.
+
+Cached fragments include the version of the process they render in their key.
+``blog.signals`` bumps the version whenever the process, one of its stages,
+assignments or feedback rows is written, so stale fragments are simply never
+read again. Tokens are timestamps rather than counters: if a token is evicted
+the replacement can never collide with one already used in a fragment key.
+
+Scope tokens work the same way for whole tables: ``PROCESSES_SCOPE`` moves
+with every process bump and ``POSTS_SCOPE`` with every post write. The JSON
+API derives its ETags from them.
+"""
+
+import hashlib
+import time
+from collections.abc import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import CandidateAssignment, RecruitmentProcess
+
+FRAGMENT_TIMEOUT = 60 * 60
+PROCESSES_SCOPE = "processes"
+POSTS_SCOPE = "posts"
+
+
+def version_key(process_id: int) -> str:
+    return f"blog:process-version:{process_id}"
+
+
+def get_versions(process_ids: Iterable[int]) -> dict[int, int]:
+    keys = {version_key(process_id): process_id for process_id in set(process_ids)}
+    if not keys:
+        return {}
+    versions = {keys[key]: value for key, value in cache.get_many(keys).items()}
+    missing = {key: time.time_ns() for key, process_id in keys.items() if process_id not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update({keys[key]: value for key, value in missing.items()})
+    return versions
+
+
+def get_version(process_id: int) -> int:
+    return get_versions([process_id])[process_id]
+
+
+def get_existing_version(process_id: int) -> int | None:
+    """Like ``get_version``, but ``None`` instead of a new token when the process does not exist."""
+    version = cache.get(version_key(process_id))
+    if version is None and RecruitmentProcess.objects.filter(pk=process_id).exists():
+        version = get_version(process_id)
+    return version
+
+
+def bump(process_id: int) -> None:
+    """Invalidate every fragment of ``process_id``, now and again once the transaction commits."""
+    cache.set(version_key(process_id), time.time_ns(), None)
+    transaction.on_commit(lambda: cache.set(version_key(process_id), time.time_ns(), None))
+    bump_scope(PROCESSES_SCOPE)
+
+
+def forget(process_id: int) -> None:
+    """Drop the token of a deleted process so its URLs no longer keep one in the cache."""
+    cache.delete(version_key(process_id))
+    transaction.on_commit(lambda: cache.delete(version_key(process_id)))
+    bump_scope(PROCESSES_SCOPE)
+
+
+def scope_key(scope: str) -> str:
+    return f"blog:scope-version:{scope}"
+
+
+def get_scope_version(scope: str) -> int:
+    return cache.get_or_set(scope_key(scope), time.time_ns, None)
+
+
+def bump_scope(scope: str) -> None:
+    """Renew the token of ``scope``, now and again once the transaction commits."""
+    cache.set(scope_key(scope), time.time_ns(), None)
+    transaction.on_commit(lambda: cache.set(scope_key(scope), time.time_ns(), None))
+
+
+def dashboard_versions(user) -> dict[int, int]:
+    """Versions of every process shown on ``user``'s dashboard."""
+    process_ids = set(RecruitmentProcess.objects.filter(owner=user).values_list("pk", flat=True))
+    process_ids |= set(CandidateAssignment.objects.filter(candidate=user).values_list("process_id", flat=True))
+    return get_versions(process_ids)
+
+
+def digest(versions: dict[int, int]) -> str:
+    return hashlib.md5(repr(sorted(versions.items())).encode(), usedforsecurity=False).hexdigest()
@@ -0,0 +1,80 @@
+"""Run independent read queries of an async view concurrently.
+
+Django's async ORM methods (``acount``, ``aaggregate``, ``async for``...)
+all hop to the single thread-sensitive executor, so awaiting several of them
+with ``asyncio.gather`` still runs them one after another. ``gather_reads``
+runs each callable in a worker thread with its own database connection
+instead; SQLite in WAL mode serves those readers in parallel and releases the
+GIL while it works, so on a multi-core host the wait is bounded by the
+slowest query. ``settings.ASYNC_QUERY_WORKERS`` sizes the thread pool; with a
+single worker (the default on a single-CPU host, where threads only add
+overhead) the callables run one after another in one hop to the request
+thread.
+
+Other connections cannot see rows written by an open ``transaction.atomic()``
+block (``TestCase`` wraps every test in one), so inside a transaction the
+callables also run one by one on the request's own connection. Statements
+run by the workers are reported to the active ``blog.instrumentation``
+captures.
+"""
+
+import asyncio
+import contextvars
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, close_old_connections, connections
+
+from .instrumentation import forward_queries
+
+_executors: dict[int, ThreadPoolExecutor] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor | None:
+    # Hilos propios (y no el ejecutor del event loop) para que cada uno
+    # conserve su conexión entre peticiones, como los hilos de un servidor WSGI.
+    workers = getattr(settings, "ASYNC_QUERY_WORKERS", 1)
+    if workers <= 1:
+        return None
+    if workers not in _executors:
+        _executors[workers] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="blog-query")
+    return _executors[workers]
+
+
+def _on_worker_connection(query: Callable):
+    def run():
+        close_old_connections()
+        with forward_queries():
+            return query()
+
+    return run
+
+
+def _run_in_order(queries: dict[str, Callable]) -> dict:
+    return {name: query() for name, query in queries.items()}
+
+
+async def gather_reads(**queries: Callable) -> dict:
+    """Evaluate read-only ``queries`` concurrently and return their results by name.
+
+    Each callable must fully evaluate what it returns (``list()``, ``aggregate``,
+    ``count``...); lazy querysets would run later, on the rendering thread.
+    """
+    if not queries:
+        return {}
+    executor = _get_executor()
+    if executor is None or len(queries) < 2:
+        return await sync_to_async(_run_in_order)(queries)
+    if await sync_to_async(lambda: connections[DEFAULT_DB_ALIAS].in_atomic_block)():
+        return await sync_to_async(_run_in_order)(queries)
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *[
+            loop.run_in_executor(executor, contextvars.copy_context().run, _on_worker_connection(query))
+            for query in queries.values()
+        ]
+    )
+    return dict(zip(queries, results))
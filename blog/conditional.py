@@ -0,0 +1,62 @@
+"""Conditional GET (ETag / Last-Modified) from ``blog.cache_versions`` tokens.
+
+A view collects the version tokens its content depends on, which costs cache
+reads and no heavy queries, and builds ``Validators`` from them. If the
+client's ``If-None-Match`` or ``If-Modified-Since`` still matches,
+``not_modified`` returns the ``304`` before any prefetch or template work.
+
+The ETag also covers the viewer (user, staff flag, CSRF cookie, so cached
+forms never carry a stale token) and the full path. Tokens are ``time_ns``
+timestamps, so the newest one doubles as ``Last-Modified``; the viewer's last
+login is folded in so a different user on the same browser never gets a
+``304`` for a page rendered for someone else.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from django.conf import settings
+from django.contrib import messages
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+@dataclass(frozen=True)
+class Validators:
+    etag: str
+    last_modified: int
+
+    @classmethod
+    def for_request(cls, request: HttpRequest, tokens: Iterable[int]) -> "Validators":
+        """Validators for ``request.user`` viewing ``request``'s path at the versions ``tokens``."""
+        tokens = sorted(tokens)
+        user = request.user
+        csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+        raw = repr((tokens, user.pk, user.is_staff, csrf_cookie, request.get_full_path()))
+        moments = [token // 1_000_000_000 for token in tokens]
+        if seen_since := user.last_login or getattr(user, "date_joined", None):
+            moments.append(int(seen_since.timestamp()))
+        return cls(
+            etag=quote_etag(hashlib.sha1(raw.encode(), usedforsecurity=False).hexdigest()),
+            last_modified=max(moments, default=int(datetime.now(UTC).timestamp())),
+        )
+
+    def not_modified(self, request: HttpRequest) -> HttpResponse | None:
+        """The ``304`` response when the client's copy is current, else ``None``."""
+        # Un mensaje pendiente sólo se muestra si la página se vuelve a renderizar.
+        if len(messages.get_messages(request)):
+            return None
+        response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+        return self.apply(response) if response is not None else None
+
+    def apply(self, response: HttpResponse) -> HttpResponse:
+        """Attach the validators and ask clients to revalidate on every use."""
+        if response.status_code in (200, 304):
+            response["ETag"] = self.etag
+            response["Last-Modified"] = http_date(self.last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Cookie"])
+        return response
@@ -0,0 +1,93 @@
+"""Denormalised counters on ``RecruitmentProcess`` and ``ProcessStage``.
+
+Every write path adjusts the counters with a single ``UPDATE ... SET col =
+col + n`` built from ``F()`` expressions, so concurrent writers never lose an
+increment and no row has to be read first. ``blog.signals`` calls the
+``adjust_*`` helpers; writes that bypass signals (raw fixtures, bulk loads)
+are caught by ``find_drift``/``repair`` and the ``repair_counters`` command.
+"""
+
+from functools import reduce
+from operator import or_
+
+from django.db.models import Count, F, OuterRef, Q, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import CandidateAssignment, ProcessStage, RecruitmentProcess, StageFeedback
+
+PROCESS_COUNTERS = ("stage_count", "candidate_count", "completed_count", "feedback_count", "rating_sum")
+STAGE_COUNTERS = ("feedback_count", "rating_sum")
+
+
+def _increments(deltas: dict[str, int]) -> dict:
+    # Un contador desfasado nunca debe romper una escritura por bajar de cero.
+    return {
+        name: F(name) + delta if delta > 0 else Greatest(F(name) + delta, 0)
+        for name, delta in deltas.items()
+        if delta
+    }
+
+
+def adjust_process(process_id: int, **deltas: int) -> None:
+    if increments := _increments(deltas):
+        RecruitmentProcess.objects.filter(pk=process_id).update(**increments)
+
+
+def adjust_stage(stage_id: int, *, feedback_count: int = 0, rating_sum: int = 0) -> None:
+    """Adjust the feedback counters of a stage and of the process it belongs to."""
+    if increments := _increments({"feedback_count": feedback_count, "rating_sum": rating_sum}):
+        ProcessStage.objects.filter(pk=stage_id).update(**increments)
+        RecruitmentProcess.objects.filter(stages=stage_id).update(**increments)
+
+
+def _total(queryset: QuerySet, outer: str, aggregate) -> Coalesce:
+    rows = queryset.filter(**{outer: OuterRef("pk")}).order_by().values(outer).annotate(total=aggregate)
+    return Coalesce(Subquery(rows.values("total")), 0)
+
+
+def expected_process_counters() -> dict:
+    """Expressions recomputing each process counter from the source tables."""
+    return {
+        "stage_count": _total(ProcessStage.objects.all(), "process", Count("pk")),
+        "candidate_count": _total(CandidateAssignment.objects.all(), "process", Count("pk")),
+        "completed_count": _total(
+            CandidateAssignment.objects.filter(current_stage__isnull=True), "process", Count("pk")
+        ),
+        "feedback_count": _total(StageFeedback.objects.all(), "stage__process", Count("pk")),
+        "rating_sum": _total(StageFeedback.objects.all(), "stage__process", Sum("rating")),
+    }
+
+
+def expected_stage_counters() -> dict:
+    return {
+        "feedback_count": _total(StageFeedback.objects.all(), "stage", Count("pk")),
+        "rating_sum": _total(StageFeedback.objects.all(), "stage", Sum("rating")),
+    }
+
+
+def _drifted(queryset: QuerySet, expected: dict) -> QuerySet:
+    annotated = queryset.annotate(**{f"expected_{name}": expression for name, expression in expected.items()})
+    mismatch = reduce(or_, [~Q(**{name: F(f"expected_{name}")}) for name in expected])
+    return annotated.filter(mismatch)
+
+
+def find_drift() -> dict[str, list[int]]:
+    """Ids of the processes and stages whose stored counters disagree with the data."""
+    return {
+        "processes": list(
+            _drifted(RecruitmentProcess.objects.all(), expected_process_counters()).values_list("pk", flat=True)
+        ),
+        "stages": list(_drifted(ProcessStage.objects.all(), expected_stage_counters()).values_list("pk", flat=True)),
+    }
+
+
+def repair(drift: dict[str, list[int]] | None = None) -> dict[str, int]:
+    """Recompute the counters of the drifted rows (all drifted rows by default)."""
+    if drift is None:
+        drift = find_drift()
+    return {
+        "processes": RecruitmentProcess.objects.filter(pk__in=drift["processes"]).update(
+            **expected_process_counters()
+        ),
+        "stages": ProcessStage.objects.filter(pk__in=drift["stages"]).update(**expected_stage_counters()),
+    }
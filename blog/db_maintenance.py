@@ -0,0 +1,95 @@
+"""SQLite maintenance: statistics, free-page reclamation and size reporting.
+
+The per-connection PRAGMAs (WAL, ``synchronous``, cache and mmap sizes) come
+from ``settings.SQLITE_PRAGMAS`` through the database ``init_command`` and the
+busy timeout from its ``timeout`` option; this module covers the periodic work
+run by the ``optimize_database`` command.
+"""
+
+from dataclasses import dataclass
+
+from django.db import connections
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+@dataclass
+class ObjectSize:
+    name: str
+    kind: str  # "table" o "index"
+    table: str
+    bytes: int
+
+
+def _pragma(using: str, name: str):
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def settings_report(using: str = "default") -> dict:
+    """Current value of the PRAGMAs this project tunes."""
+    names = ["journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "auto_vacuum", "freelist_count"]
+    report = {name: _pragma(using, name) for name in names}
+    report["auto_vacuum"] = AUTO_VACUUM_MODES.get(report["auto_vacuum"], report["auto_vacuum"])
+    return report
+
+
+def optimize(using: str = "default", analyze: bool = True, vacuum_pages: int = 0) -> list[str]:
+    """Refresh planner statistics, reclaim free pages and checkpoint the WAL.
+
+    ``vacuum_pages`` limits the incremental vacuum (0 frees every page); it
+    only applies when ``auto_vacuum`` is incremental, see
+    ``enable_incremental_vacuum``. Returns the statements that were run.
+    """
+    statements = []
+    if analyze:
+        statements.append("ANALYZE")
+    statements.append("PRAGMA optimize")
+    if _pragma(using, "auto_vacuum") == 2:
+        statements.append(f"PRAGMA incremental_vacuum({vacuum_pages})" if vacuum_pages else "PRAGMA incremental_vacuum")
+    if _pragma(using, "journal_mode") == "wal":
+        statements.append("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    with connections[using].cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+            # incremental_vacuum libera páginas a medida que se leen sus filas.
+            cursor.fetchall()
+    return statements
+
+
+def enable_incremental_vacuum(using: str = "default") -> None:
+    """Switch the database to incremental auto-vacuum.
+
+    The mode only takes effect after a full ``VACUUM``, which rewrites the
+    whole file and holds the write lock until it finishes.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+
+
+def object_sizes(using: str = "default") -> list[ObjectSize]:
+    """On-disk size of every table and index, largest first.
+
+    Requires the ``dbstat`` virtual table (available in the SQLite bundled
+    with CPython); raises ``DatabaseError`` otherwise.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT stat.name, COALESCE(schema.type, 'table'), COALESCE(schema.tbl_name, stat.name), SUM(stat.pgsize)
+            FROM dbstat AS stat
+            LEFT JOIN sqlite_schema AS schema ON schema.name = stat.name
+            GROUP BY stat.name
+            ORDER BY SUM(stat.pgsize) DESC, stat.name
+            """
+        )
+        return [ObjectSize(name, kind, table, size) for name, kind, table, size in cursor.fetchall()]
+
+
+def total_size(using: str = "default") -> int:
+    return _pragma(using, "page_count") * _pragma(using, "page_size")
+
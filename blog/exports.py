@@ -0,0 +1,154 @@
+"""Streaming CSV exports for the metrics pages.
+
+Rows are read with ``QuerySet.iterator`` and written to the client in small
+batches, so memory stays flat no matter how many rows are exported.
+"""
+
+import csv
+from collections.abc import Iterable, Iterator
+
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from . import rollups
+from .models import RecruitmentProcess, StageFeedback
+
+EXPORT_CHUNK_SIZE = 2000
+ROWS_PER_FLUSH = 200
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the CSV line back to the caller."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_chunks(header: list[str], rows: Iterable[list]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    buffer = [writer.writerow(header)]
+    for row in rows:
+        buffer.append(writer.writerow(row))
+        if len(buffer) >= ROWS_PER_FLUSH:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def streaming_csv_response(prefix: str, header: list[str], rows: Iterable[list]) -> StreamingHttpResponse:
+    """Build a ``text/csv`` attachment that streams ``rows`` lazily."""
+    filename = f"{prefix}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    response = StreamingHttpResponse(_csv_chunks(header, rows), content_type="text/csv")
+    response["Content-Disposition"] = f"attachment; filename={filename}"
+    return response
+
+
+def process_metric_header() -> list[str]:
+    return [
+        _("Proceso"),
+        _("Responsable"),
+        _("Estado"),
+        _("Candidatos"),
+        _("Etapas"),
+        _("Feedback"),
+        _("Rating promedio"),
+        _("Candidatos completados"),
+    ]
+
+
+def process_metric_rows(queryset: QuerySet | None = None) -> Iterator[list]:
+    """Yield one CSV row per process using the daily rollups."""
+    if queryset is None:
+        queryset = RecruitmentProcess.objects.all()
+    process_metrics = rollups.annotate_process_totals(queryset.select_related("owner")).order_by("-created_at")
+
+    for process in process_metrics.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            process.title,
+            process.owner.get_full_name() or process.owner.username,
+            process.get_status_display(),
+            process.assignment_total,
+            process.stage_total,
+            process.feedback_total,
+            f"{process.avg_rating:.2f}" if process.avg_rating is not None else "",
+            process.completed_assignments,
+        ]
+
+
+def feedback_header() -> list[str]:
+    return [
+        _("Proceso"),
+        _("Orden etapa"),
+        _("Etapa"),
+        _("Rating"),
+        _("Autor"),
+        _("Anónimo"),
+        _("Aspectos positivos"),
+        _("Áreas de mejora"),
+        _("Consejos"),
+        _("Comentario"),
+        _("Visibilidad"),
+        _("Fecha"),
+    ]
+
+
+def feedback_rows(queryset: QuerySet | None = None) -> Iterator[list]:
+    """Yield one CSV row per feedback, hiding the author of anonymous entries."""
+    if queryset is None:
+        queryset = StageFeedback.objects.all()
+    visibility_labels = dict(StageFeedback._meta.get_field("visibility").choices)
+
+    values = queryset.order_by("pk").values_list(
+        "assignment__process__title",
+        "stage__order",
+        "stage__name",
+        "rating",
+        "is_anonymous",
+        "author__username",
+        "author__first_name",
+        "author__last_name",
+        "pros",
+        "cons",
+        "advice",
+        "comment",
+        "visibility",
+        "created_at",
+    )
+
+    for (
+        process_title,
+        stage_order,
+        stage_name,
+        rating,
+        is_anonymous,
+        username,
+        first_name,
+        last_name,
+        pros,
+        cons,
+        advice,
+        comment,
+        visibility,
+        created_at,
+    ) in values.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        if is_anonymous:
+            author = StageFeedback.ANONYMOUS_AUTHOR
+        else:
+            author = f"{first_name} {last_name}".strip() or username
+        yield [
+            process_title,
+            stage_order,
+            stage_name,
+            rating,
+            author,
+            _("Sí") if is_anonymous else _("No"),
+            pros,
+            cons,
+            advice,
+            comment,
+            visibility_labels.get(visibility, visibility),
+            timezone.localtime(created_at).strftime("%Y-%m-%d %H:%M"),
+        ]
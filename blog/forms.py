@@ -1,6 +1,10 @@
+import csv
+import re
+
 from django import forms
 
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 
 from .models import CandidateAssignment, ProcessStage, RecruitmentProcess, StageFeedback
 
@@ -87,10 +91,60 @@ class ProcessStageForm(forms.ModelForm):
         return order
 
 
+def candidate_queryset():
+    """Users that may be assigned to a process as candidates."""
+    return get_user_model().objects.filter(is_active=True)
+
+
+def prefix_match(term: str, *fields: str) -> Q:
+    """Match ``term`` (as typed or lowercased) as a prefix of any of ``fields``.
+
+    The prefix is matched with ``>=``/``<`` ranges instead of ``LIKE`` so
+    indexes on the fields can be used.
+    """
+    matches = Q()
+    for prefix in {term, term.lower()}:
+        upper = prefix + "\U0010ffff"
+        for name in fields:
+            matches |= Q(**{f"{name}__gte": prefix, f"{name}__lt": upper})
+    return matches
+
+
+def search_candidates(process: RecruitmentProcess, term: str, limit: int):
+    """Prefix-search eligible candidates for ``process`` on username and email.
+
+    Users already assigned to the process are excluded and at most ``limit``
+    rows are returned.
+    """
+    term = term.strip()
+    if not term:
+        return []
+    return list(
+        candidate_queryset()
+        .filter(prefix_match(term, "username", "email"))
+        .exclude(candidate_assignments__process=process)
+        .order_by("username")
+        .values("id", "username", "email", "first_name", "last_name")[:limit]
+    )
+
+
+class CandidateSearchWidget(forms.Select):
+    """Select that renders only the chosen candidate; options come from the search endpoint."""
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [item for item in value if str(item).isdigit()]
+        users = get_user_model().objects.filter(pk__in=selected) if selected else []
+        options = [self.create_option(name, "", "Busca un candidato…", not selected, 0)]
+        for index, user in enumerate(users, start=1):
+            label = f"{user.get_full_name() or user.username} ({user.email or user.username})"
+            options.append(self.create_option(name, user.pk, label, True, index))
+        return [(None, options, 0)]
+
+
 class CandidateAssignmentForm(forms.ModelForm):
     candidate = forms.ModelChoiceField(
-        queryset=get_user_model().objects.all(),
-        widget=forms.Select(attrs={"class": "form-select"}),
+        queryset=candidate_queryset(),
+        widget=CandidateSearchWidget(attrs={"class": "form-select"}),
     )
 
     class Meta:
@@ -103,6 +157,7 @@ class CandidateAssignmentForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         process = kwargs.pop("process", None)
         super().__init__(*args, **kwargs)
+        self.process = process
         if process:
             self.fields["current_stage"].queryset = process.stages.order_by("order")
 
@@ -115,3 +170,77 @@ class CandidateAssignmentForm(forms.ModelForm):
             if exists:
                 raise forms.ValidationError("Este candidato ya está asignado al proceso.")
         return cleaned_data
+
+
+class CandidateImportForm(forms.Form):
+    """Bulk assignment from a CSV upload or a pasted list of usernames/emails."""
+
+    MAX_IDENTIFIERS = 5000
+    HEADER_NAMES = {"username", "usuario", "email", "correo"}
+
+    file = forms.FileField(
+        required=False,
+        label="Archivo CSV",
+        help_text="Una fila por candidato; se usa la primera columna (usuario o correo).",
+        widget=forms.ClearableFileInput(attrs={"class": "form-control", "accept": ".csv,text/csv"}),
+    )
+    identifiers = forms.CharField(
+        required=False,
+        label="Usuarios o correos",
+        help_text="Separa los valores con saltos de línea, comas o punto y coma.",
+        widget=forms.Textarea(attrs={"class": "form-control", "rows": 6, "placeholder": "ana@empresa.com\njuan.perez"}),
+    )
+    current_stage = forms.ModelChoiceField(
+        queryset=ProcessStage.objects.none(),
+        required=False,
+        label="Etapa inicial",
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        process = kwargs.pop("process")
+        super().__init__(*args, **kwargs)
+        self.fields["current_stage"].queryset = process.stages.order_by("order")
+
+    def _read_file(self, upload) -> list[str]:
+        try:
+            lines = upload.read().decode("utf-8-sig").splitlines()
+        except UnicodeDecodeError:
+            raise forms.ValidationError("El archivo debe estar codificado en UTF-8.")
+        values = [row[0].strip() for row in csv.reader(lines) if row and row[0].strip()]
+        if values and values[0].lower() in self.HEADER_NAMES:
+            values = values[1:]
+        return values
+
+    def clean(self):
+        cleaned_data = super().clean()
+        identifiers = []
+        if upload := cleaned_data.get("file"):
+            identifiers += self._read_file(upload)
+        identifiers += [value for value in re.split(r"[\s,;]+", cleaned_data.get("identifiers", "")) if value]
+
+        if not identifiers:
+            raise forms.ValidationError("Sube un archivo o pega al menos un usuario o correo.")
+        if len(identifiers) > self.MAX_IDENTIFIERS:
+            raise forms.ValidationError(f"Importa como máximo {self.MAX_IDENTIFIERS} candidatos por vez.")
+
+        lowered = {value.lower() for value in identifiers}
+        users = candidate_queryset().filter(Q(username__in=identifiers) | Q(email__in=set(identifiers) | lowered))
+        by_username = {user.username: user for user in users}
+        by_email = {user.email.lower(): user for user in users if user.email}
+
+        candidates, unknown, duplicates, seen = [], [], [], set()
+        for value in identifiers:
+            user = by_username.get(value) or by_email.get(value.lower())
+            if user is None:
+                unknown.append(value)
+            elif user.pk in seen:
+                duplicates.append(value)
+            else:
+                seen.add(user.pk)
+                candidates.append(user)
+
+        cleaned_data["candidates"] = candidates
+        cleaned_data["unknown"] = unknown
+        cleaned_data["duplicates"] = duplicates
+        return cleaned_data
@@ -0,0 +1,314 @@
+"""Stage transition log and the funnel analytics built on it.
+
+``record_transitions`` appends a ``StageTransition`` for every assignment that
+is created, changes stage or completes the process; ``blog.signals`` calls it
+from ``post_save`` and ``assignments_bulk_saved``, so single saves, the batch
+advance and CSV imports are all logged. ``record_released`` covers the
+assignments completed by deleting their current stage.
+
+``process_funnel`` reads one process' history with window functions: ``LEAD``
+turns consecutive transitions of an assignment into stays (entered, left),
+``ROW_NUMBER``/``COUNT`` over each stage's stays pick the median and p90
+dwell time, and a running ``SUM`` over the furthest stage of each candidate
+gives how many reached every stage. It always runs five queries, however
+long the history is, all of them starting from ``blog_transition_process_idx``.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from django.db import NotSupportedError, connections, router
+from django.utils import timezone
+
+from .models import CandidateAssignment, ProcessStage, StageTransition
+
+# Una estadía abierta es "estancada" si supera el p90 de su etapa y al menos estos días.
+STUCK_MIN_DAYS = 7
+STUCK_LIMIT = 10
+# Posiciones de quienes aún no tienen etapa y de quienes completaron el proceso.
+NOT_STARTED_POSITION = -1
+COMPLETED_POSITION = 2**31 - 1
+
+SECONDS_BETWEEN = {
+    "sqlite": "((julianday({later}) - julianday({earlier})) * 86400)",
+    "postgresql": "EXTRACT(EPOCH FROM ({later} - {earlier}))",
+    "mysql": "TIMESTAMPDIFF(SECOND, {earlier}, {later})",
+}
+
+
+def _transition(assignment: CandidateAssignment, created: bool) -> StageTransition | None:
+    if created:
+        # Sin etapa la asignación cuenta como completada, igual que en blog.counters y en la migración 0009.
+        return StageTransition(
+            assignment=assignment,
+            process_id=assignment.process_id,
+            to_stage_id=assignment.current_stage_id,
+            kind="assigned" if assignment.current_stage_id is not None else "completed",
+            created_at=assignment.joined_at,
+        )
+    previous = assignment.loaded_value("current_stage_id")
+    if previous == assignment.current_stage_id:
+        return None
+    return StageTransition(
+        assignment=assignment,
+        process_id=assignment.process_id,
+        from_stage_id=previous,
+        to_stage_id=assignment.current_stage_id,
+        kind="completed" if assignment.current_stage_id is None else "advanced",
+    )
+
+
+def record_transitions(assignments: Iterable[CandidateAssignment], created: bool = False) -> None:
+    """Log the creation or the stage change of ``assignments`` in one batched insert.
+
+    Must run before the loaded values of the instances are refreshed (see
+    ``TracksLoadedValues``); updates that keep the same stage log nothing.
+    """
+    transitions = [
+        transition for assignment in assignments if (transition := _transition(assignment, created)) is not None
+    ]
+    if transitions:
+        StageTransition.objects.bulk_create(transitions, batch_size=500)
+
+
+def record_released(assignments: Iterable[CandidateAssignment], stage: ProcessStage) -> None:
+    """Log ``completed`` for ``assignments`` whose current ``stage`` is about to be deleted.
+
+    ``on_delete=SET_NULL`` completes them with a single ``UPDATE`` and no
+    ``post_save``; call this from ``pre_delete``, while the stage still exists.
+    """
+    StageTransition.objects.bulk_create(
+        [
+            StageTransition(
+                assignment=assignment, process_id=assignment.process_id, from_stage=stage, kind="completed"
+            )
+            for assignment in assignments
+        ],
+        batch_size=500,
+    )
+
+
+@dataclass
+class StageFunnel:
+    stage: ProcessStage
+    # Candidatos que llegaron a la etapa (o más allá) y los que siguen en ella.
+    reached: int = 0
+    current: int = 0
+    # Proporción de ``reached`` que pasó a la etapa siguiente (o completó el proceso).
+    conversion: float | None = None
+    median_dwell: timedelta | None = None
+    p90_dwell: timedelta | None = None
+    stuck: int = 0
+
+    @property
+    def conversion_percent(self) -> int | None:
+        return None if self.conversion is None else round(self.conversion * 100)
+
+    @property
+    def median_days(self) -> float | None:
+        return _days(self.median_dwell)
+
+    @property
+    def p90_days(self) -> float | None:
+        return _days(self.p90_dwell)
+
+
+@dataclass
+class StuckCandidate:
+    assignment: CandidateAssignment
+    stage: ProcessStage
+    since: datetime
+    waited: timedelta
+
+    @property
+    def waited_days(self) -> float:
+        return _days(self.waited)
+
+
+@dataclass
+class ProcessFunnel:
+    process_id: int
+    stages: list[StageFunnel] = field(default_factory=list)
+    assigned: int = 0
+    completed: int = 0
+    stuck: list[StuckCandidate] = field(default_factory=list)
+
+    @property
+    def completion_rate(self) -> float | None:
+        return self.completed / self.assigned if self.assigned else None
+
+    @property
+    def completion_percent(self) -> int | None:
+        rate = self.completion_rate
+        return None if rate is None else round(rate * 100)
+
+
+def _days(value: timedelta | None) -> float | None:
+    return None if value is None else value.total_seconds() / 86400
+
+
+def _stays_sql(vendor: str) -> str:
+    """CTEs ``stays`` (one row per stage visit with its dwell in seconds) and ``per_stage``.
+
+    Open stays (the candidate's current stage) have ``left_at`` NULL and are
+    measured up to ``now``. ``per_stage`` has the open stays, the median and
+    p90 of the closed ones and how many open stays are stuck. Parameters:
+    ``process_id``, ``now`` and the stuck threshold in seconds.
+    """
+    try:
+        seconds = SECONDS_BETWEEN[vendor]
+    except KeyError:
+        raise NotSupportedError(f"Funnel analytics are not available on {vendor}.") from None
+    dwell = seconds.format(later="COALESCE(visits.left_at, %s)", earlier="visits.entered_at")
+    return f"""
+        visits AS (
+            SELECT t.assignment_id, t.to_stage_id AS stage_id, t.created_at AS entered_at,
+                   LEAD(t.created_at) OVER (PARTITION BY t.assignment_id ORDER BY t.created_at, t.id) AS left_at
+            FROM blog_stagetransition t
+            WHERE t.process_id = %s
+        ),
+        stays AS (
+            SELECT visits.assignment_id, visits.stage_id, visits.entered_at, visits.left_at, {dwell} AS dwell
+            FROM visits
+            WHERE visits.stage_id IS NOT NULL
+        ),
+        ranked AS (
+            SELECT stays.stage_id, stays.left_at IS NULL AS is_open, stays.dwell,
+                   ROW_NUMBER() OVER (PARTITION BY stays.stage_id, stays.left_at IS NULL ORDER BY stays.dwell) AS position,
+                   COUNT(*) OVER (PARTITION BY stays.stage_id, stays.left_at IS NULL) AS total
+            FROM stays
+        ),
+        percentiles AS (
+            -- Rango más cercano sobre las estadías cerradas: posiciones ceil(n/2) y ceil(0.9 n).
+            SELECT ranked.stage_id,
+                   SUM(CASE WHEN ranked.is_open THEN 1 ELSE 0 END) AS open_total,
+                   MAX(CASE WHEN NOT ranked.is_open AND ranked.position = (ranked.total + 1) / 2
+                       THEN ranked.dwell END) AS median_dwell,
+                   MAX(CASE WHEN NOT ranked.is_open AND ranked.position = (ranked.total * 9 + 9) / 10
+                       THEN ranked.dwell END) AS p90_dwell
+            FROM ranked
+            GROUP BY ranked.stage_id
+        ),
+        stuck AS (
+            SELECT stays.assignment_id, stays.stage_id, stays.entered_at, stays.dwell
+            FROM stays
+            JOIN percentiles ON percentiles.stage_id = stays.stage_id
+            WHERE stays.left_at IS NULL AND stays.dwell >= %s
+              AND (percentiles.p90_dwell IS NULL OR stays.dwell > percentiles.p90_dwell)
+        ),
+        per_stage AS (
+            SELECT percentiles.stage_id, percentiles.open_total, percentiles.median_dwell, percentiles.p90_dwell,
+                   (SELECT COUNT(*) FROM stuck WHERE stuck.stage_id = percentiles.stage_id) AS stuck_total
+            FROM percentiles
+        )
+    """
+
+
+def _reached(cursor, process_id: int) -> dict[int, int]:
+    """Running count of candidates whose furthest position is at least each position, ascending.
+
+    A candidate is completed when their latest transition is ``completed``,
+    as ``completed_count`` counts assignments without a stage; one moved back
+    into a stage afterwards counts at the furthest stage reached.
+    """
+    order = cursor.db.ops.quote_name("order")
+    cursor.execute(
+        f"""
+        WITH ordered AS (
+            SELECT t.assignment_id, t.kind, s.{order} AS stage_order,
+                   ROW_NUMBER() OVER (PARTITION BY t.assignment_id ORDER BY t.created_at DESC, t.id DESC) AS recency
+            FROM blog_stagetransition t
+            LEFT JOIN blog_processstage s ON s.id = t.to_stage_id
+            WHERE t.process_id = %s
+        ),
+        furthest AS (
+            SELECT ordered.assignment_id,
+                   CASE WHEN MAX(CASE WHEN ordered.recency = 1 AND ordered.kind = 'completed' THEN 1 ELSE 0 END) = 1
+                        THEN %s ELSE COALESCE(MAX(ordered.stage_order), %s) END AS position
+            FROM ordered
+            GROUP BY ordered.assignment_id
+        )
+        SELECT position, SUM(COUNT(*)) OVER (ORDER BY position DESC) AS reached
+        FROM furthest
+        GROUP BY position
+        ORDER BY position
+        """,
+        [process_id, COMPLETED_POSITION, NOT_STARTED_POSITION],
+    )
+    return dict(cursor.fetchall())
+
+
+def _reached_at(reached: dict[int, int], position: int) -> int:
+    # ``reached`` sólo tiene las posiciones donde alguien se detuvo: vale la primera que no quede atrás.
+    return next((total for at, total in reached.items() if at >= position), 0)
+
+
+def _seconds(value) -> timedelta | None:
+    return None if value is None else timedelta(seconds=float(value))
+
+
+def process_funnel(process_id: int, now: datetime | None = None, using: str | None = None) -> ProcessFunnel:
+    """Conversion, dwell percentiles and stuck candidates of one process, in five queries.
+
+    Reads from ``using`` or, by default, wherever the router sends
+    ``StageTransition`` reads (the replica inside ``read_from_replica``).
+    """
+    now = now or timezone.now()
+    using = using or router.db_for_read(StageTransition)
+    connection = connections[using]
+    stages = list(ProcessStage.objects.using(using).filter(process_id=process_id).order_by("order"))
+    result = ProcessFunnel(process_id=process_id)
+    if not stages:
+        return result
+
+    params = [process_id, connection.ops.adapt_datetimefield_value(now), STUCK_MIN_DAYS * 86400]
+    with connection.cursor() as cursor:
+        reached = _reached(cursor, process_id)
+        ctes = _stays_sql(connection.vendor)
+        cursor.execute(f"WITH {ctes} SELECT * FROM per_stage", params)
+        per_stage = {row[0]: row[1:] for row in cursor.fetchall()}
+        cursor.execute(
+            f"WITH {ctes} SELECT * FROM stuck ORDER BY dwell DESC, assignment_id LIMIT %s", [*params, STUCK_LIMIT]
+        )
+        stuck_rows = cursor.fetchall()
+
+    result.assigned = _reached_at(reached, NOT_STARTED_POSITION)
+    result.completed = reached.get(COMPLETED_POSITION, 0)
+    for index, stage in enumerate(stages):
+        following = stages[index + 1].order if index + 1 < len(stages) else COMPLETED_POSITION
+        open_total, median_dwell, p90_dwell, stuck_total = per_stage.get(stage.pk, (0, None, None, 0))
+        entry = StageFunnel(
+            stage=stage,
+            reached=_reached_at(reached, stage.order),
+            current=open_total or 0,
+            median_dwell=_seconds(median_dwell),
+            p90_dwell=_seconds(p90_dwell),
+            stuck=stuck_total,
+        )
+        if entry.reached:
+            entry.conversion = _reached_at(reached, following) / entry.reached
+        result.stages.append(entry)
+
+    assignments = (
+        CandidateAssignment.objects.using(using).select_related("candidate").in_bulk([row[0] for row in stuck_rows])
+    )
+    stages_by_id = {stage.pk: stage for stage in stages}
+    for assignment_id, stage_id, entered_at, dwell in stuck_rows:
+        if assignment_id in assignments and stage_id in stages_by_id:
+            result.stuck.append(
+                StuckCandidate(
+                    assignment=assignments[assignment_id],
+                    stage=stages_by_id[stage_id],
+                    since=_to_datetime(entered_at),
+                    waited=_seconds(dwell),
+                )
+            )
+    return result
+
+
+def _to_datetime(value: datetime | str) -> datetime:
+    # En SQLite las consultas crudas devuelven fechas UTC sin zona horaria (o texto).
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value if timezone.is_aware(value) else timezone.make_aware(value, UTC)
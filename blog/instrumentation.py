@@ -0,0 +1,188 @@
+"""Per-request SQL instrumentation.
+
+``QueryInstrumentationMiddleware`` wraps every database connection with an
+execute wrapper for the duration of the request and records how many
+statements ran, how long they took, which ones were repeated verbatim and
+which were the slowest. Staff users get the figures as ``Server-Timing``
+headers (visible in the browser's network panel) when the request already
+loaded the user, so reporting never adds queries; requests over the
+configured thresholds are logged with their view and URL name.
+
+Queries issued while a ``StreamingHttpResponse`` is being consumed happen
+after the middleware returns and are not counted. Worker threads started by
+the request report their statements through ``forward_queries``.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import LazyObject, empty
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "ENABLED": True,
+    "SLOW_REQUEST_MS": 500,
+    "MAX_QUERIES": 50,
+    "SLOWEST_QUERIES": 5,
+}
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "REQUEST_INSTRUMENTATION", {})}
+
+
+class QueryStats:
+    """Execute wrapper that accumulates statistics about the statements it sees."""
+
+    def __init__(self, keep_slowest: int = DEFAULTS["SLOWEST_QUERIES"]) -> None:
+        self.keep_slowest = keep_slowest
+        self.count = 0
+        self.duration = 0.0
+        self.slowest: list[tuple[float, int, str]] = []
+        self._statements: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, params, many, time.perf_counter() - start)
+
+    def record(self, sql: str, params, many: bool, elapsed: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration += elapsed
+            self._statements[(sql, None if many else repr(params))] += 1
+            entry = (elapsed, self.count, sql)
+            if len(self.slowest) < self.keep_slowest:
+                heapq.heappush(self.slowest, entry)
+            elif self.keep_slowest:
+                heapq.heappushpop(self.slowest, entry)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """SQL of every statement executed more than once with the same parameters."""
+        return {sql: count for (sql, _params), count in self._statements.items() if count > 1}
+
+    @property
+    def duplicate_count(self) -> int:
+        """Executions that repeated an earlier statement verbatim."""
+        return sum(count - 1 for count in self._statements.values() if count > 1)
+
+    def slowest_statements(self) -> list[tuple[float, str]]:
+        """``(milliseconds, sql)`` of the slowest statements, slowest first."""
+        return [(elapsed * 1000, sql) for elapsed, _order, sql in sorted(self.slowest, reverse=True)]
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries in {self.duration_ms:.1f} ms, {self.duplicate_count} duplicated"]
+        lines += [f"  {count}x {sql}" for sql, count in self.duplicates.items()]
+        lines += [f"  {elapsed:.1f} ms {sql}" for elapsed, sql in self.slowest_statements()]
+        return "\n".join(lines)
+
+
+_active_captures: ContextVar[tuple[QueryStats, ...]] = ContextVar("blog_active_captures", default=())
+
+
+def _wrap_connections(stack: ExitStack, stats: QueryStats) -> None:
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(stats))
+
+
+@contextmanager
+def capture_queries(keep_slowest: int = DEFAULTS["SLOWEST_QUERIES"]) -> Iterator[QueryStats]:
+    """Record every statement run on any configured database inside the block."""
+    stats = QueryStats(keep_slowest)
+    token = _active_captures.set((*_active_captures.get(), stats))
+    try:
+        with ExitStack() as stack:
+            _wrap_connections(stack, stats)
+            yield stats
+    finally:
+        _active_captures.reset(token)
+
+
+@contextmanager
+def forward_queries() -> Iterator[None]:
+    """Report a worker thread's statements to the captures active in the context it copied."""
+    with ExitStack() as stack:
+        for stats in _active_captures.get():
+            _wrap_connections(stack, stats)
+        yield
+
+
+def server_timing(stats: QueryStats, total_ms: float) -> str:
+    return ", ".join(
+        [
+            f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries"',
+            f'db-dup;desc="{stats.duplicate_count} duplicated"',
+            f"total;dur={total_ms:.1f}",
+        ]
+    )
+
+
+def _loaded_user(request):
+    """``request.user`` if it was already loaded during the request, else ``None``.
+
+    ``AuthenticationMiddleware`` sets a lazy object; evaluating it after the
+    response would run session and user queries outside the measurement.
+    """
+    user = getattr(request, "user", None)
+    if isinstance(user, LazyObject) and user._wrapped is empty:
+        return None
+    return user
+
+
+class QueryInstrumentationMiddleware:
+    """Count the SQL of each request, report it to staff and log slow requests."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = get_config()
+        if not config["ENABLED"]:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with capture_queries(config["SLOWEST_QUERIES"]) as stats:
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        request.query_stats = stats
+        user = _loaded_user(request)
+        if user is not None and user.is_staff:
+            response["Server-Timing"] = server_timing(stats, total_ms)
+
+        if total_ms >= config["SLOW_REQUEST_MS"] or stats.count > config["MAX_QUERIES"]:
+            self.log_slow_request(request, response, stats, total_ms)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs) -> None:
+        request.view_name = f"{view_func.__module__}.{getattr(view_func, '__qualname__', view_func.__class__.__name__)}"
+
+    def log_slow_request(self, request, response, stats: QueryStats, total_ms: float) -> None:
+        match = getattr(request, "resolver_match", None)
+        LOGGER.warning(
+            "Petición lenta %s %s (vista=%s, url=%s, estado=%s): %.1f ms en total\n%s",
+            request.method,
+            request.path,
+            getattr(request, "view_name", "-"),
+            match.view_name if match else "-",
+            response.status_code,
+            total_ms,
+            stats.summary(),
+        )
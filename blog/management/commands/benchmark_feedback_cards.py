@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from blog import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el costo por tarjeta del tag feedback_cards (armado de filas y renderizado) "
+        "sobre feedback en memoria, sin base de datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cards",
+            type=int,
+            nargs="+",
+            default=list(benchmarks.DEFAULT_CARD_COUNTS),
+            help="Cantidades de tarjetas a renderizar.",
+        )
+        parser.add_argument("--iterations", type=int, default=5, help="Se informa la mejor repetición.")
+
+    def handle(self, *args, **options):
+        results = benchmarks.measure_feedback_cards(options["cards"], iterations=options["iterations"])
+        self.stdout.write(f"{'tarjetas':>9} {'filas µs/tarjeta':>17} {'render µs/tarjeta':>18} {'total ms':>9}")
+        for count, row in results.items():
+            self.stdout.write(
+                f"{count:>9} {row['rows_us_per_card']:>17.2f} {row['render_us_per_card']:>18.2f} {row['total_ms']:>9.2f}"
+            )
@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from blog import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide latencia (p50/p95), consultas y memoria de las vistas sobre datos sembrados "
+        "en una base de datos de prueba, y compara con una línea base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            type=float,
+            nargs="+",
+            default=list(benchmarks.DEFAULT_SCALES),
+            help="Escalas de datos a medir (ver seed_connectmetric).",
+        )
+        parser.add_argument("--iterations", type=int, default=benchmarks.DEFAULT_ITERATIONS)
+        parser.add_argument("--warmup", type=int, default=benchmarks.DEFAULT_WARMUP)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="benchmarks/latest.json", help="Archivo JSON de resultados.")
+        parser.add_argument("--baseline", default="benchmarks/baseline.json", help="Línea base a comparar.")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=benchmarks.DEFAULT_TOLERANCE,
+            help="Regresión de latencia/memoria permitida, como fracción (0.25 = 25%%).",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Guarda los resultados como nueva línea base en lugar de comparar.",
+        )
+
+    def handle(self, *args, **options):
+        verbosity = options["verbosity"]
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = benchmarks.run_benchmarks(
+                scales=options["scales"],
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                seed=options["seed"],
+                log=(lambda message: self.stdout.write(message)) if verbosity > 1 else (lambda message: None),
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.write_table(results)
+        self.write_json(options["output"], results)
+
+        baseline_path = Path(options["baseline"])
+        if options["update_baseline"]:
+            self.write_json(baseline_path, results)
+            return
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f"No existe la línea base {baseline_path}; no se compara."))
+            return
+
+        regressions = benchmarks.compare(
+            results, json.loads(baseline_path.read_text()), tolerance=options["tolerance"]
+        )
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} regresiones respecto a {baseline_path}:\n" + "\n".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS(f"Sin regresiones respecto a {baseline_path}."))
+
+    def write_table(self, results: dict) -> None:
+        for scale, views in results["scales"].items():
+            self.stdout.write(f"\nEscala {scale}x")
+            self.stdout.write(f"{'vista':<26} {'p50 ms':>9} {'p95 ms':>9} {'consultas':>9} {'memoria KB':>11}")
+            for name, row in views.items():
+                self.stdout.write(
+                    f"{name:<26} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['queries']:>9} {row['peak_kb']:>11.1f}"
+                )
+
+    def write_json(self, path, results: dict) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        self.stdout.write(f"Resultados escritos en {path}.")
@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from blog import db_maintenance
+
+
+def _human(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mantenimiento de SQLite: actualiza estadísticas (ANALYZE, PRAGMA optimize), libera "
+        "páginas con vacuum incremental, vacía el WAL e informa el tamaño de tablas e índices."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--skip-analyze",
+            action="store_true",
+            help="Omite el ANALYZE completo; PRAGMA optimize sigue analizando las tablas que lo necesiten.",
+        )
+        parser.add_argument(
+            "--vacuum-pages",
+            type=int,
+            default=0,
+            help="Máximo de páginas a liberar con el vacuum incremental (0 = todas).",
+        )
+        parser.add_argument(
+            "--enable-incremental-vacuum",
+            action="store_true",
+            help="Activa auto_vacuum=INCREMENTAL; ejecuta un VACUUM completo que bloquea las escrituras.",
+        )
+        parser.add_argument("--top", type=int, default=20, help="Cantidad de tablas e índices a listar.")
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if connections[using].vendor != "sqlite":
+            raise CommandError(f"La base de datos '{using}' no es SQLite.")
+
+        if options["enable_incremental_vacuum"]:
+            self.stdout.write("Ejecutando VACUUM completo para activar el vacuum incremental...")
+            db_maintenance.enable_incremental_vacuum(using)
+
+        before = db_maintenance.total_size(using)
+        for statement in db_maintenance.optimize(
+            using, analyze=not options["skip_analyze"], vacuum_pages=options["vacuum_pages"]
+        ):
+            self.stdout.write(f"  {statement}")
+        after = db_maintenance.total_size(using)
+        self.stdout.write(self.style.SUCCESS(f"Base de datos: {_human(before)} → {_human(after)}."))
+
+        report = db_maintenance.settings_report(using)
+        self.stdout.write(", ".join(f"{name}={value}" for name, value in report.items()))
+        if report["auto_vacuum"] != "incremental":
+            self.stdout.write(
+                self.style.WARNING("auto_vacuum no es incremental; usa --enable-incremental-vacuum para activarlo.")
+            )
+
+        try:
+            sizes = db_maintenance.object_sizes(using)
+        except DatabaseError:
+            self.stdout.write(self.style.WARNING("Esta versión de SQLite no incluye dbstat; no se informan tamaños."))
+            return
+        self.stdout.write(f"\n{'objeto':<40} {'tipo':<6} {'tamaño':>10}")
+        for size in sizes[: options["top"]]:
+            self.stdout.write(f"{size.name:<40} {size.kind:<6} {_human(size.bytes):>10}")
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye el índice FTS5 de búsqueda sobre los textos del feedback desde la tabla "
+        "blog_stagefeedback. Los triggers lo mantienen al día; úsalo tras cargas con SQL crudo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            "--optimize",
+            action="store_true",
+            help="Fusiona los segmentos del índice en uno solo después de reconstruirlo.",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Sólo verifica que el índice coincida con la tabla, sin reconstruirlo.",
+        )
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        if not search.is_available(using):
+            raise CommandError("La búsqueda FTS5 sólo está disponible en SQLite.")
+
+        if options["check"]:
+            try:
+                search.integrity_check(using)
+            except DatabaseError as exc:
+                raise CommandError(f"El índice de búsqueda no coincide con la tabla: {exc}") from exc
+            self.stdout.write(self.style.SUCCESS("El índice de búsqueda está al día."))
+            return
+
+        search.rebuild(using)
+        if options["optimize"]:
+            search.optimize(using)
+        self.stdout.write(self.style.SUCCESS("Índice de búsqueda de feedback reconstruido."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recalcula desde cero las métricas diarias por proceso y etapa."
+
+    def handle(self, *args, **options):
+        process_buckets, stage_buckets = rebuild_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rollups reconstruidos: {process_buckets} buckets de proceso, {stage_buckets} buckets de etapa."
+            )
+        )
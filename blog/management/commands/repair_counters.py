@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from blog import counters
+
+
+class Command(BaseCommand):
+    help = "Detecta y corrige desfases en los contadores denormalizados de procesos y etapas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Sólo informa los desfases, sin corregirlos.",
+        )
+
+    def handle(self, *args, **options):
+        drift = counters.find_drift()
+        if not drift["processes"] and not drift["stages"]:
+            self.stdout.write(self.style.SUCCESS("Los contadores están al día."))
+            return
+
+        self.stdout.write(
+            f"Contadores desfasados: {len(drift['processes'])} procesos, {len(drift['stages'])} etapas."
+        )
+        if options["check"]:
+            return
+        repaired = counters.repair(drift)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Contadores corregidos: {repaired['processes']} procesos, {repaired['stages']} etapas."
+            )
+        )
@@ -0,0 +1,51 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.seeding import SEED_PASSWORD, clear_seeded, seed, seeded_users
+
+
+class Command(BaseCommand):
+    help = "Genera un conjunto de datos sintético y determinista para pruebas de carga."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Factor de escala (1 ≈ 4 mil feedback, 100 ≈ 400 mil).",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Semilla del generador aleatorio.")
+        parser.add_argument(
+            "--today",
+            type=date.fromisoformat,
+            default=None,
+            help="Fecha (AAAA-MM-DD) en la que terminan las fechas generadas; por defecto, hoy.",
+        )
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Elimina los datos sembrados anteriormente antes de generar los nuevos.",
+        )
+
+    def handle(self, *args, **options):
+        if options["scale"] <= 0:
+            raise CommandError("La escala debe ser mayor que cero.")
+        if seeded_users().exists():
+            if not options["replace"]:
+                raise CommandError("Ya existen datos sembrados; usa --replace para regenerarlos.")
+            clear_seeded()
+
+        started = time.perf_counter()
+        result = seed(
+            scale=options["scale"],
+            seed=options["seed"],
+            log=lambda message: self.stdout.write(message),
+            today=options["today"],
+        )
+        summary = ", ".join(f"{count} {name}" for name, count in result.counts.items())
+        self.stdout.write(
+            self.style.SUCCESS(f"Datos generados en {time.perf_counter() - started:.1f} s: {summary}.")
+        )
+        self.stdout.write(f"Todos los usuarios sembrados usan la contraseña '{SEED_PASSWORD}'.")
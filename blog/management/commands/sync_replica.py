@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog import routers
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia la base de datos primaria sobre la réplica de lectura (DJANGO_REPLICA_DB_PATH). "
+        "Pensado para probar en local la réplica con dos archivos SQLite."
+    )
+
+    def handle(self, *args, **options):
+        alias = routers.get_config()["ALIAS"]
+        if not alias:
+            raise CommandError("No hay réplica configurada; define DJANGO_REPLICA_DB_PATH.")
+        primary, replica = connections[DEFAULT_DB_ALIAS], connections[alias]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("sync_replica sólo copia bases de datos SQLite.")
+
+        source, target = str(primary.settings_dict["NAME"]), str(replica.settings_dict["NAME"])
+        replica.close()
+        routers.copy_database(source, target)
+        self.stdout.write(self.style.SUCCESS(f"Réplica {target} actualizada desde {source}."))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_stagefeedback_advice_stagefeedback_cons_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessDailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('assignment_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('feedback_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('process', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to='blog.recruitmentprocess', verbose_name='Proceso')),
+            ],
+            options={
+                'verbose_name': 'Métrica diaria de proceso',
+                'verbose_name_plural': 'Métricas diarias de procesos',
+                'ordering': ['-day'],
+                'unique_together': {('process', 'day')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StageDailyMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('feedback_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('stage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to='blog.processstage', verbose_name='Etapa')),
+            ],
+            options={
+                'verbose_name': 'Métrica diaria de etapa',
+                'verbose_name_plural': 'Métricas diarias de etapas',
+                'ordering': ['-day'],
+                'unique_together': {('stage', 'day')},
+            },
+        ),
+    ]
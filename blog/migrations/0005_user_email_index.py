@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db import migrations, models
+
+INDEX = models.Index(fields=["email"], name="blog_user_email_idx")
+
+
+def add_email_index(apps, schema_editor):
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    schema_editor.add_index(user_model, INDEX)
+
+
+def remove_email_index(apps, schema_editor):
+    user_model = apps.get_model(settings.AUTH_USER_MODEL)
+    schema_editor.remove_index(user_model, INDEX)
+
+
+class Migration(migrations.Migration):
+    """Index the user email so the candidate autocomplete can prefix-search it."""
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0004_metrics_rollups'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_index, remove_email_index),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_user_email_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidateassignment',
+            index=models.Index(fields=['candidate', '-joined_at'], name='blog_assign_cand_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateassignment',
+            index=models.Index(fields=['process', 'current_stage'], name='blog_assign_process_stage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recruitmentprocess',
+            index=models.Index(fields=['owner', '-created_at'], name='blog_process_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recruitmentprocess',
+            index=models.Index(fields=['status'], name='blog_process_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stagefeedback',
+            index=models.Index(fields=['author', '-created_at'], name='blog_feedback_author_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stagefeedback',
+            index=models.Index(fields=['stage', 'rating'], name='blog_feedback_stage_rating_idx'),
+        ),
+    ]
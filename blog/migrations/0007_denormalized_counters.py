@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    RecruitmentProcess = apps.get_model("blog", "RecruitmentProcess")
+    ProcessStage = apps.get_model("blog", "ProcessStage")
+    CandidateAssignment = apps.get_model("blog", "CandidateAssignment")
+    StageFeedback = apps.get_model("blog", "StageFeedback")
+
+    def total(queryset, outer, aggregate):
+        rows = queryset.filter(**{outer: OuterRef("pk")}).order_by().values(outer).annotate(total=aggregate)
+        return Coalesce(Subquery(rows.values("total")), 0)
+
+    RecruitmentProcess.objects.update(
+        stage_count=total(ProcessStage.objects.all(), "process", Count("pk")),
+        candidate_count=total(CandidateAssignment.objects.all(), "process", Count("pk")),
+        completed_count=total(CandidateAssignment.objects.filter(current_stage__isnull=True), "process", Count("pk")),
+        feedback_count=total(StageFeedback.objects.all(), "stage__process", Count("pk")),
+        rating_sum=total(StageFeedback.objects.all(), "stage__process", Sum("rating")),
+    )
+    ProcessStage.objects.update(
+        feedback_count=total(StageFeedback.objects.all(), "stage", Count("pk")),
+        rating_sum=total(StageFeedback.objects.all(), "stage", Sum("rating")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processstage',
+            name='feedback_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Feedback'),
+        ),
+        migrations.AddField(
+            model_name='processstage',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recruitmentprocess',
+            name='candidate_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Candidatos'),
+        ),
+        migrations.AddField(
+            model_name='recruitmentprocess',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Completados'),
+        ),
+        migrations.AddField(
+            model_name='recruitmentprocess',
+            name='feedback_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Feedback'),
+        ),
+        migrations.AddField(
+            model_name='recruitmentprocess',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='recruitmentprocess',
+            name='stage_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Etapas'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+COLUMNS = "pros, cons, advice, comment"
+OLD_VALUES = "old.id, old.pros, old.cons, old.advice, old.comment"
+NEW_VALUES = "new.id, new.pros, new.cons, new.advice, new.comment"
+
+CREATE = [
+    f"""
+    CREATE VIRTUAL TABLE blog_stagefeedback_fts USING fts5(
+        {COLUMNS},
+        content='blog_stagefeedback',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER blog_stagefeedback_fts_insert AFTER INSERT ON blog_stagefeedback BEGIN
+        INSERT INTO blog_stagefeedback_fts(rowid, {COLUMNS}) VALUES ({NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER blog_stagefeedback_fts_delete AFTER DELETE ON blog_stagefeedback BEGIN
+        INSERT INTO blog_stagefeedback_fts(blog_stagefeedback_fts, rowid, {COLUMNS}) VALUES ('delete', {OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER blog_stagefeedback_fts_update AFTER UPDATE OF {COLUMNS} ON blog_stagefeedback BEGIN
+        INSERT INTO blog_stagefeedback_fts(blog_stagefeedback_fts, rowid, {COLUMNS}) VALUES ('delete', {OLD_VALUES});
+        INSERT INTO blog_stagefeedback_fts(rowid, {COLUMNS}) VALUES ({NEW_VALUES});
+    END
+    """,
+    "INSERT INTO blog_stagefeedback_fts(blog_stagefeedback_fts) VALUES ('rebuild')",
+]
+
+DROP = [
+    "DROP TRIGGER IF EXISTS blog_stagefeedback_fts_update",
+    "DROP TRIGGER IF EXISTS blog_stagefeedback_fts_delete",
+    "DROP TRIGGER IF EXISTS blog_stagefeedback_fts_insert",
+    "DROP TABLE IF EXISTS blog_stagefeedback_fts",
+]
+
+
+def run(statements):
+    def operation(apps, schema_editor):
+        # FTS5 solo existe en SQLite; en otros motores blog.search usa icontains.
+        if schema_editor.connection.vendor == "sqlite":
+            for statement in statements:
+                schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+    """Full-text index over the feedback text, kept in sync by triggers."""
+
+    dependencies = [
+        ('blog', '0007_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(CREATE), run(DROP)),
+    ]
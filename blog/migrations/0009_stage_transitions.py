@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_transitions(apps, schema_editor):
+    # Sin historial previo: una fila por asignación con su etapa actual, fechada en joined_at.
+    # Las asignaciones sin etapa cuentan como completadas, igual que en blog.counters.
+    schema_editor.execute(
+        """
+        INSERT INTO blog_stagetransition (assignment_id, process_id, from_stage_id, to_stage_id, kind, created_at)
+        SELECT id, process_id, NULL, current_stage_id,
+               CASE WHEN current_stage_id IS NULL THEN 'completed' ELSE 'assigned' END, joined_at
+        FROM blog_candidateassignment
+        """
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_feedback_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StageTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('assigned', 'Asignado'), ('advanced', 'Cambio de etapa'), ('completed', 'Completó el proceso')], max_length=20, verbose_name='Tipo')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha')),
+                ('assignment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='blog.candidateassignment', verbose_name='Asignación')),
+                ('from_stage', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.processstage', verbose_name='Desde')),
+                ('process', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='stage_transitions', to='blog.recruitmentprocess', verbose_name='Proceso')),
+                ('to_stage', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.processstage', verbose_name='Hacia')),
+            ],
+            options={
+                'verbose_name': 'Transición de etapa',
+                'verbose_name_plural': 'Transiciones de etapa',
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['process', 'assignment', 'created_at'], name='blog_transition_process_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_transitions, migrations.RunPython.noop),
+    ]
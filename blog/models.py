@@ -2,10 +2,63 @@
 
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.dispatch import Signal
+from django.utils import timezone
 
 User = get_user_model()
 
+# Sent after bulk writes that bypass ``post_save``; receives the list of
+# ``assignments`` that were inserted or updated and ``created`` (bool).
+assignments_bulk_saved = Signal()
+
+
+class TracksLoadedValues:
+    """Remember the database values of ``tracked_fields`` when an instance is loaded.
+
+    Signal handlers compare them with the current values to turn an update
+    into counter deltas (see ``blog.counters``).
+    """
+
+    tracked_fields: tuple[str, ...] = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def remember_loaded_values(self) -> None:
+        self._loaded_values = {name: self.__dict__[name] for name in self.tracked_fields if name in self.__dict__}
+
+    def loaded_value(self, name: str):
+        """Value of ``name`` when loaded; the current value if it was never loaded."""
+        return getattr(self, "_loaded_values", {}).get(name, getattr(self, name))
+
+
+class PreservesCounters:
+    """Leave the denormalized ``counter_fields`` out of updates made through ``save()``.
+
+    ``blog.counters`` moves them with ``F()`` updates, so an instance loaded
+    earlier (an edit form, the admin) holds stale values that a full save
+    would write back. Inserts and saves with explicit ``update_fields`` are
+    untouched.
+    """
+
+    counter_fields: tuple[str, ...] = ()
+
+    def save(self, *args, **kwargs):
+        full_update = kwargs.get("update_fields") is None and not kwargs.get("force_insert")
+        if full_update and not args and not self._state.adding:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
 
 class Post(models.Model):
     """Legacy blog post model used for announcements inside the platform."""
@@ -24,9 +77,11 @@ class Post(models.Model):
         ordering = ["-published_date"]
 
 
-class RecruitmentProcess(models.Model):
+class RecruitmentProcess(PreservesCounters, models.Model):
     """Selection process created by HR or hiring managers."""
 
+    counter_fields = ("stage_count", "candidate_count", "completed_count", "feedback_count", "rating_sum")
+
     STATUS_CHOICES = [
         ("draft", "Borrador"),
         ("active", "Activo"),
@@ -42,22 +97,39 @@ class RecruitmentProcess(models.Model):
     end_date = models.DateField(null=True, blank=True, verbose_name="Fecha de cierre")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Contadores denormalizados, mantenidos por ``blog.counters``.
+    stage_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Etapas")
+    candidate_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Candidatos")
+    completed_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Completados")
+    feedback_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Feedback")
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         verbose_name = "Proceso de selección"
         verbose_name_plural = "Procesos de selección"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["owner", "-created_at"], name="blog_process_owner_created_idx"),
+            models.Index(fields=["status"], name="blog_process_status_idx"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover - representation only
         return self.title
 
     @property
     def total_stages(self) -> int:
-        return self.stages.count()
+        return self.stage_count
+
+    @property
+    def average_rating(self) -> float | None:
+        return self.rating_sum / self.feedback_count if self.feedback_count else None
 
 
-class ProcessStage(models.Model):
+class ProcessStage(PreservesCounters, models.Model):
     """Stage that belongs to a recruitment process (screening, técnica, etc.)."""
 
+    counter_fields = ("feedback_count", "rating_sum")
+
     process = models.ForeignKey(
         RecruitmentProcess,
         on_delete=models.CASCADE,
@@ -70,6 +142,9 @@ class ProcessStage(models.Model):
     due_date = models.DateField(null=True, blank=True, verbose_name="Fecha objetivo")
     is_blocker = models.BooleanField(default=False, verbose_name="Bloquea avance")
 
+    feedback_count = models.PositiveIntegerField(default=0, editable=False, verbose_name="Feedback")
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         verbose_name = "Etapa"
         verbose_name_plural = "Etapas"
@@ -79,10 +154,101 @@ class ProcessStage(models.Model):
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.process.title} - {self.name}"
 
+    @property
+    def average_rating(self) -> float | None:
+        return self.rating_sum / self.feedback_count if self.feedback_count else None
+
 
-class CandidateAssignment(models.Model):
+class CandidateAssignmentQuerySet(models.QuerySet):
+    def bulk_assign(
+        self,
+        process: RecruitmentProcess,
+        candidates: list[User],
+        current_stage: "ProcessStage | None" = None,
+    ) -> tuple[list["CandidateAssignment"], list[User]]:
+        """Assign ``candidates`` to ``process`` with a single batched insert.
+
+        Returns the created assignments and the candidates that were skipped
+        because they already belonged to the process.
+        """
+        assigned_ids = set(
+            self.filter(process=process, candidate__in=candidates).values_list("candidate_id", flat=True)
+        )
+        skipped = [candidate for candidate in candidates if candidate.pk in assigned_ids]
+        new_assignments = [
+            self.model(process=process, candidate=candidate, current_stage=current_stage)
+            for candidate in candidates
+            if candidate.pk not in assigned_ids
+        ]
+
+        with transaction.atomic():
+            created = self.bulk_create(new_assignments, batch_size=500)
+            if created:
+                assignments_bulk_saved.send(sender=self.model, assignments=created, created=True)
+        return created, skipped
+
+    def advance_stages(self) -> list[dict]:
+        """Move every selected assignment to the next stage of its process.
+
+        Assignments without a current stage start at the first stage, and those
+        on the last stage complete the process (``current_stage`` becomes
+        ``None``). Runs a fixed number of queries however many rows are
+        selected, and returns one result dict per assignment with
+        ``assignment``, ``from_stage``, ``to_stage`` and ``completed``.
+        """
+        from .stage_graph import load_stage_graphs  # stage_graph imports this module
+
+        # El grafo se lee de la base dentro de la transacción: la caché puede
+        # venir de otro proceso y no reflejar una etapa recién borrada o agregada.
+        with transaction.atomic():
+            assignments = list(self.select_related("candidate", "current_stage"))
+            if not assignments:
+                return []
+
+            graphs = load_stage_graphs(assignment.process_id for assignment in assignments)
+            transitions = {
+                (assignment.process_id, assignment.current_stage_id): graphs[assignment.process_id].next_stage(
+                    assignment.current_stage_id
+                )
+                for assignment in assignments
+            }
+            next_stages = ProcessStage.objects.in_bulk(
+                [stage_id for stage_id in transitions.values() if stage_id is not None]
+            )
+
+            results = []
+            for assignment in assignments:
+                current = assignment.current_stage
+                next_stage = next_stages.get(transitions[(assignment.process_id, assignment.current_stage_id)])
+                results.append(
+                    {
+                        "assignment": assignment,
+                        "from_stage": current,
+                        "to_stage": next_stage,
+                        "completed": next_stage is None,
+                    }
+                )
+                assignment.current_stage = next_stage
+
+            whens = [
+                When(
+                    Q(current_stage_id=stage_id) if stage_id else Q(process_id=process_id, current_stage__isnull=True),
+                    then=Value(next_stage_id),
+                )
+                for (process_id, stage_id), next_stage_id in transitions.items()
+            ]
+            self.model.objects.filter(pk__in=[assignment.pk for assignment in assignments]).update(
+                current_stage=Case(*whens, default=F("current_stage"), output_field=models.BigIntegerField())
+            )
+            assignments_bulk_saved.send(sender=self.model, assignments=assignments, created=False)
+        return results
+
+
+class CandidateAssignment(TracksLoadedValues, models.Model):
     """Relationship between a candidate and a recruitment process."""
 
+    tracked_fields = ("current_stage_id",)
+
     process = models.ForeignKey(
         RecruitmentProcess,
         on_delete=models.CASCADE,
@@ -99,10 +265,16 @@ class CandidateAssignment(models.Model):
         related_name="current_assignments",
     )
 
+    objects = CandidateAssignmentQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Asignación de candidato"
         verbose_name_plural = "Asignaciones de candidatos"
         unique_together = ("process", "candidate")
+        indexes = [
+            models.Index(fields=["candidate", "-joined_at"], name="blog_assign_cand_joined_idx"),
+            models.Index(fields=["process", "current_stage"], name="blog_assign_process_stage_idx"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.candidate.get_full_name() or self.candidate.username} → {self.process.title}"
@@ -111,9 +283,86 @@ class CandidateAssignment(models.Model):
         return self.feedbacks.select_related("stage")
 
 
-class StageFeedback(models.Model):
+class StageTransition(models.Model):
+    """Append-only log of the stage changes of an assignment, read by ``blog.funnel``.
+
+    ``blog.signals`` writes a row when an assignment is created, advances to
+    another stage or completes the process; rows are never updated.
+    ``to_stage`` is empty for ``completed`` rows and for assignments created
+    without a stage.
+    """
+
+    KIND_CHOICES = [
+        ("assigned", "Asignado"),
+        ("advanced", "Cambio de etapa"),
+        ("completed", "Completó el proceso"),
+    ]
+
+    assignment = models.ForeignKey(
+        CandidateAssignment,
+        on_delete=models.CASCADE,
+        related_name="transitions",
+        verbose_name="Asignación",
+    )
+    # Copiado de la asignación para filtrar el historial de un proceso con un índice.
+    process = models.ForeignKey(
+        RecruitmentProcess,
+        on_delete=models.CASCADE,
+        related_name="stage_transitions",
+        db_index=False,
+        verbose_name="Proceso",
+    )
+    from_stage = models.ForeignKey(
+        ProcessStage, on_delete=models.SET_NULL, null=True, blank=True, related_name="+", verbose_name="Desde"
+    )
+    to_stage = models.ForeignKey(
+        ProcessStage, on_delete=models.SET_NULL, null=True, blank=True, related_name="+", verbose_name="Hacia"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Tipo")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha")
+
+    class Meta:
+        verbose_name = "Transición de etapa"
+        verbose_name_plural = "Transiciones de etapa"
+        ordering = ["created_at", "id"]
+        indexes = [
+            # Cubre las ventanas PARTITION BY assignment ORDER BY created_at de un proceso.
+            models.Index(fields=["process", "assignment", "created_at"], name="blog_transition_process_idx"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.assignment_id}: {self.from_stage_id} → {self.to_stage_id} ({self.kind})"
+
+
+class StageFeedbackQuerySet(models.QuerySet):
+    def visible_to(self, user: User) -> "StageFeedbackQuerySet":
+        """Feedback ``user`` may read.
+
+        Staff see everything and process owners all the feedback of their
+        processes. Candidates see their own feedback and the ``candidates``
+        feedback of the processes they are assigned to; ``team`` and
+        ``private`` feedback stay with the owner and staff. Every branch
+        filters an indexed column, so SQLite can combine them with a
+        multi-index OR instead of scanning the table.
+        """
+        if user.is_staff:
+            return self
+        owned_stages = ProcessStage.objects.filter(process__owner=user).values("pk")
+        shared_stages = ProcessStage.objects.filter(
+            process__in=CandidateAssignment.objects.filter(candidate=user).values("process_id")
+        ).values("pk")
+        return self.filter(
+            Q(author=user) | Q(stage__in=owned_stages) | Q(visibility="candidates", stage__in=shared_stages)
+        )
+
+
+class StageFeedback(TracksLoadedValues, models.Model):
     """Feedback que deja un candidato sobre una etapa."""
 
+    ANONYMOUS_AUTHOR = "Candidato Anónimo"
+
+    tracked_fields = ("stage_id", "rating")
+
     assignment = models.ForeignKey(
         CandidateAssignment,
         on_delete=models.CASCADE,
@@ -162,11 +411,18 @@ class StageFeedback(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = StageFeedbackQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Feedback de etapa"
         verbose_name_plural = "Feedback de etapas"
         unique_together = ("assignment", "stage")
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["author", "-created_at"], name="blog_feedback_author_idx"),
+            # Cubre el promedio por etapa sin leer la tabla.
+            models.Index(fields=["stage", "rating"], name="blog_feedback_stage_rating_idx"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"Feedback {self.stage.name} - {self.assignment.candidate}"
@@ -177,5 +433,53 @@ class StageFeedback(models.Model):
     def get_author_display(self) -> str:
         """Retorna el nombre del autor o 'Anónimo' si está marcado como anónimo."""
         if self.is_anonymous:
-            return "Candidato Anónimo"
-        return self.author.get_full_name() or self.author.username
\ No newline at end of file
+            return self.ANONYMOUS_AUTHOR
+        return self.author.get_full_name() or self.author.username
+
+
+class ProcessDailyMetric(models.Model):
+    """Daily rollup bucket for a process, maintained by ``blog.rollups``."""
+
+    process = models.ForeignKey(
+        RecruitmentProcess,
+        on_delete=models.CASCADE,
+        related_name="daily_metrics",
+        verbose_name="Proceso",
+    )
+    day = models.DateField(verbose_name="Día")
+    assignment_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    feedback_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Métrica diaria de proceso"
+        verbose_name_plural = "Métricas diarias de procesos"
+        unique_together = ("process", "day")
+        ordering = ["-day"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.process_id} @ {self.day}"
+
+
+class StageDailyMetric(models.Model):
+    """Daily rollup bucket for a stage, maintained by ``blog.rollups``."""
+
+    stage = models.ForeignKey(
+        ProcessStage,
+        on_delete=models.CASCADE,
+        related_name="daily_metrics",
+        verbose_name="Etapa",
+    )
+    day = models.DateField(verbose_name="Día")
+    feedback_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Métrica diaria de etapa"
+        verbose_name_plural = "Métricas diarias de etapas"
+        unique_together = ("stage", "day")
+        ordering = ["-day"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.stage_id} @ {self.day}"
@@ -0,0 +1,140 @@
+"""Keyset (cursor) pagination for the ``blog`` list views.
+
+Pages are addressed by an opaque cursor that encodes the ``(timestamp, id)``
+of the row at the page boundary, so page 500 costs the same range scan as
+page 1. Lists are always ordered newest first on ``(field, pk)``.
+"""
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest
+
+DEFAULT_PAGE_SIZE = 25
+
+
+def encode_cursor(value: datetime, pk: int) -> str:
+    raw = f"{value.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int] | None:
+    """Return ``(timestamp, pk)`` for ``cursor``, or ``None`` if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, pk = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(value), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+class KeysetPage:
+    """One page of results plus the cursors needed to reach its neighbours."""
+
+    def __init__(
+        self,
+        object_list: list,
+        *,
+        next_cursor: str | None,
+        previous_cursor: str | None,
+        next_query: str = "",
+        previous_query: str = "",
+    ) -> None:
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.next_query = next_query
+        self.previous_query = previous_query
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+
+class KeysetPaginator:
+    """Paginate ``queryset`` newest first on ``(field, pk)``.
+
+    ``prefix`` namespaces the query parameters (``<prefix>after`` and
+    ``<prefix>before``) so several lists can be paginated on one page.
+    """
+
+    def __init__(self, queryset: QuerySet, field: str, per_page: int = DEFAULT_PAGE_SIZE, prefix: str = "") -> None:
+        self.queryset = queryset
+        self.field = field
+        self.per_page = per_page
+        self.after_param = f"{prefix}after"
+        self.before_param = f"{prefix}before"
+
+    def _cursor_for(self, obj) -> str:
+        return encode_cursor(getattr(obj, self.field), obj.pk)
+
+    def page(self, after: str | None = None, before: str | None = None) -> KeysetPage:
+        """Return the page after the ``after`` cursor or before the ``before`` cursor."""
+        field = self.field
+        after_key = decode_cursor(after) if after else None
+        before_key = decode_cursor(before) if before else None
+
+        if before_key:
+            value, pk = before_key
+            rows = list(
+                self.queryset.filter(Q(**{f"{field}__gt": value}) | Q(**{field: value, "pk__gt": pk})).order_by(
+                    field, "pk"
+                )[: self.per_page + 1]
+            )
+            if not rows:
+                return self.page()
+            has_previous = len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+            has_next = True
+        else:
+            queryset = self.queryset
+            if after_key:
+                value, pk = after_key
+                queryset = queryset.filter(Q(**{f"{field}__lt": value}) | Q(**{field: value, "pk__lt": pk}))
+            rows = list(queryset.order_by(f"-{field}", "-pk")[: self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            has_previous = after_key is not None
+
+        return KeysetPage(
+            rows,
+            next_cursor=self._cursor_for(rows[-1]) if rows and has_next else None,
+            previous_cursor=self._cursor_for(rows[0]) if rows and has_previous else None,
+        )
+
+    def page_from_request(self, request: HttpRequest) -> KeysetPage:
+        """Read the cursor from ``request.GET`` and fill in the pager query strings."""
+        page = self.page(
+            after=request.GET.get(self.after_param),
+            before=request.GET.get(self.before_param),
+        )
+
+        params = request.GET.copy()
+        params.pop(self.after_param, None)
+        params.pop(self.before_param, None)
+        if page.has_next:
+            params[self.after_param] = page.next_cursor
+            page.next_query = params.urlencode()
+            params.pop(self.after_param)
+        if page.has_previous:
+            params[self.before_param] = page.previous_cursor
+            page.previous_query = params.urlencode()
+        return page
@@ -0,0 +1,191 @@
+"""Rating distributions (histogram, median, percentiles, spread) per stage and process.
+
+An average hides stages where half the candidates give 1 star and the other
+half 5. ``compute`` reads every stage's 1-5 histogram in a single
+``GROUP BY stage_id, rating`` query, answered from the
+``blog_feedback_stage_rating_idx`` index alone, and derives the process
+histograms by adding up their stages. Since the data is a histogram,
+median, percentiles and standard deviation come from the counts without
+reading individual ratings.
+
+Results are cached until new feedback arrives: the per-process entries under
+the process version of ``blog.cache_versions`` and the all-stages entry under
+a global token that ``blog.signals`` renews on every feedback write.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from . import cache_versions
+from .models import ProcessStage, StageFeedback
+
+RATINGS = (1, 2, 3, 4, 5)
+VERSION_KEY = "blog:rating-stats-version"
+CACHE_TIMEOUT = cache_versions.FRAGMENT_TIMEOUT
+# Share of 1-2 and of 4-5 ratings above which a stage is flagged as divided.
+POLARIZED_SHARE = 0.3
+# Stages listed by ``RatingStats.most_dispersed`` and the answers they need to qualify.
+DISPERSED_LIMIT = 5
+DISPERSED_MIN_TOTAL = 5
+SPARK_BLOCKS = " ▁▂▃▄▅▆▇█"
+
+
+@dataclass(frozen=True)
+class RatingDistribution:
+    """Histogram of 1-5 ratings; ``counts[0]`` is the number of 1-star ratings."""
+
+    counts: tuple[int, ...] = (0, 0, 0, 0, 0)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def mean(self) -> float | None:
+        if not self.total:
+            return None
+        return sum(rating * count for rating, count in zip(RATINGS, self.counts)) / self.total
+
+    @property
+    def stddev(self) -> float | None:
+        """Population standard deviation."""
+        if not self.total:
+            return None
+        mean = self.mean
+        variance = sum(count * (rating - mean) ** 2 for rating, count in zip(RATINGS, self.counts)) / self.total
+        return math.sqrt(variance)
+
+    def _rating_at(self, position: int) -> int:
+        # Calificación en la posición ``position`` (desde 0) de la lista ordenada.
+        seen = 0
+        for rating, count in zip(RATINGS, self.counts):
+            seen += count
+            if position < seen:
+                return rating
+        return RATINGS[-1]
+
+    def percentile(self, percent: float) -> float | None:
+        """Linearly interpolated percentile, as ``statistics.quantiles(method="inclusive")``."""
+        if not self.total:
+            return None
+        position = (self.total - 1) * percent / 100
+        lower = math.floor(position)
+        low, high = self._rating_at(lower), self._rating_at(math.ceil(position))
+        return low + (high - low) * (position - lower)
+
+    @property
+    def median(self) -> float | None:
+        return self.percentile(50)
+
+    @property
+    def p10(self) -> float | None:
+        return self.percentile(10)
+
+    @property
+    def p90(self) -> float | None:
+        return self.percentile(90)
+
+    @property
+    def is_polarized(self) -> bool:
+        """True when both low (1-2) and high (4-5) ratings are a large share."""
+        if not self.total:
+            return False
+        low, high = sum(self.counts[:2]), sum(self.counts[3:])
+        return min(low, high) >= POLARIZED_SHARE * self.total
+
+    @property
+    def sparkline(self) -> str:
+        """The histogram as block characters, one per rating, for compact tables."""
+        busiest = max(self.counts)
+        if not busiest:
+            return ""
+        return "".join(SPARK_BLOCKS[round(count * (len(SPARK_BLOCKS) - 1) / busiest)] for count in self.counts)
+
+    @property
+    def bars(self) -> list[dict]:
+        """One entry per rating with its count and percentage, ready for a bar chart."""
+        busiest = max(self.counts) or 1
+        return [
+            {
+                "rating": rating,
+                "count": count,
+                "percent": round(count * 100 / self.total) if self.total else 0,
+                "height": round(count * 100 / busiest),
+            }
+            for rating, count in zip(RATINGS, self.counts)
+        ]
+
+    def __add__(self, other: "RatingDistribution") -> "RatingDistribution":
+        return RatingDistribution(tuple(a + b for a, b in zip(self.counts, other.counts)))
+
+
+EMPTY = RatingDistribution()
+
+
+@dataclass
+class RatingStats:
+    stages: dict[int, RatingDistribution] = field(default_factory=dict)
+    processes: dict[int, RatingDistribution] = field(default_factory=dict)
+    # Etapas con mayor desviación, calculadas una vez y guardadas junto al resto en la caché.
+    most_dispersed: list[int] = field(default_factory=list)
+
+    def for_stage(self, stage_id: int) -> RatingDistribution:
+        return self.stages.get(stage_id, EMPTY)
+
+    def for_process(self, process_id: int) -> RatingDistribution:
+        return self.processes.get(process_id, EMPTY)
+
+
+def compute(process_id: int | None = None) -> RatingStats:
+    """Histograms of every stage (or those of ``process_id``) and of their processes."""
+    feedback = StageFeedback.objects.all()
+    stages = ProcessStage.objects.all()
+    if process_id is not None:
+        feedback = feedback.filter(stage__process_id=process_id)
+        stages = stages.filter(process_id=process_id)
+
+    counts: dict[int, list[int]] = {}
+    rows = feedback.order_by().values_list("stage_id", "rating").annotate(total=Count("pk"))
+    for stage_id, rating, total in rows:
+        if rating in RATINGS:
+            counts.setdefault(stage_id, [0] * len(RATINGS))[rating - 1] = total
+
+    stats = RatingStats(stages={stage_id: RatingDistribution(tuple(values)) for stage_id, values in counts.items()})
+    # Agregar por proceso en Python evita unir cada fila del índice con blog_processstage.
+    for stage_id, stage_process_id in stages.values_list("pk", "process_id"):
+        if stage_id in stats.stages:
+            distribution = stats.processes.get(stage_process_id, EMPTY) + stats.stages[stage_id]
+            stats.processes[stage_process_id] = distribution
+    candidates = [
+        stage_id for stage_id, distribution in stats.stages.items() if distribution.total >= DISPERSED_MIN_TOTAL
+    ]
+    candidates.sort(key=lambda stage_id: stats.stages[stage_id].stddev, reverse=True)
+    stats.most_dispersed = candidates[:DISPERSED_LIMIT]
+    return stats
+
+
+def _global_version() -> int:
+    return cache.get_or_set(VERSION_KEY, time.time_ns, None)
+
+
+def invalidate() -> None:
+    """Drop the cached all-stages entry, now and again once the transaction commits."""
+    cache.set(VERSION_KEY, time.time_ns(), None)
+    transaction.on_commit(lambda: cache.set(VERSION_KEY, time.time_ns(), None))
+
+
+def all_stages() -> RatingStats:
+    """Cached ``compute()`` over every stage, for the metrics dashboard."""
+    key = f"blog:rating-stats:all:{_global_version()}"
+    return cache.get_or_set(key, compute, CACHE_TIMEOUT)
+
+
+def for_process(process_id: int) -> RatingStats:
+    """Cached ``compute(process_id)``, renewed with the process version."""
+    key = f"blog:rating-stats:process:{process_id}:{cache_versions.get_version(process_id)}"
+    return cache.get_or_set(key, lambda: compute(process_id), CACHE_TIMEOUT)
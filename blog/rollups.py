@@ -0,0 +1,292 @@
+"""Daily metric rollups read by the metrics pages.
+
+Every write to ``CandidateAssignment`` or ``StageFeedback`` recomputes the
+single (process, day) and (stage, day) buckets it touches, so edits and
+deletes can never leave the rollups drifting. ``rebuild_rollups`` recreates
+every bucket from scratch and backs the ``rebuild_metrics_rollups`` command.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, FloatField, OuterRef, Q, QuerySet, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf, TruncDate
+from django.utils import timezone
+
+from .models import (
+    CandidateAssignment,
+    ProcessDailyMetric,
+    ProcessStage,
+    StageDailyMetric,
+    StageFeedback,
+)
+
+TREND_DAYS = 30
+ASSIGNMENT_BUCKET_FIELDS = ("assignment_count", "completed_count")
+PROCESS_BUCKET_FIELDS = (*ASSIGNMENT_BUCKET_FIELDS, "feedback_count", "rating_sum")
+
+
+def bucket_day(value: datetime) -> date:
+    """Return the rollup day for a timestamp, in the current time zone."""
+    return timezone.localdate(value)
+
+
+def _day_range(day: date) -> tuple[datetime, datetime]:
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def refresh_process_day(process_id: int, day: date, *, create: bool = True) -> None:
+    """Recompute the bucket of ``process_id`` for ``day``.
+
+    With ``create=False`` only an existing bucket is updated; delete handlers
+    use it so cascades never insert buckets for a process being removed.
+    """
+    start, end = _day_range(day)
+    values = CandidateAssignment.objects.filter(
+        process_id=process_id, joined_at__gte=start, joined_at__lt=end
+    ).aggregate(
+        assignment_count=Count("id"),
+        completed_count=Count("id", filter=Q(current_stage__isnull=True)),
+    )
+    values |= StageFeedback.objects.filter(
+        assignment__process_id=process_id, created_at__gte=start, created_at__lt=end
+    ).aggregate(
+        feedback_count=Count("id"),
+        rating_sum=Coalesce(Sum("rating"), 0),
+    )
+
+    if create:
+        ProcessDailyMetric.objects.update_or_create(process_id=process_id, day=day, defaults=values)
+    else:
+        ProcessDailyMetric.objects.filter(process_id=process_id, day=day).update(**values)
+
+
+def refresh_stage_day(stage_id: int, day: date, *, create: bool = True) -> None:
+    """Recompute the bucket of ``stage_id`` for ``day``."""
+    start, end = _day_range(day)
+    values = StageFeedback.objects.filter(
+        stage_id=stage_id, created_at__gte=start, created_at__lt=end
+    ).aggregate(
+        feedback_count=Count("id"),
+        rating_sum=Coalesce(Sum("rating"), 0),
+    )
+
+    if create:
+        StageDailyMetric.objects.update_or_create(stage_id=stage_id, day=day, defaults=values)
+    else:
+        StageDailyMetric.objects.filter(stage_id=stage_id, day=day).update(**values)
+
+
+def _buckets_filter(buckets: set[tuple[int, date]], process_field: str, time_field: str) -> Q:
+    """Match the rows of exactly ``buckets``: one time range per day, with that day's processes."""
+    processes_by_day = defaultdict(set)
+    for process_id, day in buckets:
+        processes_by_day[day].add(process_id)
+    condition = Q()
+    for day, process_ids in processes_by_day.items():
+        start, end = _day_range(day)
+        condition |= Q(
+            **{f"{process_field}__in": process_ids, f"{time_field}__gte": start, f"{time_field}__lt": end}
+        )
+    return condition
+
+
+def refresh_process_days(buckets: set[tuple[int, date]], *, create: bool = True, feedback: bool = True) -> None:
+    """Recompute several (process_id, day) buckets with a fixed number of grouped queries.
+
+    Used after bulk writes, which bypass the per-row signal handlers.
+    ``create=False`` only updates existing buckets, as in ``refresh_process_day``.
+    ``feedback=False`` is for writes that only move assignments between
+    stages: existing buckets keep their feedback totals and only new ones
+    aggregate them.
+    """
+    if not buckets:
+        return
+    process_ids = {process_id for process_id, _ in buckets}
+    days = {day for _, day in buckets}
+    existing = {
+        (bucket.process_id, bucket.day): bucket
+        for bucket in ProcessDailyMetric.objects.filter(process_id__in=process_ids, day__in=days)
+    }
+
+    values = {key: dict.fromkeys(PROCESS_BUCKET_FIELDS, 0) for key in buckets}
+    assignment_rows = (
+        CandidateAssignment.objects.filter(_buckets_filter(buckets, "process_id", "joined_at"))
+        .annotate(day=TruncDate("joined_at"))
+        .values("process_id", "day")
+        .annotate(
+            assignment_count=Count("id"),
+            completed_count=Count("id", filter=Q(current_stage__isnull=True)),
+        )
+        .order_by()
+    )
+    for row in assignment_rows:
+        if (key := (row.pop("process_id"), row.pop("day"))) in values:
+            values[key].update(row)
+
+    feedback_buckets = buckets
+    if not feedback:
+        feedback_buckets = {key for key in buckets if key not in existing} if create else set()
+    if feedback_buckets:
+        feedback_rows = (
+            StageFeedback.objects.filter(_buckets_filter(feedback_buckets, "assignment__process_id", "created_at"))
+            .annotate(day=TruncDate("created_at"))
+            .values("assignment__process_id", "day")
+            .annotate(feedback_count=Count("id"), rating_sum=Sum("rating"))
+            .order_by()
+        )
+        for row in feedback_rows:
+            if (key := (row.pop("assignment__process_id"), row.pop("day"))) in values:
+                values[key].update(row)
+
+    updated_fields = PROCESS_BUCKET_FIELDS if feedback else ASSIGNMENT_BUCKET_FIELDS
+    to_update, to_create = [], []
+    for (process_id, day), fields in values.items():
+        bucket = existing.get((process_id, day))
+        if bucket is None:
+            if create:
+                to_create.append(ProcessDailyMetric(process_id=process_id, day=day, **fields))
+            continue
+        for name in updated_fields:
+            setattr(bucket, name, fields[name])
+        to_update.append(bucket)
+
+    ProcessDailyMetric.objects.bulk_update(to_update, list(updated_fields), batch_size=500)
+    ProcessDailyMetric.objects.bulk_create(to_create, batch_size=500)
+
+
+@transaction.atomic
+def rebuild_rollups() -> tuple[int, int]:
+    """Drop and recreate every rollup bucket; returns (process, stage) bucket counts."""
+    ProcessDailyMetric.objects.all().delete()
+    StageDailyMetric.objects.all().delete()
+
+    process_buckets: dict[tuple[int, date], ProcessDailyMetric] = {}
+
+    def process_bucket(process_id: int, day: date) -> ProcessDailyMetric:
+        key = (process_id, day)
+        if key not in process_buckets:
+            process_buckets[key] = ProcessDailyMetric(process_id=process_id, day=day)
+        return process_buckets[key]
+
+    assignment_rows = (
+        CandidateAssignment.objects.annotate(day=TruncDate("joined_at"))
+        .values("process_id", "day")
+        .annotate(
+            assignment_count=Count("id"),
+            completed_count=Count("id", filter=Q(current_stage__isnull=True)),
+        )
+        .order_by()
+    )
+    for row in assignment_rows:
+        bucket = process_bucket(row["process_id"], row["day"])
+        bucket.assignment_count = row["assignment_count"]
+        bucket.completed_count = row["completed_count"]
+
+    feedback_rows = (
+        StageFeedback.objects.annotate(day=TruncDate("created_at"))
+        .values("assignment__process_id", "day")
+        .annotate(feedback_count=Count("id"), rating_sum=Sum("rating"))
+        .order_by()
+    )
+    for row in feedback_rows:
+        bucket = process_bucket(row["assignment__process_id"], row["day"])
+        bucket.feedback_count = row["feedback_count"]
+        bucket.rating_sum = row["rating_sum"]
+
+    stage_rows = (
+        StageFeedback.objects.annotate(day=TruncDate("created_at"))
+        .values("stage_id", "day")
+        .annotate(feedback_count=Count("id"), rating_sum=Sum("rating"))
+        .order_by()
+    )
+    stage_buckets = [StageDailyMetric(**row) for row in stage_rows]
+
+    ProcessDailyMetric.objects.bulk_create(process_buckets.values(), batch_size=1000)
+    StageDailyMetric.objects.bulk_create(stage_buckets, batch_size=1000)
+    return len(process_buckets), len(stage_buckets)
+
+
+def _average(total: str, count: str) -> Cast:
+    return Cast(total, FloatField()) / NullIf(count, 0)
+
+
+def annotate_process_totals(queryset: QuerySet) -> QuerySet:
+    """Annotate processes with totals summed from their daily buckets.
+
+    Adds ``assignment_total``, ``completed_assignments``, ``feedback_total``,
+    ``stage_total`` and ``avg_rating`` without touching the feedback table.
+    """
+    stage_total = (
+        ProcessStage.objects.filter(process=OuterRef("pk"))
+        .order_by()
+        .values("process")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return queryset.annotate(
+        assignment_total=Coalesce(Sum("daily_metrics__assignment_count"), 0),
+        completed_assignments=Coalesce(Sum("daily_metrics__completed_count"), 0),
+        feedback_total=Coalesce(Sum("daily_metrics__feedback_count"), 0),
+        rating_total=Coalesce(Sum("daily_metrics__rating_sum"), 0),
+        stage_total=Coalesce(Subquery(stage_total), 0),
+    ).annotate(avg_rating=_average("rating_total", "feedback_total"))
+
+
+def annotate_stage_totals(queryset: QuerySet) -> QuerySet:
+    """Annotate stages with ``feedback_total`` and ``avg_rating`` from their buckets."""
+    return queryset.annotate(
+        feedback_total=Coalesce(Sum("daily_metrics__feedback_count"), 0),
+        rating_total=Coalesce(Sum("daily_metrics__rating_sum"), 0),
+    ).annotate(avg_rating=_average("rating_total", "feedback_total"))
+
+
+def global_totals() -> dict[str, int]:
+    """Return system-wide assignment, completion and feedback totals."""
+    return ProcessDailyMetric.objects.aggregate(
+        assignments=Coalesce(Sum("assignment_count"), 0),
+        completed=Coalesce(Sum("completed_count"), 0),
+        feedback=Coalesce(Sum("feedback_count"), 0),
+    )
+
+
+def daily_trend(days: int = TREND_DAYS) -> list[dict]:
+    """Return one point per day (oldest first) for the last ``days`` days.
+
+    Each point carries ``feedback``, ``assignments``, ``avg_rating`` and a
+    ``height`` percentage relative to the busiest day, ready for a bar chart.
+    """
+    today = timezone.localdate()
+    first_day = today - timedelta(days=days - 1)
+    rows = {
+        row["day"]: row
+        for row in ProcessDailyMetric.objects.filter(day__gte=first_day, day__lte=today)
+        .values("day")
+        .annotate(
+            feedback=Sum("feedback_count"),
+            rating=Sum("rating_sum"),
+            assignments=Sum("assignment_count"),
+        )
+        .order_by()
+    }
+
+    trend = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        row = rows.get(day, {})
+        feedback = row.get("feedback") or 0
+        trend.append(
+            {
+                "day": day,
+                "feedback": feedback,
+                "assignments": row.get("assignments") or 0,
+                "avg_rating": row["rating"] / feedback if feedback else None,
+            }
+        )
+
+    peak = max((point["feedback"] for point in trend), default=0)
+    for point in trend:
+        point["height"] = round(point["feedback"] * 100 / peak) if peak else 0
+    return trend
@@ -0,0 +1,164 @@
+"""Read-replica routing for read-heavy views.
+
+Views wrapped with ``read_from_replica`` send their reads to the alias in
+``settings.READ_REPLICA["ALIAS"]``; everything else, and every write, uses the
+primary. ``ReplicaPinningMiddleware`` remembers that a request wrote and pins
+the client to the primary with a short-lived cookie, so the page it is
+redirected to never reads from a replica that has not caught up yet.
+
+Reads inside an open ``transaction.atomic()`` block on the primary also stay
+there, since the replica cannot see uncommitted rows; this also keeps
+``TestCase`` (which wraps every test in a transaction) on the primary.
+
+Locally the replica can be a second SQLite file refreshed with the
+``sync_replica`` command.
+"""
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+DEFAULTS = {
+    "ALIAS": None,
+    "PIN_SECONDS": 15,
+    "PIN_COOKIE": "cm_primary",
+}
+
+
+def get_config() -> dict:
+    return {**DEFAULTS, **getattr(settings, "READ_REPLICA", {})}
+
+
+@dataclass
+class RequestState:
+    pinned: bool = False
+    wrote: bool = False
+
+
+_request_state: ContextVar[RequestState | None] = ContextVar("blog_replica_request_state", default=None)
+_replica_reads: ContextVar[bool] = ContextVar("blog_replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads(state: RequestState | None = None) -> Iterator[None]:
+    """Route the reads issued inside the block to the replica.
+
+    ``state`` restores the pinning state of a request whose response is
+    streamed after the middleware has returned.
+    """
+    tokens = [(_replica_reads, _replica_reads.set(True))]
+    if state is not None:
+        tokens.append((_request_state, _request_state.set(state)))
+    try:
+        yield
+    finally:
+        for variable, token in reversed(tokens):
+            variable.reset(token)
+
+
+def _stream_from_replica(content, state: RequestState | None):
+    # Cada fragmento se pide dentro de su propio bloque: bajo ASGI cada
+    # next() puede correr en un contexto distinto.
+    iterator = iter(content)
+    while True:
+        with replica_reads(state):
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+        yield chunk
+
+
+def read_from_replica(view):
+    """Serve ``view``'s reads from the replica, including those of a streamed response.
+
+    Place it below ``login_required`` so the session and user are still
+    loaded from the primary.
+    """
+
+    def stream(response):
+        if response.streaming:
+            response.streaming_content = _stream_from_replica(response.streaming_content, _request_state.get())
+        return response
+
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            with replica_reads():
+                response = await view(request, *args, **kwargs)
+            return stream(response)
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads():
+            response = view(request, *args, **kwargs)
+        return stream(response)
+
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = get_config()["ALIAS"]
+        if not alias or not _replica_reads.get():
+            return None
+        state = _request_state.get()
+        if state is not None and (state.pinned or state.wrote):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        if (state := _request_state.get()) is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplica es una copia de la primaria: los objetos de ambas se pueden relacionar.
+        aliases = {DEFAULT_DB_ALIAS, get_config()["ALIAS"]}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == get_config()["ALIAS"]:
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """Pin clients that just wrote to the primary for ``PIN_SECONDS``."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = get_config()
+        state = RequestState(pinned=config["PIN_COOKIE"] in request.COOKIES)
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+        if state.wrote and config["ALIAS"]:
+            response.set_cookie(
+                config["PIN_COOKIE"], "1", max_age=config["PIN_SECONDS"], httponly=True, samesite="Lax"
+            )
+        return response
+
+
+def copy_database(source: str, target: str) -> None:
+    """Copy the SQLite database at ``source`` over ``target`` with the online backup API."""
+    with closing(sqlite3.connect(source)) as origin, closing(sqlite3.connect(target)) as destination:
+        origin.backup(destination)
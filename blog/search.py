@@ -0,0 +1,114 @@
+"""Full-text search over the free-text fields of ``StageFeedback``.
+
+On SQLite, migration ``0008_feedback_search`` creates ``blog_stagefeedback_fts``,
+an FTS5 index with external content on ``blog_stagefeedback``, and triggers
+that keep it in sync on every insert, update and delete, including
+``bulk_create`` and raw deletes that skip model signals. Other backends fall
+back to ``icontains`` on each field.
+
+``search_feedback`` ranks the matches with FTS5's bm25 and only returns the
+feedback the user may read (``StageFeedback.objects.visible_to``); the
+``rebuild_feedback_search`` command repopulates the index from the table.
+
+Django rebuilds a SQLite table (and drops its triggers) when a migration
+alters one of its columns; such a migration must recreate the triggers.
+"""
+
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import StageFeedback
+
+User = get_user_model()
+
+FTS_TABLE = "blog_stagefeedback_fts"
+TEXT_FIELDS = ("pros", "cons", "advice", "comment")
+RESULT_LIMIT = 50
+
+
+def is_available(using: str = "default") -> bool:
+    return connections[using].vendor == "sqlite"
+
+
+def search_terms(text: str) -> list[str]:
+    return re.findall(r"\w+", text)
+
+
+def match_expression(terms: list[str]) -> str:
+    """FTS5 query matching rows that contain every term as a word prefix.
+
+    Terms are quoted, so user input can never inject FTS5 operators.
+    """
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def feedback_matches(text: str, using: str = "default") -> Q:
+    """``Q`` selecting the feedback whose text contains every word of ``text``."""
+    terms = search_terms(text)
+    if not terms:
+        return Q(pk__in=[])
+    if is_available(using):
+        return Q(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match_expression(terms)]))
+    return reduce(and_, [reduce(or_, [Q(**{f"{name}__icontains": term}) for name in TEXT_FIELDS]) for term in terms])
+
+
+def search_feedback(user: User, text: str, limit: int = RESULT_LIMIT, using: str = "default") -> list[StageFeedback]:
+    """Feedback visible to ``user`` that matches ``text``, best match first.
+
+    The visibility filter runs inside the FTS5 query, so the ``LIMIT`` applies
+    to rows the user can actually read and the cost follows the number of
+    matches instead of the size of the table: a rare term answers in a few
+    milliseconds over a million rows, while a word present in most of them
+    has to rank every match.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return []
+    visible = StageFeedback.objects.using(using).visible_to(user)
+    related = ("stage__process", "author")
+    if not is_available(using):
+        matches = visible.filter(feedback_matches(text, using)).select_related(*related)
+        return list(matches.order_by("-created_at")[:limit])
+
+    conditions, params = [f"{FTS_TABLE} MATCH %s"], [match_expression(terms)]
+    if visible.query.has_filters():
+        subquery, subquery_params = visible.order_by().values("pk").query.get_compiler(using).as_sql()
+        # El "+" impide que SQLite pase la lista a FTS5 como restricción de
+        # rowid: repetiría la búsqueda MATCH una vez por cada id visible.
+        conditions.append(f"+rowid IN ({subquery})")
+        params.extend(subquery_params)
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {' AND '.join(conditions)} ORDER BY rank LIMIT %s",
+            [*params, limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    found = StageFeedback.objects.using(using).select_related(*related).in_bulk(ids)
+    return [found[pk] for pk in ids if pk in found]
+
+
+def _command(using: str, command: str, rank: int | None = None) -> None:
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES (%s, %s)", [command, rank])
+
+
+def rebuild(using: str = "default") -> None:
+    """Repopulate the index from ``blog_stagefeedback``."""
+    _command(using, "rebuild")
+
+
+def optimize(using: str = "default") -> None:
+    """Merge the index b-trees into one; worth running after large imports."""
+    _command(using, "optimize")
+
+
+def integrity_check(using: str = "default") -> None:
+    """Raise ``DatabaseError`` if the index is out of sync with the table."""
+    # rank = 1 compara el índice con blog_stagefeedback, no sólo su estructura interna.
+    _command(using, "integrity-check", rank=1)
@@ -0,0 +1,365 @@
+"""Deterministic synthetic dataset for local load testing and benchmarks.
+
+``seed`` builds users, processes, stages, assignments, their stage
+transitions, feedback and posts from ``random.Random(seed)`` streams, so the
+same seed, scale and ``today`` always produce the same rows. Everything is written with batched ``bulk_create``
+inside one transaction; model signals do not fire, so the daily rollups and
+denormalised counters are rebuilt and the per-process cache entries dropped
+at the end.
+
+At scale 1 the dataset has ~500 users, 25 processes, 3k assignments and ~4k
+feedback rows; every count grows linearly with the scale, so 250x passes a
+million feedback rows (a few minutes on SQLite). Timestamps are spread over
+the year before ``today``, which defaults to the current day: pass a fixed
+date to get the same timestamps on any day.
+"""
+
+import random
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import cache_versions, counters, rollups, stage_graph
+from .models import (
+    CandidateAssignment,
+    Post,
+    ProcessDailyMetric,
+    ProcessStage,
+    RecruitmentProcess,
+    StageDailyMetric,
+    StageFeedback,
+    StageTransition,
+)
+
+User = get_user_model()
+
+USERNAME_PREFIX = "seed_"
+SEED_PASSWORD = "seed-pass-123"
+BATCH_SIZE = 2000
+PROCESS_CHUNK = 50
+
+BASE_COUNTS = {
+    "owners": 10,
+    "candidates": 500,
+    "processes": 25,
+    "posts": 40,
+}
+ASSIGNMENTS_PER_PROCESS = 120
+FEEDBACK_PROBABILITY = 0.6
+
+# Distribución en "J" típica de las reseñas: muchas 4-5, pocas 1-2.
+RATING_WEIGHTS = {5: 38, 4: 32, 3: 15, 2: 8, 1: 7}
+BLOCKER_RATING_WEIGHTS = {5: 18, 4: 27, 3: 25, 2: 16, 1: 14}
+ANONYMOUS_PROBABILITY = 0.25
+VISIBILITY_WEIGHTS = {"candidates": 70, "team": 20, "private": 10}
+STATUS_WEIGHTS = {"active": 55, "closed": 25, "on_hold": 10, "draft": 10}
+
+FIRST_NAMES = ["Ana", "Luis", "María", "Jorge", "Camila", "Diego", "Valentina", "Andrés", "Sofía", "Mateo"]
+LAST_NAMES = ["González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Morales", "Torres"]
+ROLES = ["Backend", "Frontend", "Data Analyst", "QA", "DevOps", "Product Manager", "UX", "Soporte"]
+STAGE_NAMES = [
+    "Screening",
+    "Entrevista RRHH",
+    "Prueba técnica",
+    "Entrevista técnica",
+    "Caso práctico",
+    "Entrevista final",
+    "Oferta",
+]
+PROS = [
+    "Las preguntas fueron claras y relevantes.",
+    "El equipo fue muy cordial durante toda la etapa.",
+    "Recibí feedback rápido después de la entrevista.",
+    "La prueba reflejaba bien el trabajo real.",
+    "",
+]
+CONS = [
+    "La coordinación de horarios tomó varios días.",
+    "Faltó contexto sobre el rol antes de empezar.",
+    "La prueba fue demasiado larga.",
+    "",
+    "",
+]
+ADVICE = [
+    "Repasa los fundamentos antes de la entrevista técnica.",
+    "Prepara ejemplos concretos de proyectos anteriores.",
+    "Pregunta por el equipo y la forma de trabajo.",
+    "",
+]
+
+
+@dataclass
+class SeedResult:
+    counts: dict[str, int] = field(default_factory=dict)
+
+    def add(self, name: str, amount: int) -> None:
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+
+def scaled(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def seeded_users() -> models.QuerySet:
+    return User.objects.filter(username__startswith=USERNAME_PREFIX)
+
+
+def _delete_rows(queryset: models.QuerySet) -> None:
+    """``DELETE`` the rows of ``queryset`` in one statement, without loading them or sending signals."""
+    connection = connections[queryset.db]
+    select_sql, params = queryset.values("pk").query.sql_with_params()
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    pk = connection.ops.quote_name(queryset.model._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {pk} IN ({select_sql})", params)
+
+
+def _drop_cached(process_ids: list[int]) -> None:
+    cache.delete_many(
+        [stage_graph.cache_key(pk) for pk in process_ids]
+        + [cache_versions.version_key(pk) for pk in process_ids]
+        + [cache_versions.scope_key(scope) for scope in (cache_versions.PROCESSES_SCOPE, cache_versions.POSTS_SCOPE)]
+    )
+
+
+def clear_seeded() -> None:
+    """Delete every seeded user and the rows that hang from them, then rebuild what derives from them.
+
+    Rows are removed table by table with one ``DELETE`` each, children
+    first: a regular ``delete()`` would load each feedback row to send the
+    rollup, counter and cache signals, which takes hours on a large dataset.
+    The daily rollups and the counters are rebuilt afterwards, which is cheap
+    once the seeded rows are gone, and the cache entries of every process
+    involved are dropped. The search index follows through its triggers.
+    """
+    users = seeded_users()
+    processes = RecruitmentProcess.objects.filter(owner__in=users)
+    with transaction.atomic():
+        process_ids = list(
+            RecruitmentProcess.objects.filter(
+                Q(pk__in=processes) | Q(assignments__candidate__in=users) | Q(stages__feedback__author__in=users)
+            )
+            .values_list("pk", flat=True)
+            .distinct()
+        )
+        for queryset in [
+            StageFeedback.objects.filter(Q(author__in=users) | Q(assignment__process__in=processes)),
+            StageTransition.objects.filter(Q(assignment__candidate__in=users) | Q(process__in=processes)),
+            CandidateAssignment.objects.filter(Q(candidate__in=users) | Q(process__in=processes)),
+            StageDailyMetric.objects.filter(stage__process__in=processes),
+            ProcessDailyMetric.objects.filter(process__in=processes),
+            ProcessStage.objects.filter(process__in=processes),
+            processes,
+            Post.objects.filter(author__in=users),
+        ]:
+            _delete_rows(queryset)
+        users.delete()
+        rollups.rebuild_rollups()
+        counters.repair()
+    _drop_cached(process_ids)
+
+
+@contextmanager
+def _explicit_timestamps(*fields: models.DateTimeField) -> Iterator[None]:
+    """Let ``bulk_create`` keep the timestamps we generate instead of ``now()``."""
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+def _weighted(rng: random.Random, weights: dict) -> Callable[[], object]:
+    values, cum_weights = list(weights), []
+    total = 0
+    for weight in weights.values():
+        total += weight
+        cum_weights.append(total)
+    return lambda: rng.choices(values, cum_weights=cum_weights)[0]
+
+
+def _between(rng: random.Random, start: datetime, end: datetime) -> datetime:
+    if end <= start:
+        return start
+    return start + timedelta(seconds=rng.randrange(int((end - start).total_seconds())))
+
+
+def seed(
+    scale: float = 1.0,
+    seed: int = 0,
+    log: Callable[[str], None] = lambda message: None,
+    today: date | None = None,
+) -> SeedResult:
+    """Generate the dataset for ``scale`` from ``seed`` and return per-model row counts.
+
+    Timestamps end at the start of ``today`` (the current day by default).
+    """
+    rng = random.Random(seed)
+    # Flujo aparte para el historial de etapas: no altera el resto de filas de una semilla dada.
+    transition_rng = random.Random(f"{seed}-transitions")
+    now = timezone.make_aware(datetime.combine(today or timezone.localdate(), time.min))
+    year_ago = now - timedelta(days=365)
+    result = SeedResult()
+
+    rating = _weighted(rng, RATING_WEIGHTS)
+    blocker_rating = _weighted(rng, BLOCKER_RATING_WEIGHTS)
+    visibility = _weighted(rng, VISIBILITY_WEIGHTS)
+    status = _weighted(rng, STATUS_WEIGHTS)
+
+    timestamp_fields = [
+        RecruitmentProcess._meta.get_field("created_at"),
+        CandidateAssignment._meta.get_field("joined_at"),
+        StageFeedback._meta.get_field("created_at"),
+        StageFeedback._meta.get_field("updated_at"),
+        Post._meta.get_field("published_date"),
+    ]
+    with transaction.atomic(), _explicit_timestamps(*timestamp_fields):
+        password = make_password(SEED_PASSWORD)
+        owner_total = scaled(BASE_COUNTS["owners"], scale)
+        candidate_total = scaled(BASE_COUNTS["candidates"], scale)
+        users = []
+        for index in range(owner_total + candidate_total):
+            kind = "owner" if index < owner_total else "candidate"
+            username = f"{USERNAME_PREFIX}{kind}_{index:07d}"
+            users.append(
+                User(
+                    username=username,
+                    email=f"{username}@example.com",
+                    first_name=rng.choice(FIRST_NAMES),
+                    last_name=rng.choice(LAST_NAMES),
+                    password=password,
+                    is_staff=kind == "owner",
+                    date_joined=_between(rng, year_ago, now),
+                )
+            )
+        users = User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        owners, candidates = users[:owner_total], users[owner_total:]
+        result.add("users", len(users))
+        log(f"{len(users)} usuarios")
+
+        posts = [
+            Post(
+                title=f"Novedades del equipo #{index + 1}",
+                content=" ".join(rng.choice(PROS + ADVICE) for _ in range(6)).strip(),
+                author=rng.choice(owners),
+                published_date=_between(rng, year_ago, now),
+            )
+            for index in range(scaled(BASE_COUNTS["posts"], scale))
+        ]
+        result.add("posts", len(Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)))
+
+        processes = RecruitmentProcess.objects.bulk_create(
+            [
+                RecruitmentProcess(
+                    title=f"{rng.choice(ROLES)} #{index + 1}",
+                    description="Proceso generado para pruebas de carga.",
+                    owner=rng.choice(owners),
+                    status=status(),
+                    created_at=_between(rng, year_ago, now - timedelta(days=7)),
+                )
+                for index in range(scaled(BASE_COUNTS["processes"], scale))
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        result.add("processes", len(processes))
+
+        stages = []
+        for process in processes:
+            for order, name in enumerate(rng.sample(STAGE_NAMES, rng.randint(3, 6)), start=1):
+                stages.append(
+                    ProcessStage(process=process, name=name, order=order, is_blocker=rng.random() < 0.15)
+                )
+        stages = ProcessStage.objects.bulk_create(stages, batch_size=BATCH_SIZE)
+        result.add("stages", len(stages))
+        stages_by_process: dict[int, list[ProcessStage]] = {}
+        for stage in stages:
+            stages_by_process.setdefault(stage.process_id, []).append(stage)
+
+        per_process = min(ASSIGNMENTS_PER_PROCESS, len(candidates))
+        for start in range(0, len(processes), PROCESS_CHUNK):
+            assignments, progress = [], []
+            for process in processes[start : start + PROCESS_CHUNK]:
+                process_stages = stages_by_process[process.pk]
+                for candidate in rng.sample(candidates, per_process):
+                    reached = rng.randint(0, len(process_stages))
+                    assignments.append(
+                        CandidateAssignment(
+                            process=process,
+                            candidate=candidate,
+                            current_stage=process_stages[reached] if reached < len(process_stages) else None,
+                            joined_at=_between(rng, process.created_at, now),
+                        )
+                    )
+                    progress.append(process_stages[:reached])
+            assignments = CandidateAssignment.objects.bulk_create(assignments, batch_size=BATCH_SIZE)
+
+            feedback = []
+            for assignment, completed in zip(assignments, progress):
+                for stage in completed:
+                    if rng.random() >= FEEDBACK_PROBABILITY:
+                        continue
+                    created_at = _between(rng, assignment.joined_at, now)
+                    feedback.append(
+                        StageFeedback(
+                            assignment=assignment,
+                            stage=stage,
+                            author_id=assignment.candidate_id,
+                            rating=blocker_rating() if stage.is_blocker else rating(),
+                            is_anonymous=rng.random() < ANONYMOUS_PROBABILITY,
+                            pros=rng.choice(PROS),
+                            cons=rng.choice(CONS),
+                            advice=rng.choice(ADVICE),
+                            visibility=visibility(),
+                            created_at=created_at,
+                            updated_at=created_at,
+                        )
+                    )
+            StageFeedback.objects.bulk_create(feedback, batch_size=BATCH_SIZE)
+
+            transitions = []
+            for assignment, completed in zip(assignments, progress):
+                process_stages = stages_by_process[assignment.process_id]
+                moves = sorted(_between(transition_rng, assignment.joined_at, now) for _ in completed)
+                path = [*process_stages[1:], None][: len(completed)]
+                transitions.append(
+                    StageTransition(
+                        assignment=assignment,
+                        process_id=assignment.process_id,
+                        to_stage=process_stages[0],
+                        kind="assigned",
+                        created_at=assignment.joined_at,
+                    )
+                )
+                for from_stage, to_stage, created_at in zip(process_stages, path, moves):
+                    transitions.append(
+                        StageTransition(
+                            assignment=assignment,
+                            process_id=assignment.process_id,
+                            from_stage=from_stage,
+                            to_stage=to_stage,
+                            kind="advanced" if to_stage else "completed",
+                            created_at=created_at,
+                        )
+                    )
+            StageTransition.objects.bulk_create(transitions, batch_size=BATCH_SIZE)
+            result.add("assignments", len(assignments))
+            result.add("feedback", len(feedback))
+            result.add("transitions", len(transitions))
+            log(f"{min(start + PROCESS_CHUNK, len(processes))}/{len(processes)} procesos")
+
+        rollups.rebuild_rollups()
+        counters.repair()
+
+    _drop_cached([process.pk for process in processes])
+    return result
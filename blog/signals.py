@@ -0,0 +1,252 @@
+"""Signal handlers that keep derived data in sync with recruitment writes."""
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import cache_versions, counters, funnel, rating_stats, rollups, stage_graph
+from .models import (
+    CandidateAssignment,
+    Post,
+    ProcessStage,
+    RecruitmentProcess,
+    StageFeedback,
+    assignments_bulk_saved,
+)
+
+
+def _feedback_process_id(feedback: StageFeedback) -> int | None:
+    try:
+        return feedback.assignment.process_id
+    except CandidateAssignment.DoesNotExist:
+        return None
+
+
+@receiver(post_save, sender=CandidateAssignment, dispatch_uid="blog_rollup_assignment_saved")
+def assignment_saved(sender, instance: CandidateAssignment, raw: bool = False, **kwargs) -> None:
+    if raw:
+        return
+    rollups.refresh_process_day(instance.process_id, rollups.bucket_day(instance.joined_at))
+
+
+@receiver(post_delete, sender=CandidateAssignment, dispatch_uid="blog_rollup_assignment_deleted")
+def assignment_deleted(sender, instance: CandidateAssignment, **kwargs) -> None:
+    rollups.refresh_process_day(instance.process_id, rollups.bucket_day(instance.joined_at), create=False)
+
+
+@receiver(assignments_bulk_saved, sender=CandidateAssignment, dispatch_uid="blog_rollup_assignments_bulk_saved")
+def assignments_bulk_saved_handler(sender, assignments: list[CandidateAssignment], created: bool, **kwargs) -> None:
+    # Avanzar etapas no cambia el feedback de los buckets ya existentes.
+    rollups.refresh_process_days(
+        {(assignment.process_id, rollups.bucket_day(assignment.joined_at)) for assignment in assignments},
+        feedback=created,
+    )
+
+
+def _deletes_stages_only(origin) -> bool:
+    if isinstance(origin, QuerySet):
+        return origin.model is ProcessStage
+    return isinstance(origin, ProcessStage)
+
+
+@receiver(pre_delete, sender=ProcessStage, dispatch_uid="blog_stage_releasing_assignments")
+def stage_releasing_assignments(sender, instance: ProcessStage, origin=None, **kwargs) -> None:
+    # ``on_delete=SET_NULL`` completes these assignments in one UPDATE, without post_save;
+    # the handlers below apply what post_save would have. When the whole process is
+    # being deleted its assignments go with it and there is nothing to record.
+    instance.released_assignments = []
+    if not _deletes_stages_only(origin):
+        return
+    instance.released_assignments = list(instance.current_assignments.only("pk", "process_id", "joined_at"))
+    # La etapa aún existe; el mismo SET_NULL limpia luego ``from_stage`` como en el resto del historial.
+    funnel.record_released(instance.released_assignments, instance)
+
+
+@receiver(post_delete, sender=ProcessStage, dispatch_uid="blog_rollup_stage_deleted")
+def stage_rollups_deleted(sender, instance: ProcessStage, **kwargs) -> None:
+    rollups.refresh_process_days(
+        {
+            (assignment.process_id, rollups.bucket_day(assignment.joined_at))
+            for assignment in getattr(instance, "released_assignments", ())
+        },
+        create=False,
+        feedback=False,
+    )
+
+
+@receiver(post_save, sender=StageFeedback, dispatch_uid="blog_rollup_feedback_saved")
+def feedback_saved(sender, instance: StageFeedback, raw: bool = False, **kwargs) -> None:
+    if raw:
+        return
+    day = rollups.bucket_day(instance.created_at)
+    rollups.refresh_stage_day(instance.stage_id, day)
+    if process_id := _feedback_process_id(instance):
+        rollups.refresh_process_day(process_id, day)
+
+
+@receiver(post_delete, sender=StageFeedback, dispatch_uid="blog_rollup_feedback_deleted")
+def feedback_deleted(sender, instance: StageFeedback, **kwargs) -> None:
+    day = rollups.bucket_day(instance.created_at)
+    rollups.refresh_stage_day(instance.stage_id, day, create=False)
+    if process_id := _feedback_process_id(instance):
+        rollups.refresh_process_day(process_id, day, create=False)
+
+
+@receiver(post_save, sender=ProcessStage, dispatch_uid="blog_stage_graph_stage_saved")
+@receiver(post_delete, sender=ProcessStage, dispatch_uid="blog_stage_graph_stage_deleted")
+def stage_changed(sender, instance: ProcessStage, **kwargs) -> None:
+    # Drop now and again on commit, so a graph cached mid-transaction never survives it.
+    stage_graph.invalidate(instance.process_id)
+    transaction.on_commit(lambda: stage_graph.invalidate(instance.process_id))
+
+
+@receiver(post_save, sender=RecruitmentProcess, dispatch_uid="blog_stage_graph_process_created")
+def process_created(sender, instance: RecruitmentProcess, created: bool, **kwargs) -> None:
+    # A new process has no stages; never let a graph cached under a reused id leak into it.
+    if created:
+        stage_graph.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=RecruitmentProcess, dispatch_uid="blog_fragments_process_saved")
+def process_fragments_changed(sender, instance: RecruitmentProcess, **kwargs) -> None:
+    cache_versions.bump(instance.pk)
+
+
+@receiver(post_delete, sender=RecruitmentProcess, dispatch_uid="blog_fragments_process_deleted")
+def process_fragments_deleted(sender, instance: RecruitmentProcess, **kwargs) -> None:
+    # Sin token, la próxima petición a la URL comprueba que el proceso existe y responde 404.
+    cache_versions.forget(instance.pk)
+
+
+@receiver(post_save, sender=ProcessStage, dispatch_uid="blog_fragments_stage_saved")
+@receiver(post_delete, sender=ProcessStage, dispatch_uid="blog_fragments_stage_deleted")
+@receiver(post_save, sender=CandidateAssignment, dispatch_uid="blog_fragments_assignment_saved")
+@receiver(post_delete, sender=CandidateAssignment, dispatch_uid="blog_fragments_assignment_deleted")
+def child_fragments_changed(sender, instance: ProcessStage | CandidateAssignment, **kwargs) -> None:
+    cache_versions.bump(instance.process_id)
+
+
+@receiver(post_save, sender=StageFeedback, dispatch_uid="blog_fragments_feedback_saved")
+@receiver(post_delete, sender=StageFeedback, dispatch_uid="blog_fragments_feedback_deleted")
+def feedback_fragments_changed(sender, instance: StageFeedback, **kwargs) -> None:
+    if process_id := _feedback_process_id(instance):
+        cache_versions.bump(process_id)
+
+
+@receiver(post_save, sender=Post, dispatch_uid="blog_scope_post_saved")
+@receiver(post_delete, sender=Post, dispatch_uid="blog_scope_post_deleted")
+def post_changed(sender, instance: Post, **kwargs) -> None:
+    cache_versions.bump_scope(cache_versions.POSTS_SCOPE)
+
+
+@receiver(post_save, sender=StageFeedback, dispatch_uid="blog_rating_stats_feedback_saved")
+@receiver(post_delete, sender=StageFeedback, dispatch_uid="blog_rating_stats_feedback_deleted")
+def feedback_rating_stats_changed(sender, instance: StageFeedback, **kwargs) -> None:
+    rating_stats.invalidate()
+
+
+@receiver(assignments_bulk_saved, sender=CandidateAssignment, dispatch_uid="blog_fragments_assignments_bulk_saved")
+def bulk_fragments_changed(sender, assignments: list[CandidateAssignment], **kwargs) -> None:
+    for process_id in {assignment.process_id for assignment in assignments}:
+        cache_versions.bump(process_id)
+
+
+# Los receptores del historial de etapas deben ir antes que los de contadores: éstos
+# llaman a ``remember_loaded_values`` y se perdería la etapa anterior.
+@receiver(post_save, sender=CandidateAssignment, dispatch_uid="blog_funnel_assignment_saved")
+def assignment_transition_saved(
+    sender, instance: CandidateAssignment, created: bool, raw: bool = False, **kwargs
+) -> None:
+    if not raw:
+        funnel.record_transitions([instance], created=created)
+
+
+@receiver(assignments_bulk_saved, sender=CandidateAssignment, dispatch_uid="blog_funnel_assignments_bulk_saved")
+def bulk_assignment_transitions(
+    sender, assignments: list[CandidateAssignment], created: bool = False, **kwargs
+) -> None:
+    funnel.record_transitions(assignments, created=created)
+
+
+def _completed(stage_id: int | None) -> int:
+    return 1 if stage_id is None else 0
+
+
+@receiver(post_save, sender=ProcessStage, dispatch_uid="blog_counters_stage_saved")
+def stage_counters_saved(sender, instance: ProcessStage, created: bool, raw: bool = False, **kwargs) -> None:
+    if created and not raw:
+        counters.adjust_process(instance.process_id, stage_count=1)
+
+
+@receiver(post_delete, sender=ProcessStage, dispatch_uid="blog_counters_stage_deleted")
+def stage_counters_deleted(sender, instance: ProcessStage, **kwargs) -> None:
+    counters.adjust_process(
+        instance.process_id,
+        stage_count=-1,
+        completed_count=len(getattr(instance, "released_assignments", ())),
+    )
+
+
+@receiver(post_save, sender=CandidateAssignment, dispatch_uid="blog_counters_assignment_saved")
+def assignment_counters_saved(
+    sender, instance: CandidateAssignment, created: bool, raw: bool = False, **kwargs
+) -> None:
+    if raw:
+        return
+    if created:
+        counters.adjust_process(
+            instance.process_id, candidate_count=1, completed_count=_completed(instance.current_stage_id)
+        )
+    else:
+        counters.adjust_process(
+            instance.process_id,
+            completed_count=_completed(instance.current_stage_id)
+            - _completed(instance.loaded_value("current_stage_id")),
+        )
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=CandidateAssignment, dispatch_uid="blog_counters_assignment_deleted")
+def assignment_counters_deleted(sender, instance: CandidateAssignment, **kwargs) -> None:
+    counters.adjust_process(
+        instance.process_id, candidate_count=-1, completed_count=-_completed(instance.current_stage_id)
+    )
+
+
+@receiver(assignments_bulk_saved, sender=CandidateAssignment, dispatch_uid="blog_counters_assignments_bulk_saved")
+def bulk_assignment_counters(
+    sender, assignments: list[CandidateAssignment], created: bool = False, **kwargs
+) -> None:
+    deltas: dict[int, dict[str, int]] = {}
+    for assignment in assignments:
+        process_deltas = deltas.setdefault(assignment.process_id, {"candidate_count": 0, "completed_count": 0})
+        completed = _completed(assignment.current_stage_id)
+        if created:
+            process_deltas["candidate_count"] += 1
+        else:
+            completed -= _completed(assignment.loaded_value("current_stage_id"))
+        process_deltas["completed_count"] += completed
+        assignment.remember_loaded_values()
+    for process_id, process_deltas in deltas.items():
+        counters.adjust_process(process_id, **process_deltas)
+
+
+@receiver(post_save, sender=StageFeedback, dispatch_uid="blog_counters_feedback_saved")
+def feedback_counters_saved(sender, instance: StageFeedback, created: bool, raw: bool = False, **kwargs) -> None:
+    if raw:
+        return
+    previous_stage_id = instance.loaded_value("stage_id")
+    if created:
+        counters.adjust_stage(instance.stage_id, feedback_count=1, rating_sum=instance.rating)
+    elif previous_stage_id != instance.stage_id:
+        counters.adjust_stage(previous_stage_id, feedback_count=-1, rating_sum=-instance.loaded_value("rating"))
+        counters.adjust_stage(instance.stage_id, feedback_count=1, rating_sum=instance.rating)
+    else:
+        counters.adjust_stage(instance.stage_id, rating_sum=instance.rating - instance.loaded_value("rating"))
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=StageFeedback, dispatch_uid="blog_counters_feedback_deleted")
+def feedback_counters_deleted(sender, instance: StageFeedback, **kwargs) -> None:
+    counters.adjust_stage(instance.stage_id, feedback_count=-1, rating_sum=-instance.rating)
@@ -0,0 +1,123 @@
+"""Cached, ordered stage list of each recruitment process.
+
+The graph is stored in the default cache as a compact tuple per stage and is
+dropped whenever a stage of the process is saved or deleted (see
+``blog.signals``). Lookups by stage id are O(1) once the graph is loaded.
+
+The cache only serves read paths. With a per-process cache another worker
+may still hold a graph from before a stage change, so writes such as
+``advance_stages`` use ``load_stage_graphs``, which reads the database.
+"""
+
+from collections.abc import Iterable
+from datetime import date
+
+from django.core.cache import cache
+
+from .models import ProcessStage
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def cache_key(process_id: int) -> str:
+    return f"blog:stage-graph:{process_id}"
+
+
+class StageGraph:
+    """Ordered stages of one process: ``(id, order, name, is_blocker, due_date)`` tuples."""
+
+    def __init__(self, process_id: int, stages: list[tuple[int, int, str, bool, date | None]]) -> None:
+        self.process_id = process_id
+        self.stages = stages
+        self._positions = {stage[0]: index for index, stage in enumerate(stages)}
+
+    def __len__(self) -> int:
+        return len(self.stages)
+
+    def __contains__(self, stage_id: int) -> bool:
+        return stage_id in self._positions
+
+    @property
+    def first_stage_id(self) -> int | None:
+        return self.stages[0][0] if self.stages else None
+
+    def position(self, stage_id: int | None) -> int | None:
+        """1-based position of ``stage_id`` in the process, or ``None`` if unknown."""
+        index = self._positions.get(stage_id)
+        return None if index is None else index + 1
+
+    def next_stage(self, stage_id: int | None) -> int | None:
+        """Id of the stage after ``stage_id``; ``None`` means the process is complete.
+
+        An assignment without a stage (``stage_id=None``) starts at the first stage.
+        """
+        if stage_id is None:
+            return self.first_stage_id
+        index = self._positions.get(stage_id)
+        if index is None or index + 1 >= len(self.stages):
+            return None
+        return self.stages[index + 1][0]
+
+    def progress_fraction(self, stage_id: int | None) -> float | None:
+        """Share of the pipeline reached at ``stage_id`` (current stage included)."""
+        position = self.position(stage_id)
+        if position is None:
+            return None
+        return position / len(self.stages)
+
+    def is_blocker(self, stage_id: int) -> bool:
+        index = self._positions.get(stage_id)
+        return index is not None and self.stages[index][3]
+
+
+def _load(process_ids: Iterable[int]) -> dict[int, list[tuple]]:
+    rows = {process_id: [] for process_id in process_ids}
+    for process_id, *stage in (
+        ProcessStage.objects.filter(process_id__in=rows)
+        .order_by("process_id", "order")
+        .values_list("process_id", "id", "order", "name", "is_blocker", "due_date")
+    ):
+        rows[process_id].append(tuple(stage))
+    return rows
+
+
+def get_stage_graphs(process_ids: Iterable[int]) -> dict[int, StageGraph]:
+    """Return the graphs of ``process_ids``, loading every cache miss in one query."""
+    keys = {cache_key(process_id): process_id for process_id in set(process_ids)}
+    if not keys:
+        return {}
+    cached = cache.get_many(keys)
+    stages = {keys[key]: value for key, value in cached.items()}
+
+    missing = [process_id for key, process_id in keys.items() if key not in cached]
+    if missing:
+        loaded = _load(missing)
+        cache.set_many({cache_key(process_id): value for process_id, value in loaded.items()}, CACHE_TIMEOUT)
+        stages.update(loaded)
+
+    return {process_id: StageGraph(process_id, value) for process_id, value in stages.items()}
+
+
+def load_stage_graphs(process_ids: Iterable[int]) -> dict[int, StageGraph]:
+    """Return the graphs of ``process_ids`` straight from the database in one query, bypassing the cache."""
+    return {process_id: StageGraph(process_id, value) for process_id, value in _load(set(process_ids)).items()}
+
+
+def get_stage_graph(process_id: int) -> StageGraph:
+    return get_stage_graphs([process_id])[process_id]
+
+
+def invalidate(process_id: int) -> None:
+    cache.delete(cache_key(process_id))
+
+
+def attach_progress(assignments: Iterable) -> None:
+    """Set ``stage_position``, ``stage_total`` and ``progress_percent`` on each assignment."""
+    assignments = list(assignments)
+    graphs = get_stage_graphs(assignment.process_id for assignment in assignments)
+    for assignment in assignments:
+        graph = graphs[assignment.process_id]
+        fraction = graph.progress_fraction(assignment.current_stage_id)
+        assignment.stage_total = len(graph)
+        assignment.stage_position = graph.position(assignment.current_stage_id)
+        assignment.progress_percent = round(fraction * 100) if fraction is not None else None
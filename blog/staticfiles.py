@@ -0,0 +1,162 @@
+"""Fingerprinted, precompressed static files and the middleware that serves them.
+
+``PrecompressedManifestStaticFilesStorage`` is Django's manifest storage
+(content hash in every file name, CSS references rewritten to the hashed
+names) plus a ``.gz`` copy of each compressible file and a ``.br`` copy when
+the optional ``brotli`` package is installed. ``build_static_assets`` runs
+``collectstatic`` with it.
+
+``StaticAssetMiddleware`` serves ``STATIC_ROOT`` without a separate web
+server: hashed names never change content, so they go out with a one-year
+``immutable`` ``Cache-Control``, and the smallest variant the client accepts
+is picked from ``Accept-Encoding``.
+"""
+
+import gzip
+import mimetypes
+import os
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+COMPRESSIBLE_EXTENSIONS = {".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".xml", ".html", ".ico"}
+# Por debajo de este tamaño la cabecera de compresión cuesta más de lo que ahorra.
+MIN_COMPRESS_SIZE = 256
+# Una variante sólo se guarda si ahorra al menos este porcentaje.
+MIN_SAVING = 0.05
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+MUTABLE_MAX_AGE = 60
+# Preferencia del servidor cuando el cliente acepta varias codificaciones.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+HASHED_NAME = re.compile(r"^(?P<stem>.+)\.[0-9a-f]{12}(?P<suffix>\.[^./]+)?$")
+
+
+def brotli_module():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def compress_file(path: str) -> list[str]:
+    """Write the ``.gz`` (and ``.br``) variants of ``path`` that are worth it; return their paths."""
+    with open(path, "rb") as source:
+        content = source.read()
+    if len(content) < MIN_COMPRESS_SIZE:
+        return []
+
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli := brotli_module():
+        variants[".br"] = brotli.compress(content, mode=brotli.MODE_TEXT)
+    written = []
+    for suffix, compressed in variants.items():
+        if len(compressed) <= len(content) * (1 - MIN_SAVING):
+            with open(path + suffix, "wb") as target:
+                target.write(compressed)
+            written.append(path + suffix)
+    return written
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that also precompresses every hashed, compressible file."""
+
+    def stored_name(self, name: str) -> str:
+        # Sin collectstatic (desarrollo, pruebas) no hay manifiesto: se usa el nombre original.
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            for variant in compress_file(self.path(name)):
+                yield name, os.path.relpath(variant, self.location), True
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        params = params.strip()
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            continue
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _is_hashed(name: str) -> bool:
+    match = HASHED_NAME.match(name)
+    if not match:
+        return False
+    original = match["stem"] + (match["suffix"] or "")
+    return getattr(staticfiles_storage, "hashed_files", {}).get(original) == name
+
+
+def serve_asset(request, name: str) -> FileResponse | HttpResponseNotModified | None:
+    """Response for the collected file ``name``, or ``None`` if it is not in ``STATIC_ROOT``."""
+    if not settings.STATIC_ROOT:
+        return None
+    try:
+        path = safe_join(settings.STATIC_ROOT, name)
+    except SuspiciousFileOperation:
+        return None
+    if not os.path.isfile(path):
+        return None
+
+    immutable = _is_hashed(name)
+    stat = os.stat(path)
+    if not immutable and not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(name)
+    accepted = _accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    served, encoding, has_variants = path, None, False
+    for coding, suffix in ENCODINGS:
+        if os.path.isfile(path + suffix):
+            has_variants = True
+            if encoding is None and coding in accepted:
+                served, encoding = path + suffix, coding
+
+    response = FileResponse(open(served, "rb"), content_type=content_type or "application/octet-stream")
+    del response["Content-Disposition"]
+    if encoding:
+        response["Content-Encoding"] = encoding
+    if has_variants:
+        patch_vary_headers(response, ["Accept-Encoding"])
+    if immutable:
+        response["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        response["Cache-Control"] = f"public, max-age={MUTABLE_MAX_AGE}"
+        response["Last-Modified"] = http_date(stat.st_mtime)
+    return response
+
+
+class StaticAssetMiddleware:
+    """Serve collected static files from ``STATIC_ROOT`` ahead of the URL resolver."""
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.prefix = "/" + urlsplit(settings.STATIC_URL).path.lstrip("/")
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path.startswith(self.prefix):
+            response = serve_asset(request, request.path.removeprefix(self.prefix))
+            if response is not None:
+                return response
+        return self.get_response(request)
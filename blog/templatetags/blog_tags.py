@@ -0,0 +1,81 @@
+"""Template tags of the ``blog`` app.
+
+``{% feedback_cards feedbacks %}`` renders a whole list of feedback cards in
+one inclusion template. Each ``StageFeedback`` is first reduced to a dict
+with its author name, stars, date and paragraphs already formatted, so the
+loop in ``blog/_feedback_cards.html`` only reads keys: no include or context
+push per card and no model methods called from the template.
+"""
+
+from collections.abc import Iterable
+
+from django import template
+from django.urls import reverse
+from django.utils.html import linebreaks
+from django.utils.safestring import mark_safe
+from django.utils.timezone import template_localtime
+
+from ..models import StageFeedback
+
+register = template.Library()
+
+# Las secciones de texto se arman aquí: un bucle anidado por tarjeta duplicaba el costo del render.
+SECTIONS = (
+    ("pros", ' class="text-success"', "✅ Aspectos positivos:"),
+    ("cons", ' class="text-warning"', "⚠️ Áreas de mejora:"),
+    ("advice", ' class="text-info"', "💡 Consejos:"),
+    ("comment", "", "📝 Comentario:"),
+)
+SECTION_HTML = '<div class="mb-2">\n<strong{}>{}</strong>\n<p class="mb-0 ms-3">{}</p>\n</div>\n'
+# Una cadena ya escapada por calificación posible en lugar de un bucle por estrella.
+STARS = {
+    rating: mark_safe(
+        '<span class="text-warning">⭐</span>' * rating + '<span class="text-muted">☆</span>' * (5 - rating)
+    )
+    for rating in range(6)
+}
+VISIBILITY_LABELS = dict(StageFeedback._meta.get_field("visibility").choices)
+
+
+def _sections(feedback: StageFeedback) -> str:
+    return mark_safe(
+        "".join(
+            SECTION_HTML.format(css_class, label, linebreaks(text, autoescape=True))
+            for field, css_class, label in SECTIONS
+            if (text := getattr(feedback, field))
+        )
+    )
+
+
+def feedback_card_rows(
+    feedbacks: Iterable[StageFeedback], show_stage: bool = False, show_process: bool = False
+) -> list[dict]:
+    """Display-ready rows for ``blog/_feedback_cards.html``.
+
+    ``feedbacks`` should come with ``author`` and ``stage`` (and
+    ``stage__process`` for ``show_process``) selected; the author is only
+    read for cards that are not anonymous.
+    """
+    rows = []
+    for feedback in feedbacks:
+        row = {
+            "author": feedback.get_author_display(),
+            "is_anonymous": feedback.is_anonymous,
+            "stars": STARS.get(feedback.rating, STARS[0]),
+            "created": template_localtime(feedback.created_at).strftime("%d/%m/%Y"),
+            "sections": _sections(feedback),
+            "visibility": VISIBILITY_LABELS.get(feedback.visibility, feedback.visibility),
+        }
+        if show_stage:
+            row["stage"] = feedback.stage.name
+        if show_process:
+            row["process_title"] = feedback.stage.process.title
+            row["process_url"] = reverse("blog:process_detail", args=[feedback.stage.process_id])
+        rows.append(row)
+    return rows
+
+
+@register.inclusion_tag("blog/_feedback_cards.html")
+def feedback_cards(feedbacks, show_stage=False, show_process=False):
+    """Render every feedback in ``feedbacks`` as a card with a single template pass."""
+    return {"cards": feedback_card_rows(feedbacks, show_stage=show_stage, show_process=show_process)}
@@ -0,0 +1,20 @@
+"""Test helpers shared by the ``blog`` test suite."""
+
+from django.http import HttpResponse
+
+from .instrumentation import capture_queries
+
+
+class QueryBudgetMixin:
+    """``TestCase`` mixin to keep the number of queries a view issues under a budget.
+
+    Unlike ``assertNumQueries`` the budget is an upper bound, and the failure
+    message lists the duplicated and slowest statements of the request.
+    """
+
+    def assertQueryBudget(self, budget: int, url: str, method: str = "get", **kwargs) -> HttpResponse:
+        with capture_queries() as stats:
+            response = getattr(self.client, method)(url, **kwargs)
+        if stats.count > budget:
+            self.fail(f"{method.upper()} {url} exceeded its budget of {budget} queries: {stats.summary()}")
+        return response
@@ -1,8 +1,53 @@
+import gzip
+import json
+import sqlite3
+import statistics
+import tempfile
+import threading
+from contextlib import closing
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.contrib import messages
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.db.models import Avg, Count, Sum
+from django.template.defaultfilters import linebreaks_filter
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
-from .models import CandidateAssignment, ProcessStage, RecruitmentProcess, StageFeedback
+from .models import (
+    CandidateAssignment,
+    Post,
+    ProcessDailyMetric,
+    ProcessStage,
+    RecruitmentProcess,
+    StageDailyMetric,
+    StageFeedback,
+    StageTransition,
+)
+from . import benchmarks, cache_versions, counters, funnel, rating_stats, rollups, search, seeding, stage_graph
+from .admin import EstimatedCountPaginator, StageFeedbackAdmin
+from .concurrency import gather_reads
+from .conditional import Validators
+from .instrumentation import QueryInstrumentationMiddleware, capture_queries
+from .pagination import KeysetPaginator, decode_cursor
+from .routers import ReplicaPinningMiddleware, ReplicaRouter, copy_database, read_from_replica, replica_reads
+from .stage_graph import get_stage_graph
+from .templatetags.blog_tags import feedback_card_rows
+from .testing import QueryBudgetMixin
 
 
 class ProcessFlowTests(TestCase):
@@ -167,5 +212,1587 @@ class ProcessFlowTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "text/csv")
         self.assertIn("connectmetric_metrics_", response["Content-Disposition"])
-        body = response.content.decode("utf-8")
+        body = b"".join(response.streaming_content).decode("utf-8")
         self.assertIn("Proceso QA", body)
+
+    def test_feedback_export_streams_rows_and_hides_anonymous_authors(self) -> None:
+        self.client.login(username="recruiter", password="safe-pass-123")
+        StageFeedback.objects.create(
+            assignment=self.assignment,
+            stage=self.stage,
+            author=self.candidate,
+            rating=2,
+            pros="Entrevistador amable",
+            is_anonymous=True,
+            visibility="team",
+        )
+        response = self.client.get(reverse("blog:feedback_export"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("connectmetric_feedback_", response["Content-Disposition"])
+        body = b"".join(response.streaming_content).decode("utf-8")
+        rows = body.strip().splitlines()
+        self.assertEqual(len(rows), 2)
+        self.assertIn("Entrevistador amable", rows[1])
+        self.assertIn("Candidato Anónimo", rows[1])
+        self.assertIn("Equipo", rows[1])
+        self.assertNotIn("candidate", rows[1])
+
+    def test_feedback_export_requires_staff(self) -> None:
+        self.client.login(username="candidate", password="safe-pass-123")
+        response = self.client.get(reverse("blog:feedback_export"))
+        self.assertEqual(response.status_code, 403)
+
+
+class MetricsRollupTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123", is_staff=True)
+        self.candidate = user_model.objects.create_user(username="cand", password="safe-pass-123")
+        self.process = RecruitmentProcess.objects.create(title="Proceso Rollup", owner=self.owner)
+        self.stage = ProcessStage.objects.create(process=self.process, name="Técnica", order=1)
+        self.assignment = CandidateAssignment.objects.create(
+            process=self.process,
+            candidate=self.candidate,
+            current_stage=self.stage,
+        )
+
+    def _process_bucket(self) -> ProcessDailyMetric:
+        return ProcessDailyMetric.objects.get(process=self.process)
+
+    def test_feedback_writes_update_buckets(self) -> None:
+        feedback = StageFeedback.objects.create(
+            assignment=self.assignment, stage=self.stage, author=self.candidate, rating=4, pros="Claro"
+        )
+        bucket = self._process_bucket()
+        self.assertEqual((bucket.assignment_count, bucket.feedback_count, bucket.rating_sum), (1, 1, 4))
+        self.assertEqual(StageDailyMetric.objects.get(stage=self.stage).rating_sum, 4)
+
+        feedback.rating = 2
+        feedback.save()
+        self.assertEqual(self._process_bucket().rating_sum, 2)
+
+        feedback.delete()
+        bucket = self._process_bucket()
+        self.assertEqual((bucket.feedback_count, bucket.rating_sum), (0, 0))
+        self.assertEqual(StageDailyMetric.objects.get(stage=self.stage).feedback_count, 0)
+
+    def test_completion_is_tracked(self) -> None:
+        self.assertEqual(self._process_bucket().completed_count, 0)
+        self.assignment.current_stage = None
+        self.assignment.save(update_fields=["current_stage"])
+        self.assertEqual(self._process_bucket().completed_count, 1)
+
+    def test_deleting_the_current_stage_completes_the_bucket(self) -> None:
+        self.stage.delete()
+        self.process.refresh_from_db()
+        self.assertEqual(self.process.completed_count, 1)
+        self.assertEqual(self._process_bucket().completed_count, 1)
+
+        # Al borrar el proceso completo no se recalcula ni se crea nada.
+        self.process.delete()
+        self.assertFalse(ProcessDailyMetric.objects.exists())
+
+    def test_bulk_advance_refreshes_only_touched_buckets(self) -> None:
+        StageFeedback.objects.create(
+            assignment=self.assignment, stage=self.stage, author=self.candidate, rating=4, pros="Claro"
+        )
+        today = rollups.bucket_day(self.assignment.joined_at)
+        older = CandidateAssignment.objects.create(
+            process=self.process, candidate=get_user_model().objects.create(username="older"), current_stage=self.stage
+        )
+        CandidateAssignment.objects.filter(pk=older.pk).update(
+            joined_at=self.assignment.joined_at - timezone.timedelta(days=10)
+        )
+        rollups.rebuild_rollups()
+        older_day = today - timezone.timedelta(days=10)
+        between = ProcessDailyMetric.objects.create(
+            process=self.process, day=today - timezone.timedelta(days=5), assignment_count=7
+        )
+
+        # Buckets existentes sin feedback: leerlos, agregar asignaciones y actualizar.
+        with self.assertNumQueries(3):
+            rollups.refresh_process_days({(self.process.pk, today), (self.process.pk, older_day)}, feedback=False)
+        CandidateAssignment.objects.filter(pk__in=[self.assignment.pk, older.pk]).advance_stages()
+
+        bucket = ProcessDailyMetric.objects.get(process=self.process, day=today)
+        self.assertEqual((bucket.completed_count, bucket.feedback_count, bucket.rating_sum), (1, 1, 4))
+        self.assertEqual(ProcessDailyMetric.objects.get(process=self.process, day=older_day).completed_count, 1)
+        between.refresh_from_db()
+        self.assertEqual(between.assignment_count, 7)
+
+    def test_rebuild_matches_incremental_buckets(self) -> None:
+        StageFeedback.objects.create(
+            assignment=self.assignment, stage=self.stage, author=self.candidate, rating=5, advice="Repasa SQL"
+        )
+        expected = list(ProcessDailyMetric.objects.values("day", "assignment_count", "feedback_count", "rating_sum"))
+        ProcessDailyMetric.objects.update(feedback_count=99)
+
+        call_command("rebuild_metrics_rollups", stdout=StringIO())
+
+        self.assertEqual(
+            list(ProcessDailyMetric.objects.values("day", "assignment_count", "feedback_count", "rating_sum")),
+            expected,
+        )
+        self.assertEqual(StageDailyMetric.objects.get(stage=self.stage).rating_sum, 5)
+
+    def test_process_delete_cascades_cleanly(self) -> None:
+        StageFeedback.objects.create(
+            assignment=self.assignment, stage=self.stage, author=self.candidate, rating=3, cons="Lento"
+        )
+        self.process.delete()
+        self.assertFalse(ProcessDailyMetric.objects.exists())
+        self.assertFalse(StageDailyMetric.objects.exists())
+
+    def test_dashboard_reads_rollups(self) -> None:
+        StageFeedback.objects.create(
+            assignment=self.assignment, stage=self.stage, author=self.candidate, rating=4, pros="Ágil"
+        )
+        self.client.login(username="owner", password="safe-pass-123")
+        response = self.client.get(reverse("blog:metrics"))
+        self.assertEqual(response.context["summary"]["feedback_records"], 1)
+        process = response.context["best_rated_processes"][0]
+        self.assertEqual((process.feedback_total, process.stage_total, process.avg_rating), (1, 1, 4.0))
+        self.assertEqual(response.context["trend"][-1]["feedback"], 1)
+
+
+class RatingDistributionTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123", is_staff=True)
+        self.process = RecruitmentProcess.objects.create(title="Proceso Dividido", owner=self.owner)
+        self.stages = [
+            ProcessStage.objects.create(process=self.process, name=name, order=order)
+            for order, name in enumerate(["Entrevista", "Técnica"], start=1)
+        ]
+        self.assignments = []
+
+    def rate(self, stage: ProcessStage, *ratings: int) -> None:
+        user_model = get_user_model()
+        while len(self.assignments) < len(ratings):
+            candidate = user_model.objects.create_user(username=f"cand{len(self.assignments)}")
+            self.assignments.append(
+                CandidateAssignment.objects.create(process=self.process, candidate=candidate, current_stage=stage)
+            )
+        for assignment, rating in zip(self.assignments, ratings):
+            StageFeedback.objects.create(
+                assignment=assignment, stage=stage, author=assignment.candidate, rating=rating
+            )
+
+    def test_statistics_match_individual_ratings(self) -> None:
+        ratings = [1, 1, 1, 2, 5, 5, 5, 5, 4]
+        distribution = rating_stats.RatingDistribution(tuple(ratings.count(value) for value in range(1, 6)))
+        deciles = statistics.quantiles(ratings, n=10, method="inclusive")
+        self.assertEqual(distribution.total, 9)
+        self.assertEqual(distribution.median, statistics.median(ratings))
+        self.assertAlmostEqual(distribution.p10, deciles[0])
+        self.assertAlmostEqual(distribution.p90, deciles[-1])
+        self.assertAlmostEqual(distribution.stddev, statistics.pstdev(ratings))
+        self.assertTrue(distribution.is_polarized)
+        self.assertFalse(rating_stats.RatingDistribution((0, 0, 1, 6, 2)).is_polarized)
+        self.assertIsNone(rating_stats.EMPTY.median)
+
+    def test_all_stages_in_one_grouped_query_cached_until_new_feedback(self) -> None:
+        interview, technical = self.stages
+        self.rate(interview, 1, 5, 5)
+        self.rate(technical, 3, 4)
+
+        # Un GROUP BY stage_id, rating para todas las etapas y la lista etapa -> proceso.
+        with self.assertNumQueries(2):
+            stats = rating_stats.all_stages()
+        self.assertEqual(stats.for_stage(interview.pk).counts, (1, 0, 0, 0, 2))
+        self.assertEqual(stats.for_process(self.process.pk).counts, (1, 0, 1, 1, 2))
+        with self.assertNumQueries(0):
+            rating_stats.all_stages()
+
+        feedback = StageFeedback.objects.get(stage=technical, rating=3)
+        feedback.rating = 1
+        feedback.save()
+        self.assertEqual(rating_stats.all_stages().for_stage(technical.pk).counts, (1, 0, 0, 1, 0))
+        self.assertEqual(rating_stats.for_process(self.process.pk).for_process(self.process.pk).total, 5)
+
+    def test_pages_show_distributions(self) -> None:
+        self.rate(self.stages[0], 1, 1, 5, 5, 5)
+        self.client.force_login(self.owner)
+
+        response = self.client.get(reverse("blog:metrics"))
+        self.assertEqual([stage.pk for stage in response.context["divided_stages"]], [self.stages[0].pk])
+        self.assertContains(response, "Opiniones divididas", count=2)
+
+        response = self.client.get(reverse("blog:process_detail", args=[self.process.pk]))
+        self.assertContains(response, "Mediana 5.0 · p10–p90 1.0–5.0", count=2)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self) -> None:
+        self.owner = get_user_model().objects.create_user(username="owner", password="safe-pass-123", is_staff=True)
+        base = timezone.now()
+        for index in range(7):
+            process = RecruitmentProcess.objects.create(title=f"Proceso {index}", owner=self.owner)
+            # Dos procesos comparten timestamp para forzar el desempate por id.
+            offset = min(index, 5)
+            RecruitmentProcess.objects.filter(pk=process.pk).update(created_at=base - timezone.timedelta(hours=offset))
+
+    def _titles(self, page) -> list[str]:
+        return [process.title for process in page]
+
+    def test_walks_forward_and_back_without_gaps(self) -> None:
+        paginator = KeysetPaginator(RecruitmentProcess.objects.all(), "created_at", per_page=3)
+        first = paginator.page()
+        second = paginator.page(after=first.next_cursor)
+        third = paginator.page(after=second.next_cursor)
+
+        self.assertEqual(self._titles(first), ["Proceso 0", "Proceso 1", "Proceso 2"])
+        self.assertEqual(self._titles(second), ["Proceso 3", "Proceso 4", "Proceso 6"])
+        self.assertEqual(self._titles(third), ["Proceso 5"])
+        self.assertFalse(first.has_previous)
+        self.assertFalse(third.has_next)
+        self.assertEqual(self._titles(paginator.page(before=third.previous_cursor)), self._titles(second))
+        self.assertEqual(self._titles(paginator.page(before=second.previous_cursor)), self._titles(first))
+
+    def test_malformed_cursor_falls_back_to_first_page(self) -> None:
+        self.assertIsNone(decode_cursor("not-a-cursor"))
+        paginator = KeysetPaginator(RecruitmentProcess.objects.all(), "created_at", per_page=3)
+        self.assertEqual(self._titles(paginator.page(after="not-a-cursor")), ["Proceso 0", "Proceso 1", "Proceso 2"])
+
+    def test_process_list_renders_cursor_links(self) -> None:
+        self.client.login(username="owner", password="safe-pass-123")
+        with patch("blog.views.PROCESS_PAGE_SIZE", 3):
+            response = self.client.get(reverse("blog:process_list"))
+            page = response.context["processes"]
+            self.assertTrue(page.has_next)
+            self.assertContains(response, f"?{page.next_query}")
+
+            response = self.client.get(reverse("blog:process_list"), {"after": page.next_cursor})
+            self.assertEqual(self._titles(response.context["processes"]), ["Proceso 3", "Proceso 4", "Proceso 6"])
+
+    def test_dashboard_lists_paginate_independently(self) -> None:
+        self.client.login(username="owner", password="safe-pass-123")
+        with patch("blog.views.DASHBOARD_PAGE_SIZE", 4):
+            response = self.client.get(reverse("blog:dashboard"))
+            owned = response.context["owned_processes"]
+            response = self.client.get(reverse("blog:dashboard"), {"processes_after": owned.next_cursor})
+        self.assertEqual(len(response.context["owned_processes"]), 3)
+        self.assertIn("processes_before=", response.context["owned_processes"].previous_query)
+
+
+class ProcessFeedbackFeedTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123", is_staff=True)
+        self.process = RecruitmentProcess.objects.create(title="Proceso Feed", owner=self.owner)
+        self.screening = ProcessStage.objects.create(process=self.process, name="Screening", order=1)
+        self.technical = ProcessStage.objects.create(process=self.process, name="Técnica", order=2)
+        for index in range(4):
+            candidate = user_model.objects.create(username=f"cand{index}")
+            assignment = CandidateAssignment.objects.create(process=self.process, candidate=candidate)
+            StageFeedback.objects.create(
+                assignment=assignment,
+                stage=self.screening if index % 2 else self.technical,
+                author=candidate,
+                rating=index + 1,
+                pros=f"Experiencia {index}",
+                visibility="team" if index == 3 else "candidates",
+            )
+        self.client.login(username="owner", password="safe-pass-123")
+
+    def test_detail_renders_first_page_only(self) -> None:
+        with patch("blog.views.FEEDBACK_PAGE_SIZE", 3):
+            response = self.client.get(reverse("blog:process_detail", args=[self.process.pk]))
+        page = response.context["feedback_page"]
+        self.assertEqual(len(page), 3)
+        self.assertContains(response, "data-feedback-more")
+        self.assertContains(response, reverse("blog:process_feedback", args=[self.process.pk]))
+
+    def test_feed_endpoint_returns_next_page(self) -> None:
+        url = reverse("blog:process_feedback", args=[self.process.pk])
+        with patch("blog.views.FEEDBACK_PAGE_SIZE", 3):
+            first = self.client.get(url).context["feedback_page"]
+            response = self.client.get(url, {"after": first.next_cursor})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([feedback.pros for feedback in response.context["feedback_page"]], ["Experiencia 0"])
+        self.assertNotContains(response, "<html")
+
+    def test_feed_filters_by_stage_rating_and_visibility(self) -> None:
+        url = reverse("blog:process_feedback", args=[self.process.pk])
+        by_stage = self.client.get(url, {"stage": self.screening.pk}).context["feedback_page"]
+        self.assertEqual({feedback.stage_id for feedback in by_stage}, {self.screening.pk})
+        by_rating = self.client.get(url, {"rating": 2}).context["feedback_page"]
+        self.assertEqual([feedback.rating for feedback in by_rating], [2])
+        by_visibility = self.client.get(url, {"visibility": "team"}).context["feedback_page"]
+        self.assertEqual([feedback.pros for feedback in by_visibility], ["Experiencia 3"])
+
+    def test_feed_for_unknown_process_is_404(self) -> None:
+        response = self.client.get(reverse("blog:process_feedback", args=[9999]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_candidates_never_page_private_or_team_feedback(self) -> None:
+        StageFeedback.objects.filter(pros="Experiencia 2").update(visibility="private")
+        candidate = get_user_model().objects.create_user(username="viewer", password="safe-pass-123")
+        CandidateAssignment.objects.create(process=self.process, candidate=candidate)
+        detail = reverse("blog:process_detail", args=[self.process.pk])
+        feed = reverse("blog:process_feedback", args=[self.process.pk])
+        # El fragmento cacheado para el responsable no se sirve al candidato.
+        self.assertContains(self.client.get(detail), "Experiencia 2")
+
+        self.client.force_login(candidate)
+        response = self.client.get(detail)
+        self.assertContains(response, "Experiencia 1")
+        self.assertNotContains(response, "Experiencia 2")
+        self.assertNotContains(response, "Experiencia 3")
+        for visibility in ("private", "team"):
+            self.assertEqual(list(self.client.get(feed, {"visibility": visibility}).context["feedback_page"]), [])
+        self.assertEqual(
+            sorted(feedback.pros for feedback in self.client.get(feed).context["feedback_page"]),
+            ["Experiencia 0", "Experiencia 1"],
+        )
+
+    def test_cards_render_in_one_template_from_display_ready_rows(self) -> None:
+        response = self.client.get(reverse("blog:process_feedback", args=[self.process.pk]))
+        self.assertTemplateUsed(response, "blog/_feedback_cards.html", count=1)
+        self.assertContains(response, "Experiencia 3")
+
+        feedback = StageFeedback.objects.select_related("stage").get(pros="Experiencia 2")
+        feedback.is_anonymous = True
+        feedback.cons = "Línea <b>1</b>\r\nLínea 2\n\n\nOtro párrafo"
+        # Una tarjeta anónima no lee el autor.
+        with self.assertNumQueries(0):
+            [row] = feedback_card_rows([feedback], show_stage=True)
+        self.assertEqual(row["author"], "Candidato Anónimo")
+        self.assertEqual(row["stage"], "Técnica")
+        self.assertEqual(row["stars"].count("⭐"), 3)
+        self.assertIn(linebreaks_filter(feedback.cons, autoescape=True), row["sections"])
+        self.assertNotIn("<b>", row["sections"])
+
+
+class CandidateSearchTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123", is_staff=True)
+        self.process = RecruitmentProcess.objects.create(title="Proceso Búsqueda", owner=self.owner)
+        self.assigned = user_model.objects.create(username="ana.assigned", email="ana.assigned@example.com")
+        CandidateAssignment.objects.create(process=self.process, candidate=self.assigned)
+        user_model.objects.create(username="ana.free", email="ana.free@example.com", first_name="Ana")
+        user_model.objects.create(username="bruno", email="anabel@example.com")
+        user_model.objects.create(username="ana.inactive", is_active=False)
+        self.url = reverse("blog:candidate_search", args=[self.process.pk])
+
+    def test_prefix_search_excludes_assigned_and_inactive(self) -> None:
+        self.client.login(username="owner", password="safe-pass-123")
+        response = self.client.get(self.url, {"q": "Ana"})
+        self.assertEqual(response.status_code, 200)
+        usernames = [user["username"] for user in response.json()["results"]]
+        self.assertEqual(usernames, ["ana.free", "bruno"])
+        self.assertEqual(response.json()["results"][0]["name"], "Ana")
+
+    def test_results_are_capped(self) -> None:
+        self.client.login(username="owner", password="safe-pass-123")
+        with patch("blog.views.CANDIDATE_SEARCH_LIMIT", 1):
+            response = self.client.get(self.url, {"q": "ana"})
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_search_requires_manager(self) -> None:
+        get_user_model().objects.create_user(username="viewer", password="safe-pass-123")
+        self.client.login(username="viewer", password="safe-pass-123")
+        self.assertEqual(self.client.get(self.url, {"q": "ana"}).status_code, 403)
+
+    def test_detail_page_does_not_list_every_user(self) -> None:
+        self.client.login(username="owner", password="safe-pass-123")
+        response = self.client.get(reverse("blog:process_detail", args=[self.process.pk]))
+        self.assertContains(response, "Busca un candidato")
+        self.assertNotContains(response, "ana.free")
+
+    def test_assigning_an_already_assigned_candidate_fails(self) -> None:
+        self.client.login(username="owner", password="safe-pass-123")
+        self.client.post(
+            reverse("blog:assignment_create", args=[self.process.pk]),
+            data={"candidate": self.assigned.pk},
+        )
+        self.assertEqual(CandidateAssignment.objects.filter(candidate=self.assigned).count(), 1)
+
+
+class CandidateImportTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123", is_staff=True)
+        self.process = RecruitmentProcess.objects.create(title="Proceso Masivo", owner=self.owner)
+        self.stage = ProcessStage.objects.create(process=self.process, name="Inducción", order=1)
+        self.existing = user_model.objects.create(username="existing", email="existing@example.com")
+        CandidateAssignment.objects.create(process=self.process, candidate=self.existing)
+        for index in range(5):
+            user_model.objects.create(username=f"grad{index}", email=f"grad{index}@example.com")
+        self.url = reverse("blog:assignment_import", args=[self.process.pk])
+        self.client.login(username="owner", password="safe-pass-123")
+
+    def test_pasted_list_is_imported_in_one_batch(self) -> None:
+        with self.assertNumQueries(16):
+            response = self.client.post(
+                self.url,
+                data={
+                    "identifiers": "grad0, grad1;GRAD2@example.com\ngrad3@example.com grad0 existing nobody",
+                    "current_stage": self.stage.pk,
+                },
+            )
+        report = response.context["report"]
+        self.assertEqual(len(report["created"]), 4)
+        self.assertEqual([user.username for user in report["already_assigned"]], ["existing"])
+        self.assertEqual(report["unknown"], ["nobody"])
+        self.assertEqual(report["duplicates"], ["grad0"])
+        self.assertEqual(
+            CandidateAssignment.objects.filter(process=self.process, current_stage=self.stage).count(),
+            4,
+        )
+        self.assertEqual(ProcessDailyMetric.objects.get(process=self.process).assignment_count, 5)
+
+    def test_csv_upload_skips_header(self) -> None:
+        upload = SimpleUploadedFile("candidatos.csv", b"email,nombre\ngrad4@example.com,Grad\n", content_type="text/csv")
+        response = self.client.post(self.url, data={"file": upload})
+        self.assertEqual(len(response.context["report"]["created"]), 1)
+        self.assertTrue(CandidateAssignment.objects.filter(process=self.process, candidate__username="grad4").exists())
+
+    def test_empty_submission_is_rejected(self) -> None:
+        response = self.client.post(self.url, data={"identifiers": "  "})
+        self.assertIsNone(response.context["report"])
+        self.assertContains(response, "pega al menos un usuario")
+
+
+class BatchAdvanceTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123", is_staff=True)
+        self.process = RecruitmentProcess.objects.create(title="Proceso Grupal", owner=self.owner)
+        self.stages = [
+            ProcessStage.objects.create(process=self.process, name=name, order=order)
+            for order, name in enumerate(["Screening", "Grupal", "Oferta"], start=1)
+        ]
+
+    def _assign(self, count: int, stage: ProcessStage | None) -> list[CandidateAssignment]:
+        offset = CandidateAssignment.objects.count()
+        return [
+            CandidateAssignment.objects.create(
+                process=self.process,
+                candidate=get_user_model().objects.create(username=f"cand{offset + index}"),
+                current_stage=stage,
+            )
+            for index in range(count)
+        ]
+
+    def test_each_assignment_moves_to_its_next_stage(self) -> None:
+        [fresh] = self._assign(1, None)
+        [first] = self._assign(1, self.stages[0])
+        [last] = self._assign(1, self.stages[2])
+
+        results = CandidateAssignment.objects.filter(pk__in=[fresh.pk, first.pk, last.pk]).advance_stages()
+
+        by_pk = {result["assignment"].pk: result for result in results}
+        self.assertEqual(by_pk[fresh.pk]["to_stage"], self.stages[0])
+        self.assertEqual(by_pk[first.pk]["to_stage"], self.stages[1])
+        self.assertTrue(by_pk[last.pk]["completed"])
+        fresh.refresh_from_db()
+        first.refresh_from_db()
+        last.refresh_from_db()
+        self.assertEqual(fresh.current_stage, self.stages[0])
+        self.assertEqual(first.current_stage, self.stages[1])
+        self.assertIsNone(last.current_stage)
+        self.assertEqual(ProcessDailyMetric.objects.get(process=self.process).completed_count, 1)
+
+    def test_query_count_does_not_grow_with_selection(self) -> None:
+        small = self._assign(1, self.stages[0]) + self._assign(1, self.stages[2])
+        large = self._assign(30, self.stages[1]) + self._assign(10, self.stages[2])
+
+        # El grafo de etapas se lee siempre de la base: una consulta aunque esté en caché.
+        get_stage_graph(self.process.pk)
+        with self.assertNumQueries(11):
+            CandidateAssignment.objects.filter(pk__in=[a.pk for a in small]).advance_stages()
+        with self.assertNumQueries(11):
+            CandidateAssignment.objects.filter(pk__in=[a.pk for a in large]).advance_stages()
+
+    def test_stale_cached_graph_is_not_used_for_writes(self) -> None:
+        [assignment] = self._assign(1, self.stages[0])
+        get_stage_graph(self.process.pk)
+        # Otro worker borra la etapa siguiente; la caché de este proceso no se entera.
+        ProcessStage.objects.filter(pk=self.stages[1].pk).delete()
+        stale = [(stage.pk, stage.order, stage.name, stage.is_blocker, stage.due_date) for stage in self.stages]
+        cache.set(stage_graph.cache_key(self.process.pk), stale)
+
+        [result] = CandidateAssignment.objects.filter(pk=assignment.pk).advance_stages()
+        self.assertEqual(result["to_stage"], self.stages[2])
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.current_stage_id, self.stages[2].pk)
+
+    def test_batch_endpoint_reports_results(self) -> None:
+        assignments = self._assign(2, self.stages[2]) + self._assign(1, self.stages[0])
+        self.client.login(username="owner", password="safe-pass-123")
+        response = self.client.post(
+            reverse("blog:assignment_batch_progress", args=[self.process.pk]),
+            data={"assignment_ids": [assignment.pk for assignment in assignments]},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["results"]), 3)
+        self.assertEqual(response.context["completed_total"], 2)
+        self.assertContains(response, "Completó todas las etapas", count=2)
+
+    def test_batch_endpoint_ignores_other_processes(self) -> None:
+        other = RecruitmentProcess.objects.create(title="Otro", owner=self.owner)
+        foreign = CandidateAssignment.objects.create(
+            process=other, candidate=get_user_model().objects.create(username="foreign")
+        )
+        self.client.login(username="owner", password="safe-pass-123")
+        response = self.client.post(
+            reverse("blog:assignment_batch_progress", args=[self.process.pk]),
+            data={"assignment_ids": [foreign.pk]},
+        )
+        self.assertEqual(response.context["results"], [])
+
+
+class StageFunnelTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123", is_staff=True)
+        self.process = RecruitmentProcess.objects.create(title="Proceso Embudo", owner=self.owner)
+        self.stages = [
+            ProcessStage.objects.create(process=self.process, name=name, order=order)
+            for order, name in enumerate(["Screening", "Técnica", "Oferta"], start=1)
+        ]
+
+    def _assign(self, count: int, stage: ProcessStage | None = None) -> list[CandidateAssignment]:
+        offset = CandidateAssignment.objects.count()
+        return [
+            CandidateAssignment.objects.create(
+                process=self.process,
+                candidate=get_user_model().objects.create(username=f"cand{offset + index}"),
+                current_stage=stage,
+            )
+            for index in range(count)
+        ]
+
+    def history(self, assignment: CandidateAssignment) -> list[tuple]:
+        return list(assignment.transitions.values_list("kind", "from_stage_id", "to_stage_id"))
+
+    def test_deleting_the_current_stage_logs_completion(self) -> None:
+        screening, technical, _offer = self.stages
+        released = self._assign(2, technical)
+        [staying] = self._assign(1, screening)
+        technical.delete()
+
+        for assignment in released:
+            # El SET_NULL de la etapa borrada limpia también ``from_stage``.
+            self.assertEqual(self.history(assignment), [("assigned", None, None), ("completed", None, None)])
+        self.assertEqual(self.history(staying), [("assigned", None, screening.pk)])
+        self.process.refresh_from_db()
+        self.assertEqual(funnel.process_funnel(self.process.pk).completed, self.process.completed_count)
+
+    def test_stage_less_assignment_counts_as_completed(self) -> None:
+        [assignment] = self._assign(1)
+        self.assertEqual(self.history(assignment), [("completed", None, None)])
+        self.process.refresh_from_db()
+        self.assertEqual(self.process.completed_count, 1)
+        self.assertEqual(funnel.process_funnel(self.process.pk).completed, self.process.completed_count)
+
+        # Al avanzar entra en la primera etapa y deja de contar como completada.
+        CandidateAssignment.objects.filter(pk=assignment.pk).advance_stages()
+        self.process.refresh_from_db()
+        result = funnel.process_funnel(self.process.pk)
+        self.assertEqual((result.completed, self.process.completed_count), (0, 0))
+        self.assertEqual(result.stages[0].current, 1)
+
+    def test_creation_advances_and_completion_are_logged(self) -> None:
+        screening, technical, offer = self.stages
+        [assignment] = self._assign(1, screening)
+        assignment.current_stage = technical
+        assignment.save()
+        assignment.save()
+        CandidateAssignment.objects.filter(pk=assignment.pk).advance_stages()
+        CandidateAssignment.objects.filter(pk=assignment.pk).advance_stages()
+
+        self.assertEqual(
+            self.history(assignment),
+            [
+                ("assigned", None, screening.pk),
+                ("advanced", screening.pk, technical.pk),
+                ("advanced", technical.pk, offer.pk),
+                ("completed", offer.pk, None),
+            ],
+        )
+        created, _skipped = CandidateAssignment.objects.bulk_assign(
+            self.process, [get_user_model().objects.create(username="bulk")], current_stage=screening
+        )
+        self.assertEqual(self.history(created[0]), [("assigned", None, screening.pk)])
+
+    def test_conversion_dwell_percentiles_and_stuck_candidates(self) -> None:
+        screening, technical, offer = self.stages
+        now = timezone.now()
+        start = now - timezone.timedelta(days=30)
+
+        def days(count: int):
+            return start + timezone.timedelta(days=count)
+
+        assignments = self._assign(5)
+        # Historiales con fechas controladas en lugar de los generados al crear las asignaciones.
+        StageTransition.objects.all().delete()
+        paths = [
+            [(screening, days(0)), (technical, days(1)), (offer, days(3)), (None, days(4))],
+            [(screening, days(0)), (technical, days(2))],
+            [(screening, days(0)), (technical, days(3)), (offer, days(29))],
+            [(screening, now - timezone.timedelta(days=1))],
+            [(screening, days(0))],
+        ]
+        StageTransition.objects.bulk_create(
+            StageTransition(
+                assignment=assignment,
+                process=self.process,
+                to_stage=stage,
+                kind="assigned" if index == 0 else "completed" if stage is None else "advanced",
+                created_at=created_at,
+            )
+            for assignment, path in zip(assignments, paths)
+            for index, (stage, created_at) in enumerate(path)
+        )
+
+        with self.assertNumQueries(5):
+            result = funnel.process_funnel(self.process.pk, now=now)
+
+        self.assertEqual((result.assigned, result.completed), (5, 1))
+        rows = [(entry.reached, entry.current, entry.conversion_percent, entry.stuck) for entry in result.stages]
+        self.assertEqual(rows, [(5, 2, 60, 1), (3, 1, 67, 1), (2, 1, 50, 0)])
+        dwell = [(round(entry.median_days, 3), round(entry.p90_days, 3)) for entry in result.stages]
+        self.assertEqual(dwell, [(2, 3), (2, 26), (1, 1)])
+        self.assertEqual([item.assignment.pk for item in result.stuck], [assignments[4].pk, assignments[1].pk])
+        self.assertEqual(round(result.stuck[1].waited_days), 28)
+        self.assertEqual(result.stuck[1].since, days(2))
+
+    def test_metrics_dashboard_shows_selected_funnel(self) -> None:
+        self._assign(2, self.stages[0])
+        other = RecruitmentProcess.objects.create(title="Sin Candidatos", owner=self.owner)
+        self.client.force_login(self.owner)
+
+        response = self.client.get(reverse("blog:metrics"), {"funnel": other.pk})
+        self.assertEqual(response.context["funnel_process"], self.process)
+        self.assertContains(response, "Embudo de Proceso Embudo")
+        self.assertEqual([entry.reached for entry in response.context["funnel"].stages], [2, 0, 0])
+
+
+class StageGraphTests(TestCase):
+    def setUp(self) -> None:
+        owner = get_user_model().objects.create(username="owner")
+        self.process = RecruitmentProcess.objects.create(title="Proceso Grafo", owner=owner)
+        self.first = ProcessStage.objects.create(process=self.process, name="Screening", order=1)
+        self.second = ProcessStage.objects.create(process=self.process, name="Técnica", order=5, is_blocker=True)
+        self.third = ProcessStage.objects.create(process=self.process, name="Oferta", order=9)
+
+    def test_lookups(self) -> None:
+        graph = get_stage_graph(self.process.pk)
+        self.assertEqual(len(graph), 3)
+        self.assertEqual(graph.next_stage(None), self.first.pk)
+        self.assertEqual(graph.next_stage(self.first.pk), self.second.pk)
+        self.assertIsNone(graph.next_stage(self.third.pk))
+        self.assertEqual(graph.position(self.second.pk), 2)
+        self.assertAlmostEqual(graph.progress_fraction(self.third.pk), 1.0)
+        self.assertIsNone(graph.progress_fraction(None))
+        self.assertTrue(graph.is_blocker(self.second.pk))
+
+    def test_graph_is_cached_until_a_stage_changes(self) -> None:
+        get_stage_graph(self.process.pk)
+        with self.assertNumQueries(0):
+            get_stage_graph(self.process.pk)
+
+        extra = ProcessStage.objects.create(process=self.process, name="Cultura", order=7)
+        self.assertEqual(get_stage_graph(self.process.pk).next_stage(self.second.pk), extra.pk)
+
+        self.second.delete()
+        self.assertEqual(get_stage_graph(self.process.pk).next_stage(self.first.pk), extra.pk)
+
+    def test_dashboard_shows_progress(self) -> None:
+        candidate = get_user_model().objects.create_user(username="cand", password="safe-pass-123")
+        CandidateAssignment.objects.create(process=self.process, candidate=candidate, current_stage=self.second)
+        self.client.login(username="cand", password="safe-pass-123")
+        response = self.client.get(reverse("blog:dashboard"))
+        [assignment] = response.context["candidate_assignments"]
+        self.assertEqual((assignment.stage_position, assignment.stage_total, assignment.progress_percent), (2, 3, 67))
+        self.assertContains(response, "Etapa 2 de 3")
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123")
+        self.candidate = user_model.objects.create_user(username="cand", password="safe-pass-123")
+        self.process = RecruitmentProcess.objects.create(title="Proceso Caché", owner=self.owner)
+        self.stage = ProcessStage.objects.create(process=self.process, name="Screening", order=1)
+        self.assignment = CandidateAssignment.objects.create(
+            process=self.process, candidate=self.candidate, current_stage=self.stage
+        )
+        self.url = reverse("blog:process_detail", args=[self.process.pk])
+
+    def test_repeat_views_skip_fragment_queries(self) -> None:
+        self.client.login(username="owner", password="safe-pass-123")
+        with CaptureQueriesContext(connection) as cold:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as warm:
+            response = self.client.get(self.url)
+        self.assertLess(len(warm), len(cold))
+        self.assertContains(response, "Screening")
+        self.assertContains(response, "Marcar etapa completada")
+
+    def test_writes_invalidate_fragments(self) -> None:
+        self.client.login(username="owner", password="safe-pass-123")
+        self.client.get(self.url)
+
+        ProcessStage.objects.create(process=self.process, name="Entrevista final", order=2)
+        self.assertContains(self.client.get(self.url), "Entrevista final")
+
+        StageFeedback.objects.create(
+            assignment=self.assignment, stage=self.stage, author=self.candidate, rating=4, pros="Muy ágil"
+        )
+        response = self.client.get(self.url)
+        self.assertContains(response, "Muy ágil")
+        self.assertContains(response, "1 respuestas")
+
+        self.assignment.delete()
+        self.assertContains(self.client.get(self.url), "Todavía no hay candidatos asociados.")
+
+    def test_viewer_specific_controls_are_not_shared(self) -> None:
+        self.client.login(username="owner", password="safe-pass-123")
+        owner_page = self.client.get(self.url)
+        self.assertContains(owner_page, reverse("blog:stage_update", args=[self.process.pk, self.stage.pk]))
+        self.assertNotContains(owner_page, "Compartir experiencia")
+
+        self.client.login(username="cand", password="safe-pass-123")
+        candidate_page = self.client.get(self.url)
+        self.assertNotContains(candidate_page, reverse("blog:stage_update", args=[self.process.pk, self.stage.pk]))
+        self.assertNotContains(candidate_page, "Marcar etapa completada")
+        self.assertContains(candidate_page, reverse("blog:submit_feedback", args=[self.assignment.pk, self.stage.pk]))
+
+    def test_dashboard_reflects_stage_changes(self) -> None:
+        self.client.login(username="cand", password="safe-pass-123")
+        self.assertContains(self.client.get(reverse("blog:dashboard")), "Etapa 1 de 1")
+        ProcessStage.objects.create(process=self.process, name="Oferta", order=2)
+        self.assertContains(self.client.get(reverse("blog:dashboard")), "Etapa 1 de 2")
+
+
+class RequestInstrumentationTests(QueryBudgetMixin, TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.staff = user_model.objects.create_user(username="staff", password="safe-pass-123", is_staff=True)
+        self.candidate = user_model.objects.create_user(username="cand", password="safe-pass-123")
+        self.process = RecruitmentProcess.objects.create(title="Proceso Medido", owner=self.staff)
+        stage = ProcessStage.objects.create(process=self.process, name="Screening", order=1)
+        CandidateAssignment.objects.create(process=self.process, candidate=self.candidate, current_stage=stage)
+
+    def test_stats_detect_duplicates(self) -> None:
+        with capture_queries(keep_slowest=2) as stats:
+            list(RecruitmentProcess.objects.filter(pk=self.process.pk))
+            list(RecruitmentProcess.objects.filter(pk=self.process.pk))
+            list(ProcessStage.objects.all())
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(stats.duplicate_count, 1)
+        self.assertEqual(len(stats.duplicates), 1)
+        self.assertEqual(len(stats.slowest_statements()), 2)
+
+    def test_server_timing_is_only_sent_to_staff(self) -> None:
+        self.client.login(username="staff", password="safe-pass-123")
+        response = self.client.get(reverse("blog:process_list"))
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries"')
+
+        self.client.login(username="cand", password="safe-pass-123")
+        self.assertNotIn("Server-Timing", self.client.get(reverse("blog:process_list")))
+
+    def test_reporting_does_not_load_the_user(self) -> None:
+        def view(request):
+            return HttpResponse()
+
+        request = RequestFactory().get("/")
+        request.user = SimpleLazyObject(lambda: get_user_model().objects.get(pk=self.staff.pk))
+        with self.assertNumQueries(0):
+            response = QueryInstrumentationMiddleware(view)(request)
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(request.query_stats.count, 0)
+
+        self.assertTrue(request.user.is_staff)
+        self.assertIn("Server-Timing", QueryInstrumentationMiddleware(view)(request))
+
+    def test_slow_requests_are_logged_with_view_and_url_name(self) -> None:
+        self.client.login(username="cand", password="safe-pass-123")
+        with self.settings(REQUEST_INSTRUMENTATION={"SLOW_REQUEST_MS": 0}):
+            with self.assertLogs("blog.instrumentation", "WARNING") as logs:
+                self.client.get(reverse("blog:dashboard"))
+        self.assertIn("vista=blog.views.dashboard", logs.output[0])
+        self.assertIn("url=blog:dashboard", logs.output[0])
+
+    def test_view_query_budgets(self) -> None:
+        self.client.login(username="staff", password="safe-pass-123")
+        self.assertQueryBudget(8, reverse("blog:dashboard"))
+        self.assertQueryBudget(4, reverse("blog:process_list"))
+        self.assertQueryBudget(12, reverse("blog:process_detail", args=[self.process.pk]))
+        # Con la caché fría, las distribuciones suman el GROUP BY, el mapa etapa -> proceso
+        # y la carga de las etapas con opiniones más dispersas; el embudo, sus etapas y tres
+        # lecturas del historial (sin candidatos estancados no se cargan asignaciones).
+        self.assertQueryBudget(13, reverse("blog:metrics"))
+
+
+class SeedCommandTests(TestCase):
+    def snapshot(self) -> list:
+        return list(
+            StageFeedback.objects.order_by("pk").values_list(
+                "assignment__candidate__username", "stage__name", "rating", "is_anonymous", "visibility", "created_at"
+            )
+        )
+
+    def test_same_seed_produces_the_same_dataset(self) -> None:
+        call_command("seed_connectmetric", scale=0.1, seed=7, stdout=StringIO())
+        first = self.snapshot()
+        self.assertTrue(first)
+        self.assertEqual(StageDailyMetric.objects.aggregate(total=Sum("feedback_count"))["total"], len(first))
+
+        with self.assertRaises(CommandError):
+            call_command("seed_connectmetric", scale=0.1, seed=7, stdout=StringIO())
+        call_command("seed_connectmetric", scale=0.1, seed=7, replace=True, stdout=StringIO())
+        self.assertEqual(self.snapshot(), first)
+
+    def test_fixed_today_gives_the_same_timestamps_on_any_day(self) -> None:
+        call_command("seed_connectmetric", "--today", "2026-01-15", scale=0.1, seed=7, stdout=StringIO())
+        first = self.snapshot()
+        self.assertLess(max(row[-1] for row in first), timezone.make_aware(timezone.datetime(2026, 1, 15)))
+
+        options = ["--today", "2026-01-15", "--replace", "--scale", "0.1", "--seed", "7"]
+        with patch("django.utils.timezone.now", return_value=timezone.now() + timezone.timedelta(days=3)):
+            call_command("seed_connectmetric", *options, stdout=StringIO())
+        self.assertEqual(self.snapshot(), first)
+
+    def test_clearing_keeps_derived_data_of_other_processes_consistent(self) -> None:
+        seeding.seed(scale=0.1, seed=3)
+        owner = get_user_model().objects.create(username="real_owner")
+        process = RecruitmentProcess.objects.create(title="Proceso real", owner=owner)
+        stage = ProcessStage.objects.create(process=process, name="Screening", order=1)
+        candidate = seeding.seeded_users().filter(is_staff=False).first()
+        assignment = CandidateAssignment.objects.create(process=process, candidate=candidate, current_stage=stage)
+        StageFeedback.objects.create(assignment=assignment, stage=stage, author=candidate, rating=5)
+
+        seeding.clear_seeded()
+        self.assertFalse(seeding.seeded_users().exists())
+        self.assertEqual(counters.find_drift(), {"processes": [], "stages": []})
+        process.refresh_from_db()
+        self.assertEqual((process.candidate_count, process.feedback_count), (0, 0))
+        self.assertFalse(ProcessDailyMetric.objects.filter(process=process, assignment_count__gt=0).exists())
+
+    def test_scale_factor_grows_the_dataset(self) -> None:
+        small = seeding.seed(scale=0.1, seed=1).counts
+        seeding.clear_seeded()
+        large = seeding.seed(scale=0.3, seed=1).counts
+        self.assertEqual(large["users"], 3 * small["users"])
+        self.assertGreater(large["feedback"], 2 * small["feedback"])
+        self.assertEqual(StageFeedback.objects.count(), large["feedback"])
+
+
+class BenchmarkHarnessTests(TestCase):
+    def test_measures_every_scenario(self) -> None:
+        names = {"dashboard", "process_detail", "feedback_export_csv", "login"}
+        scenarios = [scenario for scenario in benchmarks.SCENARIOS if scenario.name in names]
+        results = benchmarks.run_benchmarks(scales=[0.05], iterations=2, warmup=0, scenarios=scenarios)
+        views = results["scales"]["0.05"]
+        self.assertEqual(set(views), names)
+        for row in views.values():
+            self.assertEqual(row["status"], 200)
+            self.assertLessEqual(row["p50_ms"], row["p95_ms"])
+            self.assertGreater(row["peak_kb"], 0)
+        self.assertGreater(views["process_detail"]["queries"], 0)
+
+    def test_compare_flags_regressions_beyond_tolerance(self) -> None:
+        row = {"status": 200, "p50_ms": 8.0, "p95_ms": 10.0, "queries": 5, "peak_kb": 1000.0}
+        baseline = {"scales": {"1": {"dashboard": row, "process_list": row}}}
+        results = {
+            "scales": {
+                "1": {
+                    "dashboard": {**row, "p95_ms": 12.0, "peak_kb": 1200.0},
+                    "process_list": {**row, "p95_ms": 30.0, "queries": 6},
+                    "login": {**row, "p95_ms": 99.0},
+                }
+            }
+        }
+        regressions = benchmarks.compare(results, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(message.startswith("process_list @ 1x") for message in regressions))
+
+    def test_measures_feedback_card_rendering(self) -> None:
+        results = benchmarks.measure_feedback_cards(counts=[10, 20], iterations=1)
+        self.assertEqual(set(results), {"10", "20"})
+        for row in results.values():
+            self.assertGreater(row["render_us_per_card"], 0)
+            self.assertGreater(row["total_ms"], 0)
+
+
+class QueryPlanTests(TestCase):
+    """The hot view queries must be answered from an index, never a full table scan."""
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create(username="owner")
+        self.process = RecruitmentProcess.objects.create(title="Proceso Plan", owner=self.user)
+
+    def assertUsesIndex(self, queryset, index_name: str) -> None:
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        table = queryset.model._meta.db_table
+        self.assertNotRegex(plan, rf"(?m)SCAN {table}$")
+
+    def test_dashboard_queries(self) -> None:
+        self.assertUsesIndex(
+            StageFeedback.objects.filter(author=self.user).order_by("-created_at")[:5], "blog_feedback_author_idx"
+        )
+        self.assertUsesIndex(
+            RecruitmentProcess.objects.filter(owner=self.user).order_by("-created_at", "-pk")[:11],
+            "blog_process_owner_created_idx",
+        )
+        self.assertUsesIndex(
+            CandidateAssignment.objects.filter(candidate=self.user).order_by("-joined_at", "-pk")[:11],
+            "blog_assign_cand_joined_idx",
+        )
+
+    def test_process_detail_stage_ratings(self) -> None:
+        stage_ratings = (
+            StageFeedback.objects.filter(stage__process=self.process)
+            .values("stage_id")
+            .annotate(avg_rating=Avg("rating"), responses=Count("id"))
+        )
+        self.assertUsesIndex(stage_ratings, "COVERING INDEX blog_feedback_stage_rating_idx")
+
+    def test_completion_and_status_counts(self) -> None:
+        self.assertUsesIndex(
+            CandidateAssignment.objects.filter(process=self.process, current_stage__isnull=True).values("pk"),
+            "blog_assign_process_stage_idx",
+        )
+        self.assertUsesIndex(
+            RecruitmentProcess.objects.filter(status="active").values("pk"), "blog_process_status_idx"
+        )
+
+
+class DenormalizedCounterTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.owner = user_model.objects.create(username="owner")
+        self.candidates = [user_model.objects.create(username=f"cand{index}") for index in range(3)]
+        self.process = RecruitmentProcess.objects.create(title="Proceso Contadores", owner=self.owner)
+        self.first = ProcessStage.objects.create(process=self.process, name="Screening", order=1)
+        self.second = ProcessStage.objects.create(process=self.process, name="Técnica", order=2)
+
+    def counters(self) -> tuple:
+        self.process.refresh_from_db()
+        process = self.process
+        return (
+            process.stage_count,
+            process.candidate_count,
+            process.completed_count,
+            process.feedback_count,
+            process.rating_sum,
+        )
+
+    def test_every_write_path_keeps_counters_in_sync(self) -> None:
+        single = CandidateAssignment.objects.create(
+            process=self.process, candidate=self.candidates[0], current_stage=self.first
+        )
+        CandidateAssignment.objects.bulk_assign(self.process, self.candidates[1:], current_stage=self.second)
+        self.assertEqual(self.counters(), (2, 3, 0, 0, 0))
+
+        CandidateAssignment.objects.filter(current_stage=self.second).advance_stages()
+        self.assertEqual(self.counters(), (2, 3, 2, 0, 0))
+
+        feedback = StageFeedback.objects.create(
+            assignment=single, stage=self.first, author=self.candidates[0], rating=2
+        )
+        feedback = StageFeedback.objects.get(pk=feedback.pk)
+        feedback.rating = 5
+        feedback.save()
+        self.assertEqual(self.counters(), (2, 3, 2, 1, 5))
+        self.first.refresh_from_db()
+        self.assertEqual((self.first.feedback_count, self.first.average_rating), (1, 5.0))
+
+        single = CandidateAssignment.objects.get(pk=single.pk)
+        single.current_stage = None
+        single.save()
+        self.assertEqual(self.counters()[2], 3)
+
+        self.first.delete()
+        self.assertEqual(self.counters(), (1, 3, 3, 0, 0))
+        single.delete()
+        self.assertEqual(self.counters(), (1, 2, 2, 0, 0))
+        self.assertEqual(counters.find_drift(), {"processes": [], "stages": []})
+
+    def test_saving_a_stale_instance_keeps_counters(self) -> None:
+        stale_process = RecruitmentProcess.objects.get(pk=self.process.pk)
+        stale_stage = ProcessStage.objects.get(pk=self.first.pk)
+        assignment = CandidateAssignment.objects.create(
+            process=self.process, candidate=self.candidates[0], current_stage=self.first
+        )
+        StageFeedback.objects.create(assignment=assignment, stage=self.first, author=self.candidates[0], rating=4)
+
+        stale_process.title = "Proceso Renombrado"
+        stale_process.save()
+        stale_stage.name = "Filtro"
+        stale_stage.save()
+
+        self.assertEqual(self.counters(), (2, 1, 0, 1, 4))
+        self.assertEqual(self.process.title, "Proceso Renombrado")
+        self.first.refresh_from_db()
+        self.assertEqual((self.first.name, self.first.feedback_count), ("Filtro", 1))
+        self.assertEqual(counters.find_drift(), {"processes": [], "stages": []})
+
+    def test_repair_command_fixes_drift(self) -> None:
+        assignment = CandidateAssignment.objects.create(process=self.process, candidate=self.candidates[0])
+        StageFeedback.objects.create(assignment=assignment, stage=self.second, author=self.candidates[0], rating=4)
+        RecruitmentProcess.objects.filter(pk=self.process.pk).update(candidate_count=9, rating_sum=0)
+        ProcessStage.objects.filter(pk=self.second.pk).update(feedback_count=0)
+
+        out = StringIO()
+        call_command("repair_counters", "--check", stdout=out)
+        self.assertIn("1 procesos, 1 etapas", out.getvalue())
+        self.assertEqual(self.counters(), (2, 9, 1, 1, 0))
+
+        call_command("repair_counters", stdout=StringIO())
+        self.assertEqual(self.counters(), (2, 1, 1, 1, 4))
+        self.assertEqual(counters.find_drift(), {"processes": [], "stages": []})
+
+    def test_process_list_reads_stored_counters(self) -> None:
+        get_user_model().objects.create_user(username="viewer", password="safe-pass-123")
+        self.client.login(username="viewer", password="safe-pass-123")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("blog:process_list"))
+        self.assertContains(response, "Proceso Contadores")
+        self.assertFalse([query["sql"] for query in queries if "blog_processstage" in query["sql"]])
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_superuser("admin", "admin@example.com", "safe-pass-123")
+        self.client.force_login(self.admin)
+        self.process = RecruitmentProcess.objects.create(title="Backend Senior", owner=self.admin)
+        self.stage = ProcessStage.objects.create(process=self.process, name="Prueba técnica", order=1)
+        self.feedback = self.add_candidate("ana", pros="La prueba práctica fue realista.")
+
+    def add_candidate(self, username: str, **text) -> StageFeedback:
+        candidate = get_user_model().objects.create(username=username)
+        assignment = CandidateAssignment.objects.create(
+            process=self.process, candidate=candidate, current_stage=self.stage
+        )
+        return StageFeedback.objects.create(
+            assignment=assignment, stage=self.stage, author=candidate, rating=4, **text
+        )
+
+    def changelist_queries(self, model_name: str, **params) -> int:
+        url = reverse(f"admin:blog_{model_name}_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def search(self, term: str) -> list:
+        response = self.client.get(reverse("admin:blog_stagefeedback_changelist"), {"q": term})
+        return [feedback.pk for feedback in response.context["cl"].result_list]
+
+    def test_query_count_does_not_grow_with_rows(self) -> None:
+        models = ["recruitmentprocess", "processstage", "candidateassignment", "stagefeedback"]
+        single = {name: self.changelist_queries(name) for name in models}
+        for index in range(6):
+            RecruitmentProcess.objects.create(title=f"Proceso {index}", owner=self.admin)
+            ProcessStage.objects.create(process=self.process, name=f"Etapa {index}", order=index + 2)
+            self.add_candidate(f"cand{index}")
+        self.assertEqual({name: self.changelist_queries(name) for name in models}, single)
+
+    def test_feedback_search_uses_text_index(self) -> None:
+        other = self.add_candidate("bruno", cons="Faltó contexto del rol.")
+        self.assertEqual(self.search("practica"), [self.feedback.pk])
+        self.assertEqual(self.search("contex rol"), [other.pk])
+        self.assertEqual(self.search("bru"), [other.pk])
+        self.assertCountEqual(self.search("Backend"), [self.feedback.pk, other.pk])
+
+        other.cons = "Todo muy ordenado."
+        other.save()
+        self.assertEqual(self.search("contexto"), [])
+        self.feedback.delete()
+        self.assertEqual(self.search("práctica"), [])
+
+        plan = StageFeedback.objects.filter(search.feedback_matches("ordenado")).explain()
+        self.assertNotRegex(plan, r"(?m)SCAN blog_stagefeedback$")
+
+    def test_large_unfiltered_changelist_is_not_counted(self) -> None:
+        for index in range(3):
+            self.add_candidate(f"cand{index}")
+        StageFeedback.objects.filter(author__username="cand0").delete()
+
+        with patch.object(EstimatedCountPaginator, "exact_count_limit", 2), patch.object(
+            StageFeedbackAdmin, "list_per_page", 2
+        ):
+            response = self.client.get(reverse("admin:blog_stagefeedback_changelist"))
+            self.assertEqual(response.context["cl"].result_count, StageFeedback.objects.latest("pk").pk)
+            response = self.client.get(reverse("admin:blog_stagefeedback_changelist"), {"rating__exact": 4})
+            self.assertEqual(response.context["cl"].result_count, 3)
+        self.assertIsNone(response.context["cl"].full_result_count)
+
+    def test_estimated_count_is_corrected_past_the_last_page(self) -> None:
+        feedbacks = [self.feedback] + [self.add_candidate(f"cand{index}") for index in range(5)]
+        StageFeedback.objects.filter(pk__in=[feedback.pk for feedback in feedbacks[1:4]]).delete()
+        url = reverse("admin:blog_stagefeedback_changelist")
+
+        with patch.object(EstimatedCountPaginator, "exact_count_limit", 2), patch.object(
+            StageFeedbackAdmin, "list_per_page", 2
+        ):
+            self.assertEqual(self.client.get(url).context["cl"].result_count, feedbacks[-1].pk)
+            # La última página real está incompleta: el total sale de ella, sin contar.
+            with CaptureQueriesContext(connection) as queries:
+                cl = self.client.get(url, {"p": 2}).context["cl"]
+            self.assertFalse([query for query in queries if "COUNT(" in query["sql"]])
+            self.assertEqual((cl.result_count, cl.paginator.num_pages, len(cl.result_list)), (3, 2, 1))
+            # Una página vacía por la estimación cuenta las filas y muestra la última.
+            response = self.client.get(url, {"p": 3})
+            cl = response.context["cl"]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((cl.result_count, cl.page_num), (3, 2))
+        self.assertEqual([feedback.pk for feedback in cl.result_list], [self.feedback.pk])
+
+
+class JsonApiTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        user_model = get_user_model()
+        self.staff = user_model.objects.create_user(username="staff", password="safe-pass-123", is_staff=True)
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123")
+        self.candidate = user_model.objects.create_user(username="cand", password="safe-pass-123")
+        self.process = RecruitmentProcess.objects.create(title="Proceso API", owner=self.owner, status="active")
+        self.stage = ProcessStage.objects.create(process=self.process, name="Screening", order=1)
+        assignment = CandidateAssignment.objects.create(
+            process=self.process, candidate=self.candidate, current_stage=self.stage
+        )
+        StageFeedback.objects.create(assignment=assignment, stage=self.stage, author=self.candidate, rating=4)
+
+    def test_requires_a_session_and_only_reads(self) -> None:
+        url = reverse("api_v1:process_list")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.force_login(self.candidate)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(response["Allow"], "GET, HEAD")
+
+    def test_cursor_pagination_and_field_selection(self) -> None:
+        for index in range(2):
+            RecruitmentProcess.objects.create(title=f"Extra {index}", owner=self.owner)
+        self.client.force_login(self.candidate)
+
+        first = self.client.get(reverse("api_v1:process_list"), {"limit": 2, "fields": "id,title"}).json()
+        self.assertEqual([set(item) for item in first["results"]], [{"id", "title"}] * 2)
+        self.assertIsNone(first["previous"])
+        second = self.client.get(first["next"]).json()
+        self.assertEqual([item["title"] for item in second["results"]], ["Proceso API"])
+        self.assertIsNone(second["next"])
+        self.assertIn("fields=id%2Ctitle", second["previous"])
+
+        response = self.client.get(reverse("api_v1:process_list"), {"fields": "id,secret"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("secret", response.json()["error"])
+        self.assertEqual(self.client.get(reverse("api_v1:process_list"), {"limit": 500}).status_code, 400)
+
+    def test_matching_etag_returns_304_without_running_aggregates(self) -> None:
+        self.client.force_login(self.staff)
+        url = reverse("api_v1:metrics")
+        response = self.client.get(url)
+        self.assertEqual(response.json()["summary"]["feedback"], 1)
+        self.assertEqual(response.json()["results"][0]["rating"]["counts"], [0, 0, 0, 1, 0])
+        etag = response["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+
+        # Sólo la sesión y el usuario: la versión sale de la caché.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        ProcessStage.objects.create(process=self.process, name="Técnica", order=2)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_unknown_processes_do_not_leave_version_tokens(self) -> None:
+        self.client.force_login(self.owner)
+        missing = self.process.pk + 1000
+        for url in (
+            reverse("api_v1:process_detail", args=[missing]),
+            reverse("api_v1:process_stages", args=[missing]),
+            reverse("blog:process_detail", args=[missing]),
+        ):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertIsNone(cache.get(cache_versions.version_key(missing)))
+
+        pk = self.process.pk
+        url = reverse("api_v1:process_detail", args=[pk])
+        etag = self.client.get(url)["ETag"]
+        self.process.delete()
+        self.assertIsNone(cache.get(cache_versions.version_key(pk)))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 404)
+
+    def test_assignments_and_metrics_follow_page_permissions(self) -> None:
+        assignments = reverse("api_v1:process_assignments", args=[self.process.pk])
+        metrics = reverse("api_v1:process_metrics", args=[self.process.pk])
+        self.client.force_login(self.candidate)
+        self.assertEqual(self.client.get(assignments).status_code, 403)
+        self.assertEqual(self.client.get(metrics).status_code, 403)
+        self.assertEqual(self.client.get(reverse("api_v1:metrics")).status_code, 403)
+        self.assertEqual(self.client.get(reverse("api_v1:process_detail", args=[0])).status_code, 404)
+
+        self.client.force_login(self.owner)
+        [row] = self.client.get(assignments).json()["results"]
+        self.assertEqual((row["candidate"], row["current_stage"], row["completed"]), ("cand", self.stage.pk, False))
+        body = self.client.get(metrics, {"fields": "name,rating"}).json()
+        self.assertEqual(body["process"]["feedback_count"], 1)
+        [stage] = body["stages"]
+        self.assertEqual(set(stage), {"name", "rating"})
+        self.assertEqual((stage["name"], stage["rating"]["median"]), ("Screening", 4))
+
+    def test_post_writes_change_the_post_list_etag(self) -> None:
+        self.client.force_login(self.candidate)
+        url = reverse("api_v1:post_list")
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Post.objects.create(title="Novedad", content="Texto", author=self.staff)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["author"], "staff")
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="owner", password="safe-pass-123", is_staff=True)
+        self.candidate = user_model.objects.create_user(username="cand", password="safe-pass-123")
+        self.process = RecruitmentProcess.objects.create(title="Proceso Condicional", owner=self.owner)
+        self.stage = ProcessStage.objects.create(process=self.process, name="Screening", order=1)
+        self.assignment = CandidateAssignment.objects.create(
+            process=self.process, candidate=self.candidate, current_stage=self.stage
+        )
+        self.url = reverse("blog:process_detail", args=[self.process.pk])
+
+    def test_process_detail_revalidates_without_queries_until_something_changes(self) -> None:
+        self.client.force_login(self.candidate)
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        # Sólo la sesión y el usuario: ni el proceso ni sus listas se consultan.
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        last_modified = self.client.get(self.url)["Last-Modified"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        StageFeedback.objects.create(assignment=self.assignment, stage=self.stage, author=self.candidate, rating=5)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depends_on_viewer_and_query(self) -> None:
+        self.client.force_login(self.candidate)
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, {"rating": 5}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_dashboard_and_post_list_revalidate(self) -> None:
+        self.client.force_login(self.candidate)
+        dashboard = reverse("blog:dashboard")
+        etag = self.client.get(dashboard)["ETag"]
+        # Sesión, usuario y los ids de procesos propios y asignados.
+        with self.assertNumQueries(4):
+            self.assertEqual(self.client.get(dashboard, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assignment.current_stage = None
+        self.assignment.save()
+        self.assertEqual(self.client.get(dashboard, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        posts = reverse("blog:publicaciones")
+        etag = self.client.get(posts)["ETag"]
+        self.assertEqual(self.client.get(posts, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Post.objects.create(title="Aviso", content="Nuevo", author=self.owner)
+        self.assertEqual(self.client.get(posts, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_pending_messages_force_a_render(self) -> None:
+        request = RequestFactory().get(self.url)
+        request.user = self.candidate
+        validators = Validators.for_request(request, [1])
+        request.META["HTTP_IF_NONE_MATCH"] = validators.etag
+        self.assertEqual(validators.not_modified(request).status_code, 304)
+
+        request._messages = CookieStorage(request)
+        messages.success(request, "Guardado")
+        self.assertIsNone(validators.not_modified(request))
+
+
+class StaticPipelineTests(SimpleTestCase):
+    def setUp(self) -> None:
+        source = tempfile.TemporaryDirectory()
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(source.cleanup)
+        self.addCleanup(root.cleanup)
+        self.root = Path(root.name)
+        Path(source.name, "app.css").write_text(
+            "".join(f".card-{i} {{ background: url('icon.svg'); padding: {i}px; }}\n" for i in range(40))
+        )
+        Path(source.name, "icon.svg").write_text('<svg xmlns="http://www.w3.org/2000/svg"></svg>')
+        settings_override = override_settings(STATICFILES_DIRS=[source.name], STATIC_ROOT=root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def build(self) -> str:
+        out = StringIO()
+        call_command("build_static_assets", stdout=out)
+        return out.getvalue()
+
+    def test_build_hashes_rewrites_and_precompresses(self) -> None:
+        self.assertIn("variantes gzip", self.build())
+        manifest = json.loads((self.root / "staticfiles.json").read_text())["paths"]
+        hashed_css = manifest["app.css"]
+        self.assertRegex(hashed_css, r"^app\.[0-9a-f]{12}\.css$")
+        content = (self.root / hashed_css).read_bytes()
+        self.assertIn(manifest["icon.svg"].encode(), content)
+        self.assertEqual(gzip.decompress((self.root / f"{hashed_css}.gz").read_bytes()), content)
+        # El SVG es demasiado pequeño para que comprimirlo compense.
+        self.assertFalse((self.root / f"{manifest['icon.svg']}.gz").exists())
+        self.assertEqual(staticfiles_storage.url("app.css"), f"/static/{hashed_css}")
+
+    def test_without_manifest_urls_keep_original_names(self) -> None:
+        self.assertEqual(staticfiles_storage.url("app.css"), "/static/app.css")
+
+    def test_middleware_negotiates_encoding_and_caches_hashed_names_forever(self) -> None:
+        self.build()
+        hashed_css = staticfiles_storage.stored_name("app.css")
+        url = f"/static/{hashed_css}"
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="br;q=0, gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), (self.root / hashed_css).read_bytes())
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(b"".join(response.streaming_content), (self.root / hashed_css).read_bytes())
+
+        # El nombre sin hash puede cambiar de contenido: caché corta y revalidación.
+        response = self.client.get("/static/app.css")
+        self.assertNotIn("immutable", response["Cache-Control"])
+        revalidated = self.client.get("/static/app.css", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(revalidated.status_code, 304)
+
+        self.assertEqual(self.client.get("/static/missing.css").status_code, 404)
+        self.assertEqual(self.client.get("/static/../manage.py").status_code, 404)
+
+
+class FeedbackSearchTests(TestCase):
+    def setUp(self) -> None:
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user("owner", password="safe-pass-123")
+        self.ana = user_model.objects.create_user("ana", password="safe-pass-123")
+        self.bruno = user_model.objects.create_user("bruno", password="safe-pass-123")
+        self.process = RecruitmentProcess.objects.create(title="Backend Senior", owner=self.owner)
+        self.stage = ProcessStage.objects.create(process=self.process, name="Entrevista técnica", order=1)
+        self.offer_stage = ProcessStage.objects.create(process=self.process, name="Oferta", order=2)
+        other_process = RecruitmentProcess.objects.create(title="Data Analyst", owner=self.owner)
+        self.other_stage = ProcessStage.objects.create(process=other_process, name="Caso práctico", order=1)
+        self.assignments = {
+            candidate: CandidateAssignment.objects.create(
+                process=self.process, candidate=candidate, current_stage=self.stage
+            )
+            for candidate in (self.ana, self.bruno)
+        }
+
+    def add_feedback(self, author, visibility: str, stage=None, **fields) -> StageFeedback:
+        assignment = self.assignments.get(author) or CandidateAssignment.objects.create(
+            process=(stage or self.stage).process, candidate=author, current_stage=stage or self.stage
+        )
+        return StageFeedback.objects.create(
+            assignment=assignment, stage=stage or self.stage, author=author, rating=4, visibility=visibility, **fields
+        )
+
+    def found(self, user, text: str) -> list[int]:
+        return [feedback.pk for feedback in search.search_feedback(user, text)]
+
+    def test_results_respect_visibility(self) -> None:
+        shared = self.add_feedback(self.ana, "candidates", pros="Entrevista bien organizada.")
+        team = self.add_feedback(self.ana, "team", self.offer_stage, cons="Entrevista larga.")
+        private = self.add_feedback(self.bruno, "private", advice="Preparar la entrevista con tiempo.")
+        outsider = get_user_model().objects.create_user("carla")
+        elsewhere = self.add_feedback(outsider, "candidates", self.other_stage, comment="Entrevista breve.")
+
+        self.assertCountEqual(self.found(self.owner, "entrevista"), [shared.pk, team.pk, private.pk, elsewhere.pk])
+        self.assertCountEqual(self.found(self.ana, "entrevista"), [shared.pk, team.pk])
+        self.assertCountEqual(self.found(self.bruno, "entrevista"), [shared.pk, private.pk])
+        self.assertCountEqual(self.found(outsider, "entrevista"), [elsewhere.pk])
+        self.assertEqual(self.found(self.ana, "   "), [])
+
+    def test_results_are_ranked_and_keep_anonymity(self) -> None:
+        passing = self.add_feedback(self.ana, "candidates", comment="Hubo una pregunta de Django al final.")
+        focused = self.add_feedback(
+            self.bruno, "candidates", is_anonymous=True, pros="Django, Django y más Django.", advice="Repasar Django."
+        )
+        self.assertEqual(self.found(self.ana, "djan"), [focused.pk, passing.pk])
+
+        self.client.force_login(self.ana)
+        response = self.client.get(reverse("blog:feedback_search"), {"q": "django"})
+        self.assertEqual([feedback.pk for feedback in response.context["results"]], [focused.pk, passing.pk])
+        self.assertContains(response, "Candidato Anónimo")
+        self.assertNotContains(response, "bruno")
+        self.assertContains(response, reverse("blog:process_detail", args=[self.process.pk]))
+
+        # La vista consulta la base que el router elige para lecturas (la réplica cuando existe).
+        with patch.object(search, "search_feedback", wraps=search.search_feedback) as searched, patch.object(
+            ReplicaRouter, "db_for_read", return_value="default"
+        ) as db_for_read:
+            self.client.get(reverse("blog:feedback_search"), {"q": "django"})
+        db_for_read.assert_called()
+        self.assertEqual(searched.call_args.kwargs["using"], "default")
+
+    def test_rebuild_command_restores_index(self) -> None:
+        feedback = self.add_feedback(self.ana, "candidates", pros="Equipo muy cercano.")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {search.FTS_TABLE}")
+        self.assertEqual(self.found(self.owner, "cercano"), [])
+        with self.assertRaises(CommandError):
+            call_command("rebuild_feedback_search", "--check", stdout=StringIO())
+
+        output = StringIO()
+        call_command("rebuild_feedback_search", "--optimize", stdout=output)
+        self.assertIn("reconstruido", output.getvalue())
+        self.assertEqual(self.found(self.owner, "cercano"), [feedback.pk])
+        call_command("rebuild_feedback_search", "--check", stdout=output)
+
+
+class SQLiteTuningTests(TestCase):
+    def busy_timeout_ms(self) -> int:
+        return int(connection.settings_dict["OPTIONS"]["timeout"] * 1000)
+
+    def file_connection(self, path: str) -> DatabaseWrapper:
+        wrapper = DatabaseWrapper({**connection.settings_dict, "NAME": path}, alias="tuning")
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def test_new_connections_apply_pragmas(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            writer = self.file_connection(f"{directory}/db.sqlite3")
+            reader = self.file_connection(f"{directory}/db.sqlite3")
+            with writer.cursor() as cursor:
+                cursor.execute("CREATE TABLE item (id INTEGER PRIMARY KEY)")
+            with writer.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                self.assertEqual(cursor.fetchone()[0], "wal")
+                cursor.execute("PRAGMA synchronous")
+                self.assertEqual(cursor.fetchone()[0], 1)
+                cursor.execute("PRAGMA busy_timeout")
+                self.assertEqual(cursor.fetchone()[0], self.busy_timeout_ms())
+
+            # Con WAL una lectura abierta no bloquea al escritor y conserva su instantánea.
+            with reader.cursor() as cursor:
+                cursor.execute("BEGIN")
+                cursor.execute("SELECT COUNT(*) FROM item")
+                self.assertEqual(cursor.fetchone()[0], 0)
+                with writer.cursor() as write_cursor:
+                    write_cursor.execute("INSERT INTO item DEFAULT VALUES")
+                cursor.execute("SELECT COUNT(*) FROM item")
+                self.assertEqual(cursor.fetchone()[0], 0)
+                cursor.execute("COMMIT")
+
+    def test_optimize_command_reports_sizes(self) -> None:
+        out = StringIO()
+        call_command("optimize_database", "--top", "50", stdout=out)
+        output = out.getvalue()
+        self.assertIn("ANALYZE", output)
+        self.assertIn(f"busy_timeout={self.busy_timeout_ms()}", output)
+        self.assertRegex(output, r"(?m)^blog_stagefeedback\s+table")
+        self.assertRegex(output, r"(?m)^blog_feedback_author_idx\s+index")
+
+
+@override_settings(READ_REPLICA={"ALIAS": "replica", "PIN_SECONDS": 15, "PIN_COOKIE": "cm_primary"})
+class ReadReplicaRouterTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def read_alias(self) -> str | None:
+        return self.router.db_for_read(StageFeedback)
+
+    def read_in_view(self) -> str:
+        with replica_reads():
+            return self.read_alias()
+
+    def test_only_wrapped_reads_use_the_replica(self) -> None:
+        self.assertIsNone(self.read_alias())
+        with replica_reads():
+            self.assertEqual(self.read_alias(), "replica")
+            self.assertEqual(self.router.db_for_write(StageFeedback), "default")
+            with patch.object(connection, "in_atomic_block", True):
+                self.assertEqual(self.read_alias(), "default")
+
+    def test_writes_pin_the_client_to_the_primary(self) -> None:
+        middleware = ReplicaPinningMiddleware(
+            lambda request: HttpResponse(self.router.db_for_write(StageFeedback) + self.read_in_view())
+        )
+        response = middleware(self.factory.post("/"))
+        self.assertEqual(response.cookies["cm_primary"]["max-age"], 15)
+
+        middleware = ReplicaPinningMiddleware(lambda request: HttpResponse(self.read_in_view()))
+        self.assertNotIn("cm_primary", middleware(self.factory.get("/")).cookies)
+        self.assertEqual(middleware(self.factory.get("/")).content, b"replica")
+        request = self.factory.get("/")
+        request.COOKIES["cm_primary"] = "1"
+        self.assertEqual(middleware(request).content, b"default")
+
+    def test_streamed_responses_keep_reading_from_the_replica(self) -> None:
+        view = read_from_replica(
+            lambda request: StreamingHttpResponse(self.read_alias() for _ in range(2))
+        )
+        self.assertEqual(b"".join(view(self.factory.get("/")).streaming_content), b"replicareplica")
+
+        request = self.factory.get("/")
+        request.COOKIES["cm_primary"] = "1"
+        response = ReplicaPinningMiddleware(view)(request)
+        self.assertEqual(b"".join(response.streaming_content), b"defaultdefault")
+
+    def test_sync_copies_the_primary_file(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            primary, replica = f"{directory}/primary.sqlite3", f"{directory}/replica.sqlite3"
+            with closing(sqlite3.connect(primary)) as database:
+                database.execute("CREATE TABLE item (name TEXT)")
+                database.execute("INSERT INTO item VALUES ('feedback')")
+                database.commit()
+            copy_database(primary, replica)
+            with closing(sqlite3.connect(replica)) as database:
+                self.assertEqual(database.execute("SELECT name FROM item").fetchall(), [("feedback",)])
+
+
+@override_settings(ASYNC_QUERY_WORKERS=2)
+class ConcurrentReadsTests(TransactionTestCase):
+    def setUp(self) -> None:
+        self.owner = get_user_model().objects.create(username="owner")
+        RecruitmentProcess.objects.create(title="Proceso Concurrente", owner=self.owner)
+
+    def read(self) -> tuple[int, int]:
+        return threading.get_ident(), RecruitmentProcess.objects.count()
+
+    def test_queries_run_on_separate_connections(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def waiting_read():
+            # Ambas consultas deben estar en curso a la vez para cruzar la barrera.
+            barrier.wait()
+            return self.read()
+
+        with capture_queries() as stats:
+            results = async_to_sync(gather_reads)(first=waiting_read, second=waiting_read)
+        self.assertEqual({count for _thread, count in results.values()}, {1})
+        self.assertEqual(stats.count, 2)
+        self.assertNotEqual(results["first"][0], results["second"][0])
+
+    def test_open_transaction_keeps_queries_on_its_connection(self) -> None:
+        with transaction.atomic():
+            RecruitmentProcess.objects.create(title="Sin confirmar", owner=self.owner)
+            results = async_to_sync(gather_reads)(first=self.read, second=self.read)
+        self.assertEqual({count for _thread, count in results.values()}, {2})
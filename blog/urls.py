@@ -9,9 +9,12 @@ urlpatterns = [
     path("publicaciones/", views.post_list, name="publicaciones"),
     path("metricas/", views.metrics_dashboard, name="metrics"),
     path("metricas/exportar/", views.metrics_export_csv, name="metrics_export"),
+    path("metricas/exportar/feedback/", views.feedback_export_csv, name="feedback_export"),
+    path("feedback/buscar/", views.feedback_search, name="feedback_search"),
     path("procesos/", views.process_list, name="process_list"),
     path("procesos/nuevo/", views.process_create, name="process_create"),
     path("procesos/<int:pk>/", views.process_detail, name="process_detail"),
+    path("procesos/<int:pk>/feedback/", views.process_feedback, name="process_feedback"),
     path("procesos/<int:pk>/editar/", views.process_update, name="process_update"),
     path("procesos/<int:pk>/etapas/nueva/", views.stage_create, name="stage_create"),
     path(
@@ -19,7 +22,10 @@ urlpatterns = [
         views.stage_update,
         name="stage_update",
     ),
+    path("procesos/<int:pk>/candidatos/buscar/", views.candidate_search, name="candidate_search"),
     path("procesos/<int:pk>/asignaciones/nueva/", views.assignment_create, name="assignment_create"),
+    path("procesos/<int:pk>/asignaciones/importar/", views.assignment_import, name="assignment_import"),
+    path("procesos/<int:pk>/asignaciones/avanzar/", views.assignment_batch_progress, name="assignment_batch_progress"),
     path(
         "procesos/<int:pk>/asignaciones/<int:assignment_id>/avanzar/",
         views.assignment_progress,
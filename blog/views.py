@@ -1,16 +1,26 @@
-import csv
-
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
 from django.core.exceptions import PermissionDenied
-from django.db import transaction
-from django.db.models import Avg, Count, Prefetch, Q
-from django.http import HttpResponse
+from django.db import router, transaction
+from django.db.models import Count, Exists, Prefetch, Q, Subquery
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils import timezone
-from django.utils.translation import gettext as _
-
-from .forms import CandidateAssignmentForm, ProcessStageForm, RecruitmentProcessForm, StageFeedbackForm
+from django.utils.functional import SimpleLazyObject
+
+from . import cache_versions, exports, funnel, rating_stats, rollups, search
+from .concurrency import gather_reads
+from .conditional import Validators
+from .forms import (
+    CandidateAssignmentForm,
+    CandidateImportForm,
+    ProcessStageForm,
+    RecruitmentProcessForm,
+    StageFeedbackForm,
+    search_candidates,
+)
 from .models import (
     CandidateAssignment,
     Post,
@@ -18,48 +28,89 @@ from .models import (
     RecruitmentProcess,
     StageFeedback,
 )
+from .pagination import KeysetPaginator
+from .routers import read_from_replica
+from .stage_graph import attach_progress
+
+PROCESS_PAGE_SIZE = 25
+POST_PAGE_SIZE = 12
+DASHBOARD_PAGE_SIZE = 10
+FEEDBACK_PAGE_SIZE = 10
+CANDIDATE_SEARCH_LIMIT = 20
 
 
 @login_required
-def dashboard(request):
-    owned_processes = (
-        RecruitmentProcess.objects.filter(owner=request.user)
-        .annotate(stage_total=Count("stages", distinct=True), candidate_total=Count("assignments", distinct=True))
-        .order_by("-created_at")
-    )
+async def dashboard(request):
+    user = request.user = await request.auser()
+
+    def owned_processes():
+        return KeysetPaginator(
+            RecruitmentProcess.objects.filter(owner=user),
+            "created_at",
+            per_page=DASHBOARD_PAGE_SIZE,
+            prefix="processes_",
+        ).page_from_request(request)
+
+    def candidate_assignments():
+        page = KeysetPaginator(
+            CandidateAssignment.objects.filter(candidate=user)
+            .select_related("process", "current_stage")
+            .prefetch_related("feedbacks__stage"),
+            "joined_at",
+            per_page=DASHBOARD_PAGE_SIZE,
+            prefix="assignments_",
+        ).page_from_request(request)
+        attach_progress(page)
+        return page
+
+    def recent_feedback():
+        return list(
+            StageFeedback.objects.filter(author=user)
+            .select_related("stage", "assignment__process")
+            .order_by("-created_at")[:5]
+        )
 
-    candidate_assignments = (
-        CandidateAssignment.objects.filter(candidate=request.user)
-        .select_related("process", "current_stage")
-        .prefetch_related("feedbacks__stage")
-        .order_by("-joined_at")
-    )
+    def revalidate():
+        versions = cache_versions.dashboard_versions(user)
+        validators = Validators.for_request(request, versions.values())
+        return versions, validators, validators.not_modified(request)
 
-    recent_feedback = (
-        StageFeedback.objects.filter(author=request.user)
-        .select_related("stage", "assignment__process")
-        .order_by("-created_at")[:5]
-    )
+    # Si ninguno de sus procesos cambió desde la copia del navegador, 304 sin consultar nada más.
+    versions, validators, not_modified = await sync_to_async(revalidate)()
+    if not_modified is not None:
+        return not_modified
 
     context = {
-        "owned_processes": owned_processes,
-        "candidate_assignments": candidate_assignments,
-        "recent_feedback": recent_feedback,
+        "dashboard_version": cache_versions.digest(versions),
+        "dashboard_query": request.GET.urlencode(),
+        "fragment_timeout": cache_versions.FRAGMENT_TIMEOUT,
+    }
+
+    # Sólo se consultan las listas cuyo fragmento no está en caché; si uno
+    # expira antes de renderizar, el objeto perezoso lo consulta entonces.
+    lists = {
+        "owned_processes": ("dashboard_processes", owned_processes),
+        "candidate_assignments": ("dashboard_assignments", candidate_assignments),
     }
-    return render(request, "blog/dashboard.html", context)
+    vary_on = [user.pk, context["dashboard_version"], context["dashboard_query"]]
+    keys = {name: make_template_fragment_key(fragment, vary_on) for name, (fragment, _load) in lists.items()}
+    cached = await cache.aget_many(keys.values())
+    missing = {name: load for name, (_fragment, load) in lists.items() if keys[name] not in cached}
+    context |= await gather_reads(recent_feedback=recent_feedback, **missing)
+    for name, (_fragment, load) in lists.items():
+        context.setdefault(name, SimpleLazyObject(load))
+
+    return validators.apply(await sync_to_async(render)(request, "blog/dashboard.html", context))
 
 
 @login_required
+@read_from_replica
 def process_list(request):
-    processes = (
-        RecruitmentProcess.objects.select_related("owner")
-        .annotate(
-            stage_total=Count("stages", distinct=True),
-            candidate_total=Count("assignments", distinct=True),
-            average_rating=Avg("assignments__feedbacks__rating"),
-        )
-        .order_by("-created_at")
-    )
+    processes = KeysetPaginator(
+        RecruitmentProcess.objects.select_related("owner"),
+        "created_at",
+        per_page=PROCESS_PAGE_SIZE,
+    ).page_from_request(request)
     return render(
         request,
         "blog/process_list.html",
@@ -70,48 +121,112 @@ def process_list(request):
     )
 
 
-@login_required
-def process_detail(request, pk: int):
-    assignment_qs = CandidateAssignment.objects.select_related("candidate", "current_stage").prefetch_related(
-        "feedbacks__stage",
-        "feedbacks__author",
+def _feedback_feed(request, process: RecruitmentProcess):
+    """First (or cursor-selected) page of the process' feedback ``request.user`` may read, honouring GET filters."""
+    feedback = (
+        StageFeedback.objects.visible_to(request.user).filter(stage__process=process).select_related("stage", "author")
     )
 
-    process = get_object_or_404(
-        RecruitmentProcess.objects.select_related("owner").prefetch_related(
-            "stages",
-            Prefetch("assignments", queryset=assignment_qs),
-        ),
-        pk=pk,
+    stage_id = request.GET.get("stage", "")
+    if stage_id.isdigit():
+        feedback = feedback.filter(stage_id=int(stage_id))
+    rating = request.GET.get("rating", "")
+    if rating.isdigit() and 1 <= int(rating) <= 5:
+        feedback = feedback.filter(rating=int(rating))
+    visibility = request.GET.get("visibility", "")
+    if visibility in dict(StageFeedback._meta.get_field("visibility").choices):
+        feedback = feedback.filter(visibility=visibility)
+
+    return KeysetPaginator(feedback, "created_at", per_page=FEEDBACK_PAGE_SIZE).page_from_request(request)
+
+
+def _viewer_access(user, process: RecruitmentProcess) -> tuple[int | None, str]:
+    """The viewer's assignment id and a cache key part naming which feedback of ``process`` they can read.
+
+    Mirrors ``StageFeedback.objects.visible_to``; one query whatever the role.
+    """
+    viewer_assignment_id, authored = (
+        RecruitmentProcess.objects.filter(pk=process.pk)
+        .values_list(
+            Subquery(CandidateAssignment.objects.filter(process=process, candidate=user).values("pk")[:1]),
+            Exists(StageFeedback.objects.filter(stage__process=process, author=user)),
+        )
+        .get()
     )
+    if user.is_staff:
+        return viewer_assignment_id, "staff"
+    if user.pk == process.owner_id:
+        return viewer_assignment_id, "owner"
+    # Quien escribió feedback también ve el suyo aunque no sea visible para candidatos.
+    if authored:
+        return viewer_assignment_id, f"author-{user.pk}"
+    return viewer_assignment_id, "candidate" if viewer_assignment_id else "outsider"
+
+
+def _process_stages(process: RecruitmentProcess) -> list[ProcessStage]:
+    stages = list(process.stages.all())
+    stats = rating_stats.for_process(process.pk)
+    for stage in stages:
+        stage.rating_distribution = stats.for_stage(stage.pk)
+    return stages
+
+
+def _process_assignments(process: RecruitmentProcess) -> list[CandidateAssignment]:
+    latest_feedback = StageFeedback.objects.select_related("stage").order_by("-created_at")[:2]
+    assignments = list(
+        process.assignments.select_related("candidate", "current_stage").prefetch_related(
+            Prefetch("feedbacks", queryset=latest_feedback, to_attr="latest_feedback"),
+        )
+    )
+    attach_progress(assignments)
+    return assignments
 
-    stage_metrics = {
-        item["stage_id"]: item
-        for item in StageFeedback.objects.filter(stage__process=process)
-        .values("stage_id")
-        .annotate(avg_rating=Avg("rating"), responses=Count("id"))
-    }
-
-    stages = []
-    for stage in process.stages.all():
-        metrics = stage_metrics.get(stage.id, {})
-        stage.avg_rating = metrics.get("avg_rating")
-        stage.responses = metrics.get("responses", 0)
-        stages.append(stage)
-
-    assignments = list(process.assignments.all())
-    assignment_form = None
-    if can_manage := (request.user.is_staff or request.user == process.owner):
-        assignment_form = CandidateAssignmentForm(process=process)
 
+@login_required
+def process_detail(request, pk: int):
+    # La versión cambia con el proceso, sus etapas, asignaciones y feedback; el resto
+    # (quién mira, filtros, CSRF) va en el ETag, así que una copia vigente no consulta nada.
+    # Un id desconocido responde 404 sin dejar un token en la caché.
+    if (version := cache_versions.get_existing_version(pk)) is None:
+        raise Http404()
+    validators = Validators.for_request(request, [version])
+    if (not_modified := validators.not_modified(request)) is not None:
+        return not_modified
+
+    process = get_object_or_404(RecruitmentProcess.objects.select_related("owner"), pk=pk)
+    can_manage = request.user.is_staff or request.user == process.owner
+    viewer_assignment_id, feedback_access = _viewer_access(request.user, process)
+
+    # Los bloques cacheados de la plantilla sólo evalúan estas consultas
+    # cuando el fragmento no está en caché para la versión actual del proceso.
     context = {
         "process": process,
-        "stages": stages,
-        "assignments": assignments,
-        "assignment_form": assignment_form,
-        "can_manage": request.user.is_staff or request.user == process.owner,
+        "process_version": cache_versions.get_version(process.pk),
+        "fragment_timeout": cache_versions.FRAGMENT_TIMEOUT,
+        "stages": SimpleLazyObject(lambda: _process_stages(process)),
+        "process_rating": SimpleLazyObject(lambda: rating_stats.for_process(process.pk).for_process(process.pk)),
+        "assignments": SimpleLazyObject(lambda: _process_assignments(process)),
+        "assignment_form": CandidateAssignmentForm(process=process) if can_manage else None,
+        "can_manage": can_manage,
+        "viewer_assignment_id": viewer_assignment_id,
+        "feedback_access": feedback_access,
+        "feedback_page": SimpleLazyObject(lambda: _feedback_feed(request, process)),
+        "feedback_query": request.GET.urlencode(),
+        "feedback_filters": request.GET,
+        "visibility_choices": StageFeedback._meta.get_field("visibility").choices,
     }
-    return render(request, "blog/process_detail.html", context)
+    return validators.apply(render(request, "blog/process_detail.html", context))
+
+
+@login_required
+@read_from_replica
+def process_feedback(request, pk: int):
+    process = get_object_or_404(RecruitmentProcess.objects.only("pk"), pk=pk)
+    return render(
+        request,
+        "blog/_feedback_feed.html",
+        {"process": process, "feedback_page": _feedback_feed(request, process)},
+    )
 
 
 @login_required
@@ -198,6 +313,24 @@ def stage_update(request, pk: int, stage_id: int):
     )
 
 
+@login_required
+def candidate_search(request, pk: int):
+    process = get_object_or_404(RecruitmentProcess.objects.only("pk", "owner_id"), pk=pk)
+    if not (request.user.is_staff or request.user.pk == process.owner_id):
+        raise PermissionDenied()
+
+    results = [
+        {
+            "id": user["id"],
+            "username": user["username"],
+            "email": user["email"],
+            "name": f"{user['first_name']} {user['last_name']}".strip() or user["username"],
+        }
+        for user in search_candidates(process, request.GET.get("q", ""), CANDIDATE_SEARCH_LIMIT)
+    ]
+    return JsonResponse({"results": results})
+
+
 @login_required
 @transaction.atomic
 def assignment_create(request, pk: int):
@@ -212,18 +345,44 @@ def assignment_create(request, pk: int):
             assignment = form.save(commit=False)
             assignment.process = process
             assignment.save()
-            if assignment.current_stage:
-                process.assignments.filter(candidate=assignment.candidate).update(current_stage=assignment.current_stage)
             messages.success(request, "Candidato asignado al proceso.")
         else:
             messages.error(request, "Revisa los datos del formulario.")
     return redirect("blog:process_detail", pk=process.pk)
 
 
+@login_required
+def assignment_import(request, pk: int):
+    process = get_object_or_404(RecruitmentProcess, pk=pk)
+    if not (request.user.is_staff or request.user == process.owner):
+        raise PermissionDenied()
+
+    report = None
+    if request.method == "POST":
+        form = CandidateImportForm(request.POST, request.FILES, process=process)
+        if form.is_valid():
+            created, already_assigned = CandidateAssignment.objects.bulk_assign(
+                process,
+                form.cleaned_data["candidates"],
+                form.cleaned_data["current_stage"],
+            )
+            report = {
+                "created": created,
+                "already_assigned": already_assigned,
+                "unknown": form.cleaned_data["unknown"],
+                "duplicates": form.cleaned_data["duplicates"],
+            }
+            form = CandidateImportForm(process=process)
+    else:
+        form = CandidateImportForm(process=process)
+
+    return render(request, "blog/assignment_import.html", {"form": form, "process": process, "report": report})
+
+
 @login_required
 def assignment_progress(request, pk: int, assignment_id: int):
     assignment = get_object_or_404(
-        CandidateAssignment.objects.select_related("process", "candidate", "current_stage"),
+        CandidateAssignment.objects.select_related("process"),
         pk=assignment_id,
         process_id=pk,
     )
@@ -231,24 +390,42 @@ def assignment_progress(request, pk: int, assignment_id: int):
     if not (request.user.is_staff or request.user == process.owner):
         raise PermissionDenied()
 
-    next_stage = (
-        process.stages.filter(order__gt=assignment.current_stage.order if assignment.current_stage else 0)
-        .order_by("order")
-        .first()
-    )
-
-    if next_stage:
-        assignment.current_stage = next_stage
-        assignment.save(update_fields=["current_stage"])
-        messages.success(request, f"{assignment.candidate} avanza a {next_stage.name}.")
+    [result] = CandidateAssignment.objects.filter(pk=assignment.pk).advance_stages()
+    candidate = result["assignment"].candidate
+    if result["completed"]:
+        messages.info(request, f"{candidate} completó todas las etapas.")
     else:
-        assignment.current_stage = None
-        assignment.save(update_fields=["current_stage"])
-        messages.info(request, f"{assignment.candidate} completó todas las etapas.")
+        messages.success(request, f"{candidate} avanza a {result['to_stage'].name}.")
 
     return redirect("blog:process_detail", pk=process.pk)
 
 
+@login_required
+def assignment_batch_progress(request, pk: int):
+    process = get_object_or_404(RecruitmentProcess, pk=pk)
+    if not (request.user.is_staff or request.user == process.owner):
+        raise PermissionDenied()
+    if request.method != "POST":
+        return redirect("blog:process_detail", pk=process.pk)
+
+    assignment_ids = [value for value in request.POST.getlist("assignment_ids") if value.isdigit()]
+    if not assignment_ids:
+        messages.warning(request, "Selecciona al menos un candidato para avanzar.")
+        return redirect("blog:process_detail", pk=process.pk)
+
+    results = process.assignments.filter(pk__in=assignment_ids).advance_stages()
+    results.sort(key=lambda result: str(result["assignment"].candidate))
+    return render(
+        request,
+        "blog/assignment_batch_result.html",
+        {
+            "process": process,
+            "results": results,
+            "completed_total": sum(result["completed"] for result in results),
+        },
+    )
+
+
 @login_required
 def submit_feedback(request, assignment_id: int, stage_id: int):
     assignment = get_object_or_404(
@@ -285,59 +462,95 @@ def submit_feedback(request, assignment_id: int, stage_id: int):
     return render(request, "blog/submit_feedback.html", context)
 
 
+@login_required
+@read_from_replica
+def feedback_search(request):
+    query = request.GET.get("q", "").strip()
+    # El SQL crudo de FTS5 no pasa por el router; se le indica la base de lectura elegida.
+    using = router.db_for_read(StageFeedback)
+    results = search.search_feedback(request.user, query, using=using) if query else []
+    return render(
+        request,
+        "blog/feedback_search.html",
+        {"query": query, "results": results, "result_limit": search.RESULT_LIMIT},
+    )
+
+
 @login_required
 def post_list(request):
-    posts = Post.objects.select_related("author").order_by("-published_date")
-    return render(request, "blog/post_list.html", {"posts": posts})
+    validators = Validators.for_request(request, [cache_versions.get_scope_version(cache_versions.POSTS_SCOPE)])
+    if (not_modified := validators.not_modified(request)) is not None:
+        return not_modified
+
+    posts = KeysetPaginator(
+        Post.objects.select_related("author"),
+        "published_date",
+        per_page=POST_PAGE_SIZE,
+    ).page_from_request(request)
+    return validators.apply(render(request, "blog/post_list.html", {"posts": posts}))
 
 
 @login_required
-def metrics_dashboard(request):
+@read_from_replica
+async def metrics_dashboard(request):
+    request.user = await request.auser()
     if not request.user.is_staff:
         raise PermissionDenied()
 
-    process_qs = RecruitmentProcess.objects.all()
+    stage_metrics = rollups.annotate_stage_totals(ProcessStage.objects.select_related("process")).order_by(
+        "process__title", "order"
+    )
+    results = await gather_reads(
+        process_counts=lambda: RecruitmentProcess.objects.aggregate(
+            total=Count("id"),
+            active=Count("id", filter=Q(status="active")),
+            closed=Count("id", filter=Q(status="closed")),
+        ),
+        totals=rollups.global_totals,
+        process_metrics=lambda: list(
+            rollups.annotate_process_totals(RecruitmentProcess.objects.all()).order_by("-created_at")
+        ),
+        stages_to_watch=lambda: list(stage_metrics.filter(feedback_total__gt=0).order_by("avg_rating")[:5]),
+        trend=rollups.daily_trend,
+        rating_stats=rating_stats.all_stages,
+    )
+    process_counts, totals, process_metrics = results["process_counts"], results["totals"], results["process_metrics"]
 
-    summary = {
-        "total_processes": process_qs.count(),
-        "active_processes": process_qs.filter(status="active").count(),
-        "closed_processes": process_qs.filter(status="closed").count(),
-        "candidate_assignments": CandidateAssignment.objects.count(),
-        "feedback_records": StageFeedback.objects.count(),
+    stats = results["rating_stats"]
+    for process in process_metrics:
+        process.rating_distribution = stats.for_process(process.pk)
+    for stage in results["stages_to_watch"]:
+        stage.rating_distribution = stats.for_stage(stage.pk)
+    divided_stages = {
+        stage.pk: stage
+        async for stage in ProcessStage.objects.select_related("process").filter(pk__in=stats.most_dispersed)
     }
+    for stage in divided_stages.values():
+        stage.rating_distribution = stats.for_stage(stage.pk)
 
-    process_metrics = process_qs.annotate(
-        avg_rating=Avg("assignments__feedbacks__rating"),
-        assignment_total=Count("assignments", distinct=True),
-        stage_total=Count("stages", distinct=True),
-        feedback_total=Count("assignments__feedbacks", distinct=True),
-        completed_assignments=Count(
-            "assignments",
-            filter=Q(assignments__current_stage__isnull=True),
-            distinct=True,
-        ),
-    ).order_by("-created_at")
+    # Embudo del proceso elegido; por defecto, el más reciente que tenga candidatos.
+    funnel_processes = {process.pk: process for process in process_metrics if process.assignment_total}
+    funnel_id = request.GET.get("funnel", "")
+    funnel_process = funnel_processes.get(int(funnel_id)) if funnel_id.isdigit() else None
+    if funnel_process is None:
+        funnel_process = next(iter(funnel_processes.values()), None)
+    process_funnel = await sync_to_async(funnel.process_funnel)(funnel_process.pk) if funnel_process else None
+
+    summary = {
+        "total_processes": process_counts["total"],
+        "active_processes": process_counts["active"],
+        "closed_processes": process_counts["closed"],
+        "candidate_assignments": totals["assignments"],
+        "feedback_records": totals["feedback"],
+    }
 
     best_rated_processes = [proc for proc in process_metrics if proc.feedback_total]
     best_rated_processes.sort(key=lambda proc: proc.avg_rating or 0, reverse=True)
     best_rated_processes = best_rated_processes[:5]
 
-    stage_metrics = (
-        ProcessStage.objects.select_related("process")
-        .annotate(
-            avg_rating=Avg("feedback__rating"),
-            feedback_total=Count("feedback", distinct=True),
-        )
-        .order_by("process__title", "order")
-    )
-
-    stages_to_watch = (
-        stage_metrics.filter(feedback_total__gt=0).order_by("avg_rating")[:5]
-    )
-
     assignment_summary = {
-        "total": CandidateAssignment.objects.count(),
-        "completed": CandidateAssignment.objects.filter(current_stage__isnull=True).count(),
+        "total": totals["assignments"],
+        "completed": totals["completed"],
     }
     assignment_summary["in_progress"] = assignment_summary["total"] - assignment_summary["completed"]
     if assignment_summary["total"]:
@@ -353,63 +566,39 @@ def metrics_dashboard(request):
         "process_metrics": process_metrics,
         "best_rated_processes": best_rated_processes,
         "stage_metrics": stage_metrics,
-        "stages_to_watch": stages_to_watch,
+        "stages_to_watch": results["stages_to_watch"],
+        "divided_stages": [divided_stages[stage_id] for stage_id in stats.most_dispersed if stage_id in divided_stages],
         "assignment_summary": assignment_summary,
+        "trend": results["trend"],
+        "funnel_processes": funnel_processes.values(),
+        "funnel_process": funnel_process,
+        "funnel": process_funnel,
+        "stuck_min_days": funnel.STUCK_MIN_DAYS,
     }
-    return render(request, "blog/metrics_dashboard.html", context)
+    return await sync_to_async(render)(request, "blog/metrics_dashboard.html", context)
 
 
 @login_required
+@read_from_replica
 def metrics_export_csv(request):
     if not request.user.is_staff:
         raise PermissionDenied()
 
-    filename = f"connectmetric_metrics_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f"attachment; filename={filename}"
-
-    writer = csv.writer(response)
-    writer.writerow(
-        [
-            _("Proceso"),
-            _("Responsable"),
-            _("Estado"),
-            _("Candidatos"),
-            _("Etapas"),
-            _("Feedback"),
-            _("Rating promedio"),
-            _("Candidatos completados"),
-        ]
+    return exports.streaming_csv_response(
+        "connectmetric_metrics",
+        exports.process_metric_header(),
+        exports.process_metric_rows(),
     )
 
-    process_metrics = (
-        RecruitmentProcess.objects.select_related("owner")
-        .annotate(
-            avg_rating=Avg("assignments__feedbacks__rating"),
-            assignment_total=Count("assignments", distinct=True),
-            stage_total=Count("stages", distinct=True),
-            feedback_total=Count("assignments__feedbacks", distinct=True),
-            completed_assignments=Count(
-                "assignments",
-                filter=Q(assignments__current_stage__isnull=True),
-                distinct=True,
-            ),
-        )
-        .order_by("-created_at")
-    )
 
-    for process in process_metrics:
-        writer.writerow(
-            [
-                process.title,
-                process.owner.get_full_name() or process.owner.username,
-                process.get_status_display(),
-                process.assignment_total,
-                process.stage_total,
-                process.feedback_total,
-                f"{process.avg_rating:.2f}" if process.avg_rating is not None else "",
-                process.completed_assignments,
-            ]
-        )
+@login_required
+@read_from_replica
+def feedback_export_csv(request):
+    if not request.user.is_staff:
+        raise PermissionDenied()
 
-    return response
\ No newline at end of file
+    return exports.streaming_csv_response(
+        "connectmetric_feedback",
+        exports.feedback_header(),
+        exports.feedback_rows(),
+    )